@@ -1,2 +1,258 @@
+import argparse
+import math
+import os
+import random
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional
+
+from movie.adapters.memory_repository import MemoryRepository, populate_movies
+from movie.domainmodel.movie import Movie, Review
+from movie.domainmodel.user import User
+from movie.domainmodel.watch_list import WatchList
+
+DEFAULT_MOVIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'movie', 'adapters',
+                                   'datafiles', 'movies.csv')
+
+WATCH = 'watch'
+WATCH_LIST_ADD = 'watch_list_add'
+WATCH_LIST_REMOVE = 'watch_list_remove'
+WATCH_FROM_WATCH_LIST = 'watch_from_watch_list'
+REVIEW = 'review'
+
+# Relative frequency of each operation in the generated workload.
+DEFAULT_OPERATION_WEIGHTS = {
+    WATCH: 50,
+    WATCH_LIST_ADD: 25,
+    WATCH_FROM_WATCH_LIST: 15,
+    WATCH_LIST_REMOVE: 5,
+    REVIEW: 5
+}
+PERCENTILES = (50, 90, 99)
+
+
+class SimulationReport:
+    """ Throughput, latency and memory figures of a simulation run, merged over its workers.
+
+    Latencies are kept per operation in nanoseconds. totals counts the watched movies, watch list entries and
+    reviews the users ended up with. They only depend on the seed and the number of workers, so they double as a
+    regression check.
+    """
+
+    def __init__(self, events: int, seconds: float, latencies: Dict[str, array], memory_growth: int,
+                 memory_peak: int, totals: Dict[str, int], workers: int = 1):
+        self.events = events
+        self.seconds = seconds
+        self.latencies = latencies
+        self.memory_growth = memory_growth
+        self.memory_peak = memory_peak
+        self.totals = totals
+        self.workers = workers
+
+    @property
+    def throughput(self) -> float:
+        """ Events per second. """
+        return self.events / self.seconds if self.seconds else 0.0
+
+    @property
+    def operation_counts(self) -> Dict[str, int]:
+        return {operation: len(latencies) for operation, latencies in self.latencies.items()}
+
+    def percentile(self, percent: float, operation: str = None) -> Optional[float]:
+        """ Nearest-rank latency percentile in microseconds, of one operation or of all of them. """
+        if operation is None:
+            samples = sorted(sample for latencies in self.latencies.values() for sample in latencies)
+        else:
+            samples = sorted(self.latencies.get(operation, ()))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(percent / 100 * len(samples)))
+        return samples[rank - 1] / 1000
+
+    @staticmethod
+    def merge(reports: List['SimulationReport']) -> 'SimulationReport':
+        """ Combine the reports of parallel workers, timed by the slowest one. """
+        latencies = dict()
+        totals = dict()
+        for report in reports:
+            for operation, samples in report.latencies.items():
+                latencies.setdefault(operation, array('Q')).extend(samples)
+            for name, total in report.totals.items():
+                totals[name] = totals.get(name, 0) + total
+        return SimulationReport(sum(report.events for report in reports),
+                                max(report.seconds for report in reports), latencies,
+                                sum(report.memory_growth for report in reports),
+                                sum(report.memory_peak for report in reports), totals, len(reports))
+
+    def summary(self) -> str:
+        lines = [f"{self.events} events by {self.workers} worker(s) in {self.seconds:.2f}s, "
+                 f"{self.throughput:,.0f} events/s"]
+        if self.memory_peak:
+            lines.append(f"memory growth {self.memory_growth / 1024:,.1f} KiB, peak {self.memory_peak / 1024:,.1f} KiB")
+        lines.append(f"{'operation':<24}{'count':>10}" + ''.join(f"{'p' + str(percent) + ' us':>12}"
+                                                                for percent in PERCENTILES))
+        for operation in [*sorted(self.latencies), None]:
+            count = len(self.latencies[operation]) if operation else self.events
+            row = ''.join(f"{self._format_latency(self.percentile(percent, operation)):>12}" for percent in PERCENTILES)
+            lines.append(f"{operation or 'all':<24}{count:>10}{row}")
+        lines.append(', '.join(f"{name} {total}" for name, total in sorted(self.totals.items())))
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _format_latency(latency: Optional[float]) -> str:
+        return '-' if latency is None else f"{latency:.2f}"
+
+
 class MovieWatchingSimulation:
-    pass
+    """ Seeded workload generator driving synthetic users through the domain layer of a MemoryRepository.
+
+    Each event picks a user uniformly and a movie by Zipf popularity, and runs one operation: watching a movie,
+    adding it to or removing it from the user's watch list, watching a movie picked from the watch list, or
+    reviewing it through the repository. The same seed always generates the same events. With several workers
+    every worker process loads its own repository and drives its own share of the users and events.
+    """
+
+    def __init__(self, movies_path: str = DEFAULT_MOVIES_PATH, users: int = 100, events: int = 10000, seed: int = 0,
+                 zipf_exponent: float = 1.0, operation_weights: Dict[str, int] = None, measure_memory: bool = False):
+        operation_weights = operation_weights or DEFAULT_OPERATION_WEIGHTS
+        unknown = set(operation_weights) - set(DEFAULT_OPERATION_WEIGHTS)
+        if unknown:
+            raise ValueError(f"Unknown operations {sorted(unknown)}")
+        if users < 1 or events < 0 or zipf_exponent < 0:
+            raise ValueError("users must be positive, events and zipf_exponent not negative")
+        self._movies_path = movies_path
+        self._users = users
+        self._events = events
+        self._seed = seed
+        self._zipf_exponent = zipf_exponent
+        self._operation_weights = dict(operation_weights)
+        self._measure_memory = measure_memory
+
+    def run(self, workers: int = 1, repo: MemoryRepository = None) -> SimulationReport:
+        """ Run the simulation in this process against repo, or split it over a pool of worker processes.
+
+        Worker processes load their own repository from the movies file. Repository loading and process start-up
+        are not timed, only the events.
+        """
+        workers = min(workers, self._users)
+        if workers > 1 and repo is not None:
+            raise ValueError("Worker processes load their own repository, repo only works with one worker")
+        if workers <= 1:
+            return self.run_worker(0, 1, repo)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return SimulationReport.merge(list(pool.map(self.run_worker, range(workers), [workers] * workers)))
+
+    def run_worker(self, worker: int, workers: int, repo: MemoryRepository = None) -> SimulationReport:
+        """ Run the share of users and events of one worker, against repo or a repository loaded for it. """
+        if repo is None:
+            repo = MemoryRepository()
+            populate_movies(self._movies_path, repo)
+        movies = list(repo.movies)
+        if not movies:
+            raise ValueError("The repository has no movies to watch")
+        # Every worker ranks the movies the same way, so popularity does not depend on the number of workers.
+        random.Random(self._seed).shuffle(movies)
+        popularity = list(accumulate(1 / rank ** self._zipf_exponent for rank in range(1, len(movies) + 1)))
+        operations = list(self._operation_weights)
+        operation_numbers = range(len(operations))
+        operation_weights = list(accumulate(self._operation_weights[operation] for operation in operations))
+        rng = random.Random(f"{self._seed}:{worker}")
+
+        users = [_SimulatedUser(User(f"user{worker}_{number}", 'Password123'))
+                 for number in range(_share(self._users, worker, workers))]
+        for simulated_user in users:
+            repo.add_user(simulated_user.user)
+        events = _share(self._events, worker, workers)
+        # Preallocated, so recording an event allocates nothing and memory growth is only the users' and repo's.
+        durations = array('Q', bytes(8 * events))
+        event_operations = bytearray(events)
+
+        tracing = self._measure_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0] if self._measure_memory else 0
+
+        clock = time.perf_counter_ns
+        start = time.perf_counter()
+        for event in range(events):
+            simulated_user = rng.choice(users)
+            operation_number = rng.choices(operation_numbers, cum_weights=operation_weights)[0]
+            movie = rng.choices(movies, cum_weights=popularity)[0]
+            started = clock()
+            simulated_user.run(operations[operation_number], movie, repo, rng, event)
+            durations[event] = clock() - started
+            event_operations[event] = operation_number
+        seconds = time.perf_counter() - start
+
+        memory_growth = memory_peak = 0
+        if self._measure_memory:
+            current, memory_peak = tracemalloc.get_traced_memory()
+            memory_growth = current - baseline
+            memory_peak -= baseline
+        if tracing:
+            tracemalloc.stop()
+
+        latencies = {operation: array('Q') for operation in operations}
+        for operation_number, duration in zip(event_operations, durations):
+            latencies[operations[operation_number]].append(duration)
+        totals = {
+            'watched_movies': sum(len(simulated_user.user.watched_movies) for simulated_user in users),
+            'watch_list_movies': sum(simulated_user.watch_list.size() for simulated_user in users),
+            'reviews': sum(len(simulated_user.user.reviews) for simulated_user in users)
+        }
+        return SimulationReport(events, seconds, latencies, memory_growth, memory_peak, totals)
+
+
+class _SimulatedUser:
+    __slots__ = ('user', 'watch_list')
+
+    def __init__(self, user: User):
+        self.user = user
+        self.watch_list = WatchList()
+
+    def run(self, operation: str, movie: Movie, repo: MemoryRepository, rng: random.Random, event: int) -> None:
+        if operation == WATCH:
+            self.user.watch_movie(movie)
+        elif operation == WATCH_LIST_ADD:
+            self.watch_list.add_movie(movie)
+        elif operation == WATCH_LIST_REMOVE:
+            self.watch_list.remove_movie(movie)
+        elif operation == WATCH_FROM_WATCH_LIST:
+            # An empty watch list falls back to watching the drawn movie.
+            size = self.watch_list.size()
+            if size:
+                movie = self.watch_list.select_movie_to_watch(rng.randrange(size))
+                self.watch_list.remove_movie(movie)
+            self.user.watch_movie(movie)
+        elif operation == REVIEW:
+            review = Review(movie, self.user.username, 'Simulated review', rng.randint(1, 10), float(event + 1))
+            repo.add_review(review)
+            self.user.add_review(review)
+
+
+def _share(total: int, worker: int, workers: int) -> int:
+    """ The part of total assigned to worker, the first ones take the remainder. """
+    return total // workers + (1 if worker < total % workers else 0)
+
+
+def main(arguments: Iterable[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=MovieWatchingSimulation.__doc__.split('\n')[0].strip())
+    parser.add_argument('--movies', default=DEFAULT_MOVIES_PATH, help='movies CSV file')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--zipf', type=float, default=1.0, help='exponent of the Zipf movie popularity')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes')
+    parser.add_argument('--memory', action='store_true', help='measure memory with tracemalloc, which slows every '
+                                                               'operation down')
+    options = parser.parse_args(arguments)
+    simulation = MovieWatchingSimulation(options.movies, options.users, options.events, options.seed, options.zipf,
+                                         measure_memory=options.memory)
+    print(simulation.run(options.workers).summary())
+
+
+if __name__ == '__main__':
+    main()
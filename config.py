@@ -10,3 +10,7 @@ class Config:
     FLASK_ENV = environ.get('FLASK_ENV')
 
     SECRET_KEY = environ.get('SECRET_KEY')
+
+    REPOSITORY = environ.get('REPOSITORY', 'memory')
+    REPOSITORY_SNAPSHOT_PATH = environ.get('REPOSITORY_SNAPSHOT_PATH')
+    SQLITE_DATABASE_PATH = environ.get('SQLITE_DATABASE_PATH')
@@ -3,8 +3,11 @@ import os
 from flask import Flask
 
 import movie.adapters.repository as repo
-from movie.adapters.memory_repository import MemoryRepository, populate_movies, populate_users, populate_reviews
-from movie.utils.constants import USER_DATA_FILE, MOVIE_DATA_FILE, REVIEW_DATA_FILE
+from movie.adapters.memory_repository import populate_movies, populate_users, populate_reviews
+from movie.adapters.sqlite_repository import SqliteRepository
+from movie.adapters.versioned_repository import VersionedRepository
+from movie.adapters.snapshot import load_snapshot, build_repository, build_snapshot_command
+from movie.utils.constants import USER_DATA_FILE, MOVIE_DATA_FILE, REVIEW_DATA_FILE, SQLITE_DATA_FILE
 
 
 def create_app(test_config: dict = None):
@@ -23,10 +26,34 @@ def create_app(test_config: dict = None):
     movie_data_path = app.config['MOVIE_DATA_PATH']
     users_data_path = app.config['USER_DATA_PATH']
     reviews_data_path = app.config['REVIEW_DATA_PATH']
-    repo.repo_instance = MemoryRepository()
-    populate_movies(movie_data_path, repo.repo_instance)
-    populate_users(users_data_path, repo.repo_instance)
-    populate_reviews(reviews_data_path, repo.repo_instance)
+    if app.config.get('REPOSITORY') == 'sqlite':
+        database_path = app.config.get('SQLITE_DATABASE_PATH') or \
+                        os.path.join('movie', 'adapters', 'datafiles', SQLITE_DATA_FILE)
+        repo.repo_instance = SqliteRepository(database_path)
+        if repo.repo_instance.get_total_number_of_movies() == 0:
+            populate_movies(movie_data_path, repo.repo_instance)
+            populate_users(users_data_path, repo.repo_instance)
+            populate_reviews(reviews_data_path, repo.repo_instance)
+    else:
+        snapshot_path = app.config.get('REPOSITORY_SNAPSHOT_PATH')
+        repo.repo_instance = None
+        if snapshot_path:
+            repo.repo_instance = load_snapshot(snapshot_path, (movie_data_path, users_data_path, reviews_data_path))
+        if repo.repo_instance is None:
+            repo.repo_instance = build_repository(movie_data_path, users_data_path, reviews_data_path)
+        if app.config.get('REPOSITORY') == 'versioned':
+            versioned_repo = VersionedRepository(repo.repo_instance)
+            repo.repo_instance = versioned_repo
+
+            @app.before_request
+            def pin_repository_generation():
+                versioned_repo.pin()
+
+            @app.teardown_request
+            def unpin_repository_generation(exception):
+                versioned_repo.unpin()
+
+    app.cli.add_command(build_snapshot_command)
 
     with app.app_context():
         from .home import home
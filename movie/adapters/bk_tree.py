@@ -0,0 +1,104 @@
+from typing import Callable, Iterable, Optional
+
+import editdistance
+
+
+class BKTree:
+    """ Burkhard-Keller tree of names under case-insensitive edit distance.
+
+    Each child hangs off its parent by its distance to it, so by the triangle inequality a search with radius r
+    around a term at distance d from a node only needs the children at distance d - r to d + r. The tree only
+    grows; callers filter out names that have since left their index with the is_live predicate.
+    """
+
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, name: str) -> None:
+        key = name.lower()
+        if self._root is None:
+            self._root = _Node(key, name, self._size)
+            self._size += 1
+            return
+        node = self._root
+        while True:
+            distance = editdistance.eval(key, node.key)
+            if distance == 0:
+                if name not in node.names:
+                    node.names[name] = self._size
+                    self._size += 1
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(key, name, self._size)
+                self._size += 1
+                return
+            node = child
+
+    def closest(self, term: str, max_distance: int = None,
+                is_live: Callable[[str], bool] = lambda name: True) -> Optional[str]:
+        """ The live name nearest to term, the earliest added on ties, or None if none is within max_distance. """
+        if self._root is None:
+            return None
+        key = term.lower()
+        radius = float('inf') if max_distance is None else max_distance
+        best = None
+        best_rank = None
+        # Depth-first, nearest branch first so the radius shrinks early. Each entry carries the lower bound on
+        # its subtree's distance to term, rechecked on pop against the radius found meanwhile.
+        nodes = [(0, self._root)]
+        while nodes:
+            bound, node = nodes.pop()
+            if bound > radius:
+                continue
+            distance = editdistance.eval(key, node.key)
+            if distance <= radius:
+                for name, order in node.names.items():
+                    rank = (distance, order)
+                    if (best_rank is None or rank < best_rank) and is_live(name):
+                        best, best_rank = name, rank
+                        radius = distance
+            children = [(abs(child_distance - distance), child) for child_distance, child in node.children.items()
+                        if abs(child_distance - distance) <= radius]
+            children.sort(key=lambda entry: entry[0], reverse=True)
+            nodes.extend(children)
+        return best
+
+    def clone(self) -> 'BKTree':
+        tree = BKTree()
+        tree._root = self._root.clone() if self._root is not None else None
+        tree._size = self._size
+        return tree
+
+
+class _Node:
+    __slots__ = ('key', 'names', 'children')
+
+    def __init__(self, key: str, name: str, order: int):
+        self.key = key
+        # Names sharing this lowercased key, mapped to the order they were added in.
+        self.names = {name: order}
+        self.children = dict()
+
+    def clone(self) -> '_Node':
+        node = _Node.__new__(_Node)
+        node.key = self.key
+        node.names = dict(self.names)
+        node.children = {distance: child.clone() for distance, child in self.children.items()}
+        return node
+
+
+def closest_name(term: str, names: Iterable[str], max_distance: int = None) -> Optional[str]:
+    """ Linear-scan equivalent of BKTree.closest, for name sources without a tree. """
+    key = term.lower()
+    best = None
+    best_distance = float('inf') if max_distance is None else max_distance + 1
+    for name in names:
+        distance = editdistance.eval(key, name.lower())
+        if distance < best_distance:
+            best, best_distance = name, distance
+    return best
@@ -0,0 +1,110 @@
+import math
+from array import array
+from typing import List, Dict, Iterable, Optional, Tuple
+
+from movie.adapters.repository import NUMERIC_COLUMNS
+from movie.adapters.sorted_index import numeric_attribute
+from movie.domainmodel.movie import Movie
+
+MISSING = float('nan')
+
+
+class MovieColumnStore:
+    """ Numeric movie attributes kept column by column in flat double arrays.
+
+    Each movie gets an integer ordinal, its position in every column. Missing values and removed movies are
+    stored as NaN, which never satisfies a range comparison, so filters and aggregations skip them without a
+    separate mask. Once removed movies outnumber the rest the columns are compacted, which renumbers the ordinals.
+    """
+
+    COLUMNS = NUMERIC_COLUMNS
+
+    def __init__(self):
+        self._columns = {name: array('d') for name in self.COLUMNS}
+        self._movie_ids = list()
+        self._ordinals = dict()
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def add(self, movie: Movie) -> int:
+        ordinal = self._ordinals.get(movie.id)
+        if ordinal is not None:
+            return ordinal
+        ordinal = len(self._movie_ids)
+        self._movie_ids.append(movie.id)
+        self._ordinals[movie.id] = ordinal
+        for name, column in self._columns.items():
+            value = numeric_attribute(movie, name)
+            column.append(MISSING if value is None else float(value))
+        return ordinal
+
+    def remove(self, movie_id: str) -> bool:
+        ordinal = self._ordinals.pop(movie_id, None)
+        if ordinal is None:
+            return False
+        self._movie_ids[ordinal] = None
+        for column in self._columns.values():
+            column[ordinal] = MISSING
+        if len(self._movie_ids) > 2 * len(self._ordinals):
+            self._compact()
+        return True
+
+    def ordinal(self, movie_id: str) -> Optional[int]:
+        return self._ordinals.get(movie_id)
+
+    def movie_id(self, ordinal: int) -> Optional[str]:
+        return self._movie_ids[ordinal]
+
+    def movie_ids(self, ordinals: Iterable[int]) -> List[str]:
+        return [self._movie_ids[ordinal] for ordinal in ordinals]
+
+    def column(self, name: str) -> array:
+        """ The raw column, indexed by ordinal. Callers must not modify it. """
+        return self._columns[name]
+
+    def filter(self, **ranges: Tuple[Optional[float], Optional[float]]) -> List[int]:
+        """ Ordinals of movies whose columns all fall in the inclusive (low, high) ranges, None is unbounded. """
+        ordinals = None
+        for name, (low, high) in ranges.items():
+            column = self._columns[name]
+            low = -math.inf if low is None else low
+            high = math.inf if high is None else high
+            if ordinals is None:
+                ordinals = [ordinal for ordinal, value in enumerate(column) if low <= value <= high]
+            else:
+                ordinals = [ordinal for ordinal in ordinals if low <= column[ordinal] <= high]
+        if ordinals is None:
+            ordinals = sorted(self._ordinals.values())
+        return ordinals
+
+    def aggregate(self, name: str, ordinals: Iterable[int] = None) -> Dict[str, float]:
+        column = self._columns[name]
+        values = column if ordinals is None else (column[ordinal] for ordinal in ordinals)
+        values = [value for value in values if value == value]
+        if not values:
+            return {'count': 0, 'sum': 0.0, 'mean': None, 'min': None, 'max': None}
+        total = math.fsum(values)
+        return {
+            'count': len(values),
+            'sum': total,
+            'mean': total / len(values),
+            'min': min(values),
+            'max': max(values)
+        }
+
+    def _compact(self) -> None:
+        # Keep the live rows in their current order, each column filtered with the same ordinals.
+        live = sorted(self._ordinals.values())
+        self._columns = {name: array('d', (column[ordinal] for ordinal in live))
+                         for name, column in self._columns.items()}
+        self._movie_ids = [self._movie_ids[ordinal] for ordinal in live]
+        self._ordinals = {movie_id: ordinal for ordinal, movie_id in enumerate(self._movie_ids)}
+
+    def clone(self) -> 'MovieColumnStore':
+        store = MovieColumnStore()
+        store._columns = {name: array('d', column) for name, column in self._columns.items()}
+        store._movie_ids = list(self._movie_ids)
+        store._ordinals = dict(self._ordinals)
+        return store
+
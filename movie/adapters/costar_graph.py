@@ -0,0 +1,146 @@
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+# Expands a frontier: yields (node, neighbors) for the given nodes.
+Expand = Callable[[List[Hashable]], Iterable[Tuple[Hashable, Iterable[Hashable]]]]
+
+
+class CostarGraph:
+    """ Undirected graph of actors who appeared in a movie together.
+
+    Actors are numbered in the order they are first seen, and each keeps a sorted array of the numbers of its
+    co-stars, so membership is a bisect and a breadth-first search step is a scan over a few compact arrays. The
+    number of movies shared by each pair is kept too, so removing a movie only drops the edges it alone created.
+    Like BKTree, actor numbers are never reused.
+    """
+
+    def __init__(self):
+        self._ids = dict()
+        self._names = list()
+        self._neighbors = list()
+        self._shared = dict()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add_cast(self, names: Iterable[str]) -> None:
+        """ Connect every pair of actors of one movie's cast. """
+        cast = [self._actor_id(name) for name in dict.fromkeys(names)]
+        for position, actor in enumerate(cast):
+            for costar in cast[position + 1:]:
+                key = _edge_key(actor, costar)
+                shared = self._shared.get(key, 0)
+                if not shared:
+                    _insert(self._neighbors[actor], costar)
+                    _insert(self._neighbors[costar], actor)
+                self._shared[key] = shared + 1
+
+    def remove_cast(self, names: Iterable[str]) -> None:
+        """ Undo add_cast for the cast of a movie that is being removed. """
+        cast = [self._ids[name] for name in dict.fromkeys(names) if name in self._ids]
+        for position, actor in enumerate(cast):
+            for costar in cast[position + 1:]:
+                key = _edge_key(actor, costar)
+                shared = self._shared.get(key, 0)
+                if shared > 1:
+                    self._shared[key] = shared - 1
+                elif shared:
+                    del self._shared[key]
+                    _delete(self._neighbors[actor], costar)
+                    _delete(self._neighbors[costar], actor)
+
+    def costars(self, name: str) -> List[str]:
+        actor = self._ids.get(name)
+        if actor is None:
+            return []
+        return sorted(self._names[costar] for costar in self._neighbors[actor])
+
+    def shared_movie_count(self, name: str, other_name: str) -> int:
+        actor, costar = self._ids.get(name), self._ids.get(other_name)
+        if actor is None or costar is None or actor == costar:
+            return 0
+        return self._shared.get(_edge_key(actor, costar), 0)
+
+    def worked_with(self, name: str, other_name: str) -> bool:
+        return self.shared_movie_count(name, other_name) > 0
+
+    def shortest_path(self, name: str, other_name: str) -> List[str]:
+        """ Actor names of a shortest chain of co-stars from name to other_name, empty if they are not connected. """
+        source, target = self._ids.get(name), self._ids.get(other_name)
+        if source is None or target is None:
+            return []
+        path = shortest_path(source, target,
+                             lambda frontier: ((actor, self._neighbors[actor]) for actor in frontier))
+        return [self._names[actor] for actor in path]
+
+    def _actor_id(self, name: str) -> int:
+        actor = self._ids.get(name)
+        if actor is None:
+            actor = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._neighbors.append(array('I'))
+        return actor
+
+    def clone(self) -> 'CostarGraph':
+        graph = CostarGraph()
+        graph._ids = dict(self._ids)
+        graph._names = list(self._names)
+        graph._neighbors = [array('I', neighbors) for neighbors in self._neighbors]
+        graph._shared = dict(self._shared)
+        return graph
+
+
+def shortest_path(source: Hashable, target: Hashable, expand: Expand) -> List[Hashable]:
+    """ Bidirectional breadth-first search, expanding whole levels of the smaller frontier at a time.
+
+    expand is given a frontier and yields each of its nodes with their neighbors, so callers can fetch a whole
+    level at once. The search stops at the first node reached by both sides. That path is already a shortest one,
+    because any shorter path would have met on an earlier level.
+    """
+    if source == target:
+        return [source]
+    parents = ({source: None}, {target: None})
+    frontiers = [[source], [target]]
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        visited, other_visited = parents[side], parents[1 - side]
+        next_frontier = []
+        for node, neighbors in expand(frontiers[side]):
+            for neighbor in neighbors:
+                if neighbor in visited:
+                    continue
+                visited[neighbor] = node
+                if neighbor in other_visited:
+                    return _join(parents, neighbor)
+                next_frontier.append(neighbor)
+        frontiers[side] = next_frontier
+    return []
+
+
+def _join(parents: Tuple[Dict, Dict], meeting: Hashable) -> List[Hashable]:
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = parents[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    return path
+
+
+def _edge_key(actor: int, costar: int) -> int:
+    return (actor << 32) | costar if actor < costar else (costar << 32) | actor
+
+
+def _insert(neighbors: array, actor: int) -> None:
+    neighbors.insert(bisect_left(neighbors, actor), actor)
+
+
+def _delete(neighbors: array, actor: int) -> None:
+    position = bisect_left(neighbors, actor)
+    if position < len(neighbors) and neighbors[position] == actor:
+        del neighbors[position]
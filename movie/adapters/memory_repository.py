@@ -1,8 +1,17 @@
 import csv
-from bisect import insort_left
-from typing import List, Generator
-
-from movie.adapters.repository import AbstractRepository
+from bisect import insort_left, bisect_left
+from typing import List, Generator, Iterable, Tuple, Callable, Optional, Dict
+
+from movie.adapters.bk_tree import BKTree
+from movie.adapters.column_store import MovieColumnStore
+from movie.adapters.costar_graph import CostarGraph
+from movie.adapters.prefix_index import PrefixIndex
+from movie.adapters.repository import AbstractRepository, RepositoryException, SORT_ORDERS, NUMERIC_COLUMNS, \
+    title_year_key, username_key
+from movie.adapters.shared_map import SharedMap
+from movie.adapters.sorted_index import SortedIndex, SortOrder, numeric_attribute
+from movie.adapters.text_index import TextIndex
+from movie.adapters.trigram_index import TrigramIndex
 from movie.domainmodel.movie import Movie, Review
 from movie.domainmodel.user import User
 from movie.utils.movie_reader import MovieFileCSVReader
@@ -12,21 +21,39 @@ from movie.utils.user_reader import UserFileCSVReader
 
 class MemoryRepository(AbstractRepository):
     def __init__(self):
+        # Movies in (title, year) order, the current version of each is the one in _movies_index.
         self._movies = list()
         self._movies_index = dict()
+        self._title_year_index = dict()
         self._actors_index = dict()
         self._directors_index = dict()
         self._genres_index = dict()
-
-        self._users = list()
+        self._actor_names = BKTree()
+        self._director_names = BKTree()
+        self._genre_names = BKTree()
+        self._actor_trigrams = TrigramIndex()
+        self._director_trigrams = TrigramIndex()
+        self._genre_trigrams = TrigramIndex()
+        self._costars = CostarGraph()
+        self._completions = {'title': PrefixIndex(), 'actor': PrefixIndex(), 'director': PrefixIndex(),
+                             'genre': PrefixIndex()}
+        self._text_index = TextIndex()
+        self._range_indexes = {'year': SortedIndex(), 'runtime_minutes': SortedIndex(), 'rating': SortedIndex()}
+        self._sort_orders = {name: SortOrder() for name in SORT_ORDERS}
+        self._columns = MovieColumnStore()
+
+        self._users = dict()
+        # A derived generation shares its parent's movies and indexes, copying each one the first time it changes.
+        self._copy_on_write = False
+        self._owned = set()
 
     @property
     def movies(self) -> Generator[Movie, None, None]:
-        return (movie for movie in self._movies)
+        return (self._movies_index[movie.id] for movie in self._movies)
 
     @property
     def users(self) -> Generator[User, None, None]:
-        return (user for user in self._users)
+        return (user for user in self._users.values())
 
     @property
     def genres(self) -> Generator[str, None, None]:
@@ -41,56 +68,118 @@ class MemoryRepository(AbstractRepository):
         return (direcotr for direcotr in self._directors_index)
 
     def add_movie(self, movie: Movie) -> bool:
-        if movie in self._movies:
+        if title_year_key(movie.title, movie.year) in self._title_year_index:
             return False
-        insort_left(self._movies, movie)
+        insort_left(self._writable('_movies'), movie)
 
         self._update_movie_index(movie)
+        self._update_title_year_index(movie)
         self._update_actor_index(movie)
         self._update_director_index(movie)
         self._update_genre_index(movie)
+        for name, key in self._range_index_keys(movie):
+            self._writable_entry('_range_indexes', name).add(key, movie.id)
+        for name, key in self._sort_order_keys(movie):
+            self._writable_entry('_sort_orders', name).add(key, movie.id)
+        for field, names in _completion_names(movie):
+            for name in names:
+                self._writable_entry('_completions', field).add(name)
         return True
 
+    def add_movies(self, movies: Iterable[Movie]) -> int:
+        new_movies = dict()
+        for movie in movies:
+            key = title_year_key(movie.title, movie.year)
+            if key not in self._title_year_index and key not in new_movies:
+                new_movies[key] = movie
+        if not new_movies:
+            return 0
+
+        added = sorted(new_movies.values())
+        range_entries = {name: [] for name in self._range_indexes}
+        sort_entries = {name: [] for name in self._sort_orders}
+        completion_names = {field: [] for field in self._completions}
+        for movie in added:
+            self._update_movie_index(movie)
+            self._update_title_year_index(movie)
+            self._update_actor_index(movie)
+            self._update_director_index(movie)
+            self._update_genre_index(movie)
+            for name in self._range_indexes:
+                value = numeric_attribute(movie, name)
+                if value is not None:
+                    range_entries[name].append((SortedIndex.key(value, movie.title, movie.year), movie.id))
+            for name in self._sort_orders:
+                sort_entries[name].append((_sort_key(movie, name), movie.id))
+            for field, names in _completion_names(movie):
+                completion_names[field].extend(names)
+        for name, entries in range_entries.items():
+            self._writable_entry('_range_indexes', name).add_many(entries)
+        for name, entries in sort_entries.items():
+            self._writable_entry('_sort_orders', name).add_many(entries)
+        for field, names in completion_names.items():
+            self._writable_entry('_completions', field).add_many(names)
+        movies = self._writable('_movies')
+        movies.extend(added)
+        movies.sort()
+        return len(added)
+
+    def load_from_reader(self, reader: MovieFileCSVReader) -> int:
+        reader.read_csv_file()
+        return self.add_movies(reader.dataset_of_movies)
+
     def _update_movie_index(self, movie: Movie):
-        self._movies_index[movie.id] = movie
+        self._writable('_movies_index')[movie.id] = movie
+        self._writable('_text_index').add(movie.id, movie.title, movie.description)
+        self._writable('_columns').add(movie)
+
+    def _update_title_year_index(self, movie: Movie):
+        self._writable('_title_year_index')[title_year_key(movie.title, movie.year)] = movie.id
 
     def _update_actor_index(self, movie: Movie):
         if movie.actors:
+            self._writable('_costars').add_cast(actor.actor_full_name for actor in movie.actors)
             for actor in movie.actors:
-                movie_ids = self._actors_index.get(actor.actor_full_name, [])
-                movie_ids.append(movie.id)
-                self._actors_index.update({
-                    actor.actor_full_name: movie_ids
-                })
+                if actor.actor_full_name not in self._actors_index:
+                    self._writable('_actor_names').add(actor.actor_full_name)
+                    self._writable('_actor_trigrams').add(actor.actor_full_name)
+                self._insert_movie_id(self._posting_list('_actors_index', actor.actor_full_name), movie)
 
     def _update_director_index(self, movie: Movie):
         if movie.director:
-            movie_ids = self._directors_index.get(movie.director.director_full_name, [])
-            movie_ids.append(movie.id)
-            self._directors_index.update({
-                movie.director.director_full_name: movie_ids
-            })
+            if movie.director.director_full_name not in self._directors_index:
+                self._writable('_director_names').add(movie.director.director_full_name)
+                self._writable('_director_trigrams').add(movie.director.director_full_name)
+            self._insert_movie_id(self._posting_list('_directors_index', movie.director.director_full_name), movie)
 
     def _update_genre_index(self, movie: Movie):
         if movie.genres:
             for genre in movie.genres:
-                movie_ids = self._genres_index.get(genre.genre_name, [])
-                movie_ids.append(movie.id)
-                self._genres_index.update({
-                    genre.genre_name: movie_ids
-                })
+                if genre.genre_name not in self._genres_index:
+                    self._writable('_genre_names').add(genre.genre_name)
+                    self._writable('_genre_trigrams').add(genre.genre_name)
+                self._insert_movie_id(self._posting_list('_genres_index', genre.genre_name), movie)
+
+    def _insert_movie_id(self, movie_ids: List[str], movie: Movie):
+        # Posting lists are kept in movie order so they can be bisected by (title, year).
+        position = _bisect_by_key(movie_ids, _movie_key(movie), self._movie_key_by_id, right=True)
+        movie_ids.insert(position, movie.id)
+
+    def _movie_key_by_id(self, movie_id: str) -> Tuple[str, int]:
+        return _movie_key(self._movies_index[movie_id])
 
     def get_movie(self, title: str, year: int) -> Movie:
-        return next((movie for movie in self._movies
-                     if movie.title.lower() == title.lower()
-                     and movie.year == year),
-                    None)
+        return self._movies_index.get(self._title_year_index.get(title_year_key(title, year)))
 
     def get_movie_by_id(self, movie_id: str) -> Movie:
         return self._movies_index.get(movie_id)
 
-    def get_n_movies(self, n: int, offset: int = 0) -> List[Movie]:
-        return self._movies[offset: offset + n]
+    def get_n_movies(self, n: int, offset: int = 0, sort_by: str = None, descending: bool = False) -> List[Movie]:
+        if sort_by is None:
+            return [self._movies_index[movie.id] for movie in self._movies[offset: offset + n]]
+        if sort_by not in self._sort_orders:
+            raise RepositoryException(f'Cannot sort movies by {sort_by!r}')
+        return [self._movies_index[movie_id] for movie_id in self._sort_orders[sort_by].page(offset, n, descending)]
 
     def get_total_number_of_movies(self) -> int:
         return len(self._movies)
@@ -103,11 +192,61 @@ class MemoryRepository(AbstractRepository):
 
     def _get_movie_by_idx(self, idx: int) -> Movie:
         try:
-            movie = self._movies[idx]
+            movie = self._movies_index[self._movies[idx].id]
         except IndexError:
             movie = None
         return movie
 
+    def get_movie_rank(self, title: str, year: int, inclusive: bool = False, index: str = None,
+                       lookup_key: str = None) -> int:
+        if index is None:
+            return _bisect_by_key(self._movies, (title, year), _movie_key, right=inclusive)
+        posting_indexes = {'actor': self._actors_index, 'director': self._directors_index, 'genre': self._genres_index}
+        movie_ids = posting_indexes[index].get(lookup_key, [])
+        return _bisect_by_key(movie_ids, (title, year), self._movie_key_by_id, right=inclusive)
+
+    def get_movies_by_year_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        return self._get_movies_from_range(self._range_indexes['year'], low, high)
+
+    def get_movies_by_runtime_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        return self._get_movies_from_range(self._range_indexes['runtime_minutes'], low, high)
+
+    def get_movies_by_rating_range(self, low: float = None, high: float = None) -> Generator[Movie, None, None]:
+        return self._get_movies_from_range(self._range_indexes['rating'], low, high)
+
+    def _get_movies_from_range(self, index: SortedIndex, low: float, high: float) -> Generator[Movie, None, None]:
+        return (self.get_movie_by_id(movie_id) for movie_id in index.range(low, high))
+
+    def get_movies_by_year_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                      n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_range(self._range_indexes['year'], low, high, offset, n)
+
+    def get_movies_by_runtime_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                         n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_range(self._range_indexes['runtime_minutes'], low, high, offset, n)
+
+    def get_movies_by_rating_range_page(self, low: Optional[float], high: Optional[float], offset: int,
+                                        n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_range(self._range_indexes['rating'], low, high, offset, n)
+
+    def _get_movies_page_from_range(self, index: SortedIndex, low: float, high: float, offset: int,
+                                    n: int) -> Tuple[List[Movie], int]:
+        movie_ids, total = index.range_page(low, high, offset, n)
+        return [self._movies_index[movie_id] for movie_id in movie_ids], total
+
+    def get_movie_statistics(self, column: str, ranges: Dict[str, Tuple[Optional[float], Optional[float]]] = None
+                             ) -> Dict[str, Optional[float]]:
+        ranges = ranges or {}
+        for name in [column, *ranges]:
+            if name not in NUMERIC_COLUMNS:
+                raise RepositoryException(f'Cannot aggregate movies by {name!r}')
+        return self._columns.aggregate(column, self._columns.filter(**ranges))
+
+    @property
+    def column_store(self) -> MovieColumnStore:
+        """ The numeric movie attributes column by column. Callers must not modify it. """
+        return self._columns
+
     def get_movies_by_actor(self, actor: str) -> Generator[Movie, None, None]:
         return self._get_movies_from_index(self._actors_index, actor)
 
@@ -121,40 +260,329 @@ class MemoryRepository(AbstractRepository):
         movies_ids = index.get(lookup_key, [])
         return (self.get_movie_by_id(movie_id) for movie_id in movies_ids)
 
+    def get_movies_by_actor_page(self, actor: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_index(self._actors_index, actor, offset, n)
+
+    def get_movies_by_director_page(self, director: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_index(self._directors_index, director, offset, n)
+
+    def get_movies_by_genre_page(self, genre: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_index(self._genres_index, genre, offset, n)
+
+    def _get_movies_page_from_index(self, index: dict, lookup_key: str, offset: int,
+                                    n: int) -> Tuple[List[Movie], int]:
+        movie_ids = index.get(lookup_key, [])
+        return [self.get_movie_by_id(movie_id) for movie_id in movie_ids[offset: offset + n]], len(movie_ids)
+
+    def get_movies_by_text_page(self, text: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        ranked = self._text_index.search(text)
+        return [self._movies_index[movie_id] for movie_id, _ in ranked[offset: offset + n]], len(ranked)
+
+    def get_closest_actor(self, name: str, max_distance: int = None) -> Optional[str]:
+        return self._actor_names.closest(name, max_distance, self._actors_index.__contains__)
+
+    def get_closest_director(self, name: str, max_distance: int = None) -> Optional[str]:
+        return self._director_names.closest(name, max_distance, self._directors_index.__contains__)
+
+    def get_closest_genre(self, name: str, max_distance: int = None) -> Optional[str]:
+        return self._genre_names.closest(name, max_distance, self._genres_index.__contains__)
+
+    def suggest_actors(self, term: str, k: int = 5) -> List[str]:
+        return self._actor_trigrams.suggest(term, k, self._actors_index.__contains__)
+
+    def suggest_directors(self, term: str, k: int = 5) -> List[str]:
+        return self._director_trigrams.suggest(term, k, self._directors_index.__contains__)
+
+    def suggest_genres(self, term: str, k: int = 5) -> List[str]:
+        return self._genre_trigrams.suggest(term, k, self._genres_index.__contains__)
+
+    def complete_titles(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self._completions['title'].complete(prefix, n)
+
+    def complete_actors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self._completions['actor'].complete(prefix, n)
+
+    def complete_directors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self._completions['director'].complete(prefix, n)
+
+    def complete_genres(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self._completions['genre'].complete(prefix, n)
+
+    def get_costars(self, actor: str) -> List[str]:
+        return self._costars.costars(actor)
+
+    def have_worked_together(self, actor: str, other_actor: str) -> bool:
+        return self._costars.worked_with(actor, other_actor)
+
+    def get_shared_movies(self, actor: str, other_actor: str) -> List[Movie]:
+        if not self._costars.worked_with(actor, other_actor):
+            return []
+        other_movie_ids = set(self._actors_index.get(other_actor, []))
+        return [self._movies_index[movie_id] for movie_id in self._actors_index.get(actor, [])
+                if movie_id in other_movie_ids]
+
+    def get_actor_path(self, actor: str, other_actor: str) -> List[str]:
+        return self._costars.shortest_path(actor, other_actor)
+
     def delete_movie(self, movie_to_delete: Movie) -> bool:
-        if movie_to_delete in self._movies:
-            self._movies.remove(movie_to_delete)
-            return True
-        return False
+        movie = self.get_movie(movie_to_delete.title, movie_to_delete.year)
+        if movie is None:
+            return False
+        movies = self._writable('_movies')
+        del movies[bisect_left(movies, movie)]
+        self._remove_from_indexes(movie)
+        return True
+
+    def delete_movies(self, movies_to_delete: Iterable[Movie]) -> int:
+        deleted = dict()
+        for movie_to_delete in movies_to_delete:
+            movie = self.get_movie(movie_to_delete.title, movie_to_delete.year)
+            if movie is not None:
+                deleted[movie.id] = movie
+        if not deleted:
+            return 0
+
+        affected_keys = dict()
+        for movie in deleted.values():
+            self._writable('_movies_index').pop(movie.id, None)
+            self._writable('_text_index').remove(movie.id, movie.title, movie.description)
+            self._writable('_columns').remove(movie.id)
+            self._remove_completions(movie)
+            self._writable('_costars').remove_cast(actor.actor_full_name for actor in movie.actors)
+            self._writable('_title_year_index').pop(title_year_key(movie.title, movie.year), None)
+            for name, lookup_keys in self._secondary_indexes(movie):
+                affected_keys.setdefault(name, set()).update(lookup_keys)
+
+        for name, keys in affected_keys.items():
+            index = self._writable(name)
+            for lookup_key in keys:
+                # Rebuilt rather than filtered in place, the old list may belong to an earlier generation.
+                movie_ids = [movie_id for movie_id in index.get(lookup_key, []) if movie_id not in deleted]
+                if movie_ids:
+                    index[lookup_key] = movie_ids
+                else:
+                    index.pop(lookup_key, None)
+        for name in self._range_indexes:
+            self._writable_entry('_range_indexes', name).remove_many(deleted)
+        for name in self._sort_orders:
+            self._writable_entry('_sort_orders', name).remove_many(deleted)
+        self._movies = [movie for movie in self._movies if movie.id not in deleted]
+        return len(deleted)
+
+    def _remove_from_indexes(self, movie: Movie):
+        # Posting lists go first, bisecting them looks the movies up by id.
+        for name, lookup_keys in self._secondary_indexes(movie):
+            for lookup_key in lookup_keys:
+                movie_ids = getattr(self, name).get(lookup_key, [])
+                position = _bisect_by_key(movie_ids, _movie_key(movie), self._movie_key_by_id)
+                if position < len(movie_ids) and movie_ids[position] == movie.id:
+                    movie_ids = self._writable_entry(name, lookup_key)
+                    del movie_ids[position]
+                    if not movie_ids:
+                        self._writable(name).pop(lookup_key)
+        self._writable('_movies_index').pop(movie.id, None)
+        self._writable('_text_index').remove(movie.id, movie.title, movie.description)
+        self._writable('_columns').remove(movie.id)
+        self._writable('_title_year_index').pop(title_year_key(movie.title, movie.year), None)
+        for name, key in self._range_index_keys(movie):
+            self._writable_entry('_range_indexes', name).remove(key, movie.id)
+        for name, key in self._sort_order_keys(movie):
+            self._writable_entry('_sort_orders', name).remove(key, movie.id)
+        self._remove_completions(movie)
+        self._writable('_costars').remove_cast(actor.actor_full_name for actor in movie.actors)
+
+    def _secondary_indexes(self, movie: Movie) -> List[Tuple[str, List[str]]]:
+        return [
+            ('_actors_index', [actor.actor_full_name for actor in movie.actors]),
+            ('_directors_index', [movie.director.director_full_name] if movie.director else []),
+            ('_genres_index', [genre.genre_name for genre in movie.genres])
+        ]
+
+    def _range_index_keys(self, movie: Movie) -> List[Tuple[str, tuple]]:
+        values = ((name, numeric_attribute(movie, name)) for name in self._range_indexes)
+        return [(name, SortedIndex.key(value, movie.title, movie.year)) for name, value in values if value is not None]
+
+    def _remove_completions(self, movie: Movie):
+        for field, names in _completion_names(movie):
+            for name in names:
+                self._writable_entry('_completions', field).remove(name)
+
+    def _sort_order_keys(self, movie: Movie) -> List[Tuple[str, tuple]]:
+        return [(name, _sort_key(movie, name)) for name in self._sort_orders]
+
+    def add_review(self, review: Review) -> None:
+        movie = self._writable_movie(review.movie.id)
+        if movie:
+            movie.add_review(review)
+
+    def add_review_rows(self, rows: Iterable[Tuple[str, str, str, int, float]]) -> int:
+        added = 0
+        for movie_id, *review_fields in rows:
+            movie = self._writable_movie(movie_id)
+            if movie is not None:
+                movie.add_review(Review(movie, *review_fields))
+                added += 1
+        return added
+
+    def remove_review(self, movie_id: str, review_id: str) -> None:
+        movie = self._writable_movie(movie_id)
+        if movie:
+            movie.remove_review_by_id(review_id)
 
     def add_user(self, user: User) -> None:
-        if user not in self._users:
-            self._users.append(user)
+        self._writable('_users').setdefault(username_key(user.username), user)
 
     def get_user(self, username: str) -> User:
-        return next((user for user in self._users
-                     if user.username.strip().lower() == username.strip().lower()),
-                    None)
-
-
-def populate_movies(data_path: str, repo: MemoryRepository) -> None:
+        return self._users.get(username_key(username))
+
+    def clone(self) -> 'MemoryRepository':
+        """ Copy the movie list and every index, sharing the domain objects with this repo. """
+        repo = MemoryRepository()
+        repo._movies = list(self._movies)
+        repo._movies_index = dict(self._movies_index.items())
+        repo._title_year_index = dict(self._title_year_index.items())
+        repo._actors_index = {key: list(movie_ids) for key, movie_ids in self._actors_index.items()}
+        repo._directors_index = {key: list(movie_ids) for key, movie_ids in self._directors_index.items()}
+        repo._genres_index = {key: list(movie_ids) for key, movie_ids in self._genres_index.items()}
+        repo._actor_names = self._actor_names.clone()
+        repo._director_names = self._director_names.clone()
+        repo._genre_names = self._genre_names.clone()
+        repo._actor_trigrams = self._actor_trigrams.clone()
+        repo._director_trigrams = self._director_trigrams.clone()
+        repo._genre_trigrams = self._genre_trigrams.clone()
+        repo._costars = self._costars.clone()
+        repo._completions = {field: index.clone() for field, index in self._completions.items()}
+        repo._text_index = self._text_index.clone()
+        repo._range_indexes = {name: index.clone() for name, index in self._range_indexes.items()}
+        repo._sort_orders = {name: order.clone() for name, order in self._sort_orders.items()}
+        repo._columns = self._columns.clone()
+        repo._users = dict(self._users.items())
+        return repo
+
+    def derive(self) -> 'MemoryRepository':
+        """ A new generation sharing the movies and every index with this repo until it changes them.
+
+        Each index is copied the first time the new generation writes to it, posting lists, completions and
+        range indexes one key at a time. The movies and users by id are shared maps, so a write copies only the
+        bucket of the entry it changes, and a movie is copied before its reviews change. This repo never sees
+        the changes.
+        """
+        repo = MemoryRepository.__new__(MemoryRepository)
+        repo.__dict__.update(self.__dict__)
+        repo._copy_on_write = True
+        repo._owned = set()
+        return repo
+
+    def _writable(self, name: str):
+        value = getattr(self, name)
+        if self._copy_on_write and name not in self._owned:
+            value = _COPIES[name](value)
+            setattr(self, name, value)
+            self._owned.add(name)
+        return value
+
+    def _writable_entry(self, name: str, key: str):
+        index = self._writable(name)
+        value = index[key]
+        if self._copy_on_write and (name, key) not in self._owned:
+            value = index[key] = _ENTRY_COPIES[name](value)
+            self._owned.add((name, key))
+        return value
+
+    def _posting_list(self, name: str, lookup_key: str) -> List[str]:
+        self._writable(name).setdefault(lookup_key, [])
+        return self._writable_entry(name, lookup_key)
+
+    def _writable_movie(self, movie_id: str) -> Optional[Movie]:
+        movie = self._movies_index.get(movie_id)
+        if movie is None or not self._copy_on_write or ('_movies_index', movie_id) in self._owned:
+            return movie
+        # Readers of earlier generations keep the old movie, and with it the old reviews.
+        copy = movie.copy()
+        self._writable('_movies_index')[movie_id] = copy
+        self._owned.add(('_movies_index', movie_id))
+        return copy
+
+
+def _shared_copy(index) -> SharedMap:
+    return index.copy() if isinstance(index, SharedMap) else SharedMap(index.items())
+
+
+# How a derived generation copies an index before its first write to it.
+_COPIES = {
+    '_movies': list,
+    '_movies_index': _shared_copy,
+    '_title_year_index': _shared_copy,
+    '_actors_index': dict,
+    '_directors_index': dict,
+    '_genres_index': dict,
+    '_actor_names': BKTree.clone,
+    '_director_names': BKTree.clone,
+    '_genre_names': BKTree.clone,
+    '_actor_trigrams': TrigramIndex.clone,
+    '_director_trigrams': TrigramIndex.clone,
+    '_genre_trigrams': TrigramIndex.clone,
+    '_costars': CostarGraph.clone,
+    '_completions': dict,
+    '_text_index': TextIndex.clone,
+    '_range_indexes': dict,
+    '_sort_orders': dict,
+    '_columns': MovieColumnStore.clone,
+    '_users': _shared_copy
+}
+# The indexes copied shallowly above copy their entries one at a time.
+_ENTRY_COPIES = {
+    '_actors_index': list,
+    '_directors_index': list,
+    '_genres_index': list,
+    '_completions': PrefixIndex.clone,
+    '_range_indexes': SortedIndex.clone,
+    '_sort_orders': SortOrder.clone
+}
+
+
+def _movie_key(movie: Movie) -> Tuple[str, int]:
+    return movie.title, movie.year
+
+
+def _completion_names(movie: Movie) -> List[Tuple[str, List[str]]]:
+    return [
+        ('title', [movie.title]),
+        ('actor', [actor.actor_full_name for actor in movie.actors]),
+        ('director', [movie.director.director_full_name] if movie.director else []),
+        ('genre', [genre.genre_name for genre in movie.genres])
+    ]
+
+
+def _sort_key(movie: Movie, name: str) -> tuple:
+    return SortOrder.key(numeric_attribute(movie, name), movie.title, movie.year)
+
+
+def _bisect_by_key(items: list, key: tuple, key_of: Callable[[object], tuple], right: bool = False) -> int:
+    """ bisect_left, or bisect_right when right is set, of key in items sorted by key_of. """
+    low, high = 0, len(items)
+    while low < high:
+        middle = (low + high) // 2
+        middle_key = key_of(items[middle])
+        if middle_key < key or (right and middle_key == key):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def populate_movies(data_path: str, repo: AbstractRepository) -> None:
     reader = MovieFileCSVReader(data_path)
     reader.read_csv_file()
-    for movie in reader.dataset_of_movies:
-        repo.add_movie(movie)
+    repo.add_movies(reader.dataset_of_movies)
 
 
-def populate_users(data_path: str, repo: MemoryRepository) -> None:
+def populate_users(data_path: str, repo: AbstractRepository) -> None:
     reader = UserFileCSVReader(data_path)
     for user in reader.dataset_of_users:
         repo.add_user(user)
 
 
-def populate_reviews(data_path: str, repo: MemoryRepository) -> None:
+def populate_reviews(data_path: str, repo: AbstractRepository) -> None:
     reader = ReviewFileCSVReader(data_path)
-    for review_fields in reader.dataset_of_reviews:
-        movie_id = review_fields[0]
-        review_args = review_fields[1:]
-        movie = repo.get_movie_by_id(movie_id)
-        review = Review(movie, *review_args)
-        movie.add_review(review)
+    repo.add_review_rows(reader.dataset_of_reviews)
@@ -0,0 +1,62 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+# Sorts after every character a prefix can continue with, so (prefix + END,) bounds the names with that prefix.
+END = '\U0010ffff'
+
+
+class PrefixIndex:
+    """ Names in case-insensitive order with the number of movies each appears in.
+
+    The names starting with a prefix are one contiguous run of the sorted array, found with two bisects, and
+    completions are the most frequent names of that run.
+    """
+
+    def __init__(self):
+        self._keys = list()
+        self._counts = dict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, name: str, count: int = 1) -> None:
+        if name not in self._counts:
+            insort(self._keys, (name.casefold(), name))
+            self._counts[name] = 0
+        self._counts[name] += count
+
+    def add_many(self, names: Iterable[str]) -> None:
+        counts = Counter(names)
+        new_names = [name for name in counts if name not in self._counts]
+        for name, count in counts.items():
+            self._counts[name] = self._counts.get(name, 0) + count
+        if new_names:
+            self._keys.extend((name.casefold(), name) for name in new_names)
+            self._keys.sort()
+
+    def remove(self, name: str, count: int = 1) -> None:
+        remaining = self._counts.get(name, 0) - count
+        if remaining > 0:
+            self._counts[name] = remaining
+        elif name in self._counts:
+            del self._counts[name]
+            del self._keys[bisect_left(self._keys, (name.casefold(), name))]
+
+    def count(self, name: str) -> int:
+        return self._counts.get(name, 0)
+
+    def complete(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        """ Up to n (name, movie count) pairs of names starting with prefix, most movies first, then by name. """
+        prefix = prefix.casefold()
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + END,), lo=start)
+        matches = ((name, self._counts[name]) for _, name in self._keys[start:end])
+        return heapq.nsmallest(n, matches, key=lambda match: (-match[1], match[0].casefold(), match[0]))
+
+    def clone(self) -> 'PrefixIndex':
+        index = PrefixIndex()
+        index._keys = list(self._keys)
+        index._counts = dict(self._counts)
+        return index
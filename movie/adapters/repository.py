@@ -1,11 +1,16 @@
 import abc
-from typing import List, Generator
+from typing import List, Generator, Iterable, Tuple, Optional, Dict
 
-from movie.domainmodel.movie import Movie
+from movie.domainmodel.movie import Movie, Review
 from movie.domainmodel.user import User
 
 repo_instance: 'AbstractRepository' = None
 
+# Numeric movie attributes get_n_movies can order by besides the default (title, year).
+SORT_ORDERS = ('year', 'runtime_minutes', 'rating', 'votes', 'revenue_millions')
+# Numeric movie attributes get_movie_statistics can filter and aggregate.
+NUMERIC_COLUMNS = ('year', 'runtime_minutes', 'rating', 'votes', 'revenue_millions', 'metascore')
+
 
 class RepositoryException(Exception):
     def __init__(self, message=None):
@@ -48,6 +53,11 @@ class AbstractRepository(abc.ABC):
         """" Adds a Movie to the repository. """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def add_movies(self, movies: Iterable[Movie]) -> int:
+        """" Adds Movies to the repository in bulk, returns the number of movies added. """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_movie(self, title: str, year: int) -> Movie:
         """ Get a Movie from the repository. """
@@ -59,8 +69,12 @@ class AbstractRepository(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    def get_n_movies(self, n: int, offset: int) -> List[Movie]:
-        """ Get next n Movies from the repository starts from offset. """
+    def get_n_movies(self, n: int, offset: int, sort_by: str = None, descending: bool = False) -> List[Movie]:
+        """ Get next n Movies from the repository starts from offset.
+
+        sort_by is one of SORT_ORDERS, optionally descending, ties are in (title, year) order either way and movies
+        without a value come last. Without sort_by movies are in (title, year) order and descending is ignored.
+        """
         raise NotImplementedError
 
     @abc.abstractmethod
@@ -78,6 +92,58 @@ class AbstractRepository(abc.ABC):
         """ Get the last Movie in the repo. """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_movie_rank(self, title: str, year: int, inclusive: bool = False, index: str = None,
+                       lookup_key: str = None) -> int:
+        """ Number of movies ordered before (title, year), or up to and including it when inclusive.
+
+        Counts all movies, or with index 'actor', 'director' or 'genre' only the movies of lookup_key.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_year_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        """ Movies released from year low to high inclusive, ordered by year. None leaves that end open. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_runtime_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        """ Movies with runtime from low to high minutes inclusive, ordered by runtime. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_rating_range(self, low: float = None, high: float = None) -> Generator[Movie, None, None]:
+        """ Movies rated from low to high inclusive, ordered by rating. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_year_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                      n: int) -> Tuple[List[Movie], int]:
+        """ n of the movies in the year range starting from offset, in year order, and the number in range. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_runtime_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                         n: int) -> Tuple[List[Movie], int]:
+        """ n of the movies in the runtime range starting from offset, in runtime order, and the number in range. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_rating_range_page(self, low: Optional[float], high: Optional[float], offset: int,
+                                        n: int) -> Tuple[List[Movie], int]:
+        """ n of the movies in the rating range starting from offset, in rating order, and the number in range. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movie_statistics(self, column: str, ranges: Dict[str, Tuple[Optional[float], Optional[float]]] = None
+                             ) -> Dict[str, Optional[float]]:
+        """ count, sum, mean, min and max of one of NUMERIC_COLUMNS over the movies with a value for it.
+
+        ranges maps columns to inclusive (low, high) bounds the movies must fall in, None leaves that end open, and
+        movies without a value for a ranged column are left out.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_movies_by_actor(self, actor: str) -> Generator[Movie, None, None]:
         """ Search the repo based on actor. """
@@ -93,11 +159,125 @@ class AbstractRepository(abc.ABC):
         """ Search the repo based on genre. """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_movies_by_actor_page(self, actor: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        """ Get n of the actor's movies starting from offset, and the total number of the actor's movies. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_director_page(self, director: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        """ Get n of the director's movies starting from offset, and the total number of the director's movies. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_genre_page(self, genre: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        """ Get n of the genre's movies starting from offset, and the total number of the genre's movies. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_movies_by_text_page(self, text: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        """ A page of the movies whose title or description contains a word of text, best BM25 match first,
+        and the number of matching movies. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_closest_actor(self, name: str, max_distance: int = None) -> Optional[str]:
+        """ The actor name nearest to name by case-insensitive edit distance, None if none is within max_distance. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_closest_director(self, name: str, max_distance: int = None) -> Optional[str]:
+        """ The director name nearest to name, see get_closest_actor. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_closest_genre(self, name: str, max_distance: int = None) -> Optional[str]:
+        """ The genre name nearest to name, see get_closest_actor. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def suggest_actors(self, term: str, k: int = 5) -> List[str]:
+        """ Up to k actor names sharing character trigrams with term, nearest by edit distance first. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def suggest_directors(self, term: str, k: int = 5) -> List[str]:
+        """ Up to k director names for term, see suggest_actors. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def suggest_genres(self, term: str, k: int = 5) -> List[str]:
+        """ Up to k genre names for term, see suggest_actors. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def complete_titles(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        """ Up to n (title, movie count) pairs of titles starting with prefix, ignoring case, most movies first. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def complete_actors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        """ Up to n (actor name, movie count) pairs for prefix, see complete_titles. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def complete_directors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        """ Up to n (director name, movie count) pairs for prefix, see complete_titles. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def complete_genres(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        """ Up to n (genre name, movie count) pairs for prefix, see complete_titles. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_costars(self, actor: str) -> List[str]:
+        """ Names of the actors who appeared in a movie with actor, in name order. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def have_worked_together(self, actor: str, other_actor: str) -> bool:
+        """ Whether the two actors appeared in a movie together. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_shared_movies(self, actor: str, other_actor: str) -> List[Movie]:
+        """ The movies both actors appeared in, in (title, year) order. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_actor_path(self, actor: str, other_actor: str) -> List[str]:
+        """ Actor names of a shortest chain of co-stars from actor to other_actor, empty if there is none. """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def delete_movie(self, movie_to_delete: Movie) -> bool:
         """ Delete movie from the repo. """
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def delete_movies(self, movies_to_delete: Iterable[Movie]) -> int:
+        """ Delete movies from the repo, returns the number of movies deleted. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add_review(self, review: Review) -> None:
+        """ Add a review to the reviewed movie. """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add_review_rows(self, rows: Iterable[Tuple[str, str, str, int, float]]) -> int:
+        """ Bulk load (movie id, username, review text, rating, timestamp) rows, skipping unknown movies.
+
+        Returns the number of rows whose movie exists.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def remove_review(self, movie_id: str, review_id: str) -> None:
+        """ Remove a review from the movie. """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def add_user(self, user: User) -> None:
         """ Add new user to the repo """
@@ -107,3 +287,11 @@ class AbstractRepository(abc.ABC):
     def get_user(self, username: str) -> User:
         """ Get existing user from the repo """
         raise NotImplementedError
+
+
+def title_year_key(title: str, year: int) -> tuple:
+    return (title.strip().casefold() if title else title), year
+
+
+def username_key(username: str) -> str:
+    return username.strip().lower()
@@ -0,0 +1,95 @@
+from typing import Any, Hashable, Iterable, Iterator, Tuple
+
+MIN_BUCKETS = 8
+
+
+class SharedMap:
+    """ Mapping whose copies share their entries, a copy taking its own bucket of them the first time it changes one.
+
+    Keys are spread by hash over about sqrt(n) dicts, so copy() and the first write to each bucket afterwards cost
+    O(sqrt(n)) rather than the O(n) of copying a dict. Iteration follows insertion order like a dict.
+    """
+
+    def __init__(self, items: Iterable[Tuple[Hashable, Any]] = ()):
+        self._buckets = [dict() for _ in range(MIN_BUCKETS)]
+        self._owned = bytearray(b'\x01' * MIN_BUCKETS)
+        self._size = 0
+        self._sequence = 0
+        for key, value in items:
+            self[key] = value
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._buckets[hash(key) & (len(self._buckets) - 1)]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._buckets[hash(key) & (len(self._buckets) - 1)][key][1]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._buckets[hash(key) & (len(self._buckets) - 1)].get(key)
+        return default if entry is None else entry[1]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        bucket = self._writable_bucket(key)
+        entry = bucket.get(key)
+        if entry is not None:
+            bucket[key] = (entry[0], value)
+            return
+        self._sequence += 1
+        self._size += 1
+        bucket[key] = (self._sequence, value)
+        if self._size > 2 * len(self._buckets) ** 2:
+            self._resize(2 * len(self._buckets))
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self:
+            return default
+        self._size -= 1
+        return self._writable_bucket(key).pop(key)[1]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return (key for _, key, _ in self._entries())
+
+    def values(self) -> Iterator[Any]:
+        return (value for _, _, value in self._entries())
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        return ((key, value) for _, key, value in self._entries())
+
+    def _entries(self) -> list:
+        entries = [(sequence, key, value) for bucket in self._buckets for key, (sequence, value) in bucket.items()]
+        entries.sort()
+        return entries
+
+    def copy(self) -> 'SharedMap':
+        """ A map with the same entries, sharing every bucket with this one until either of them changes it. """
+        copy = SharedMap.__new__(SharedMap)
+        copy._buckets = list(self._buckets)
+        copy._size = self._size
+        copy._sequence = self._sequence
+        # Neither map may change a shared bucket in place any more.
+        copy._owned = bytearray(len(self._buckets))
+        self._owned = bytearray(len(self._buckets))
+        return copy
+
+    def _writable_bucket(self, key: Hashable) -> dict:
+        position = hash(key) & (len(self._buckets) - 1)
+        if not self._owned[position]:
+            self._buckets[position] = dict(self._buckets[position])
+            self._owned[position] = 1
+        return self._buckets[position]
+
+    def _resize(self, count: int) -> None:
+        buckets = [dict() for _ in range(count)]
+        for bucket in self._buckets:
+            for key, entry in bucket.items():
+                buckets[hash(key) & (count - 1)][key] = entry
+        self._buckets = buckets
+        self._owned = bytearray(b'\x01' * count)
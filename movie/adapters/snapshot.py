@@ -0,0 +1,110 @@
+import gc
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import List, Tuple, Optional, Sequence
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from movie.adapters.memory_repository import MemoryRepository, populate_movies, populate_users, populate_reviews
+
+SNAPSHOT_MAGIC = b'MOVIESNAPSHOT'
+# Packages whose classes end up in the pickle. Any change to their sources makes older snapshots stale.
+SNAPSHOT_SOURCE_PACKAGES = ('adapters', 'domainmodel')
+
+Fingerprint = List[Tuple[int, int, str]]
+
+
+def _source_version() -> bytes:
+    """ Digest of the sources of the pickled classes, so the snapshot format version never needs bumping by hand. """
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for package in SNAPSHOT_SOURCE_PACKAGES:
+        source_dir = os.path.join(package_dir, package)
+        for file_name in sorted(os.listdir(source_dir)):
+            if file_name.endswith('.py'):
+                digest.update(f'{package}/{file_name}'.encode('utf-8'))
+                with open(os.path.join(source_dir, file_name), 'rb') as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    return digest.digest()
+
+
+SNAPSHOT_HEADER = SNAPSHOT_MAGIC + _source_version()
+
+
+def fingerprint_data_files(data_paths: Sequence[str]) -> Fingerprint:
+    return [_fingerprint_data_file(data_path) for data_path in data_paths]
+
+
+def _fingerprint_data_file(data_path: str) -> Tuple[int, int, str]:
+    stat = os.stat(data_path)
+    digest = hashlib.sha256()
+    with open(data_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return stat.st_size, stat.st_mtime_ns, digest.hexdigest()
+
+
+def save_snapshot(snapshot_path: str, data_paths: Sequence[str], repo: MemoryRepository) -> None:
+    """ Serialize a fully populated repo, keyed by the data files it was built from. """
+    snapshot_dir = os.path.dirname(os.path.abspath(snapshot_path))
+    with tempfile.NamedTemporaryFile(mode='wb', dir=snapshot_dir, delete=False) as f:
+        f.write(SNAPSHOT_HEADER)
+        pickle.dump(fingerprint_data_files(data_paths), f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(repo, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f.name, snapshot_path)
+
+
+def load_snapshot(snapshot_path: str, data_paths: Sequence[str]) -> Optional[MemoryRepository]:
+    """ Load the repo from a snapshot, or None if it is missing, stale or any data file has changed since. """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            if f.read(len(SNAPSHOT_HEADER)) != SNAPSHOT_HEADER:
+                return None
+            if pickle.load(f) != fingerprint_data_files(data_paths):
+                return None
+            repo = _load_without_gc(f)
+    except Exception:
+        # Snapshots pickled by other code can fail in many ways, e.g. AttributeError or ImportError for classes
+        # that have moved, and any of them means falling back to the data files.
+        return None
+    if not isinstance(repo, MemoryRepository):
+        return None
+    return repo
+
+
+def _load_without_gc(f) -> object:
+    # Unpickling allocates the whole object graph at once and none of it is garbage, so GC passes are wasted.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.load(f)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def build_repository(movie_data_path: str, users_data_path: str, reviews_data_path: str) -> MemoryRepository:
+    repo = MemoryRepository()
+    populate_movies(movie_data_path, repo)
+    populate_users(users_data_path, repo)
+    populate_reviews(reviews_data_path, repo)
+    return repo
+
+
+@click.command('build-snapshot')
+@click.argument('snapshot_path', required=False)
+@with_appcontext
+def build_snapshot_command(snapshot_path: str):
+    """ Build the repository snapshot from the configured data files. """
+    snapshot_path = snapshot_path or current_app.config.get('REPOSITORY_SNAPSHOT_PATH')
+    if not snapshot_path:
+        raise click.UsageError('No snapshot path given and REPOSITORY_SNAPSHOT_PATH is not set')
+    data_paths = (current_app.config['MOVIE_DATA_PATH'],
+                  current_app.config['USER_DATA_PATH'],
+                  current_app.config['REVIEW_DATA_PATH'])
+    save_snapshot(snapshot_path, data_paths, build_repository(*data_paths))
+    click.echo(f'Snapshot written to {snapshot_path}')
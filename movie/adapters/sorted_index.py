@@ -0,0 +1,116 @@
+import math
+from bisect import bisect_left
+from typing import List, Iterable, Tuple, Optional
+
+from movie.domainmodel.movie import Movie
+
+
+class SortedIndex:
+    """ Movie ids ordered by a numeric value, ties broken by (title, year) as in the sqlite repository.
+
+    Each entry's key is (value, title, year), kept in a list parallel to the ids so range scans are two bisects.
+    """
+
+    def __init__(self):
+        self._keys = list()
+        self._movie_ids = list()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def key(value: float, title: str, year: int) -> Tuple:
+        return value, title, year
+
+    def add(self, key: Tuple, movie_id: str) -> None:
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._movie_ids.insert(position, movie_id)
+
+    def add_many(self, entries: Iterable[Tuple[Tuple, str]]) -> None:
+        entries = sorted(list(zip(self._keys, self._movie_ids)) + list(entries), key=lambda entry: entry[0])
+        self._keys = [key for key, _ in entries]
+        self._movie_ids = [movie_id for _, movie_id in entries]
+
+    def remove(self, key: Tuple, movie_id: str) -> bool:
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key and self._movie_ids[position] == movie_id:
+            del self._keys[position]
+            del self._movie_ids[position]
+            return True
+        return False
+
+    def remove_many(self, movie_ids: Iterable[str]) -> None:
+        movie_ids = set(movie_ids)
+        entries = [(key, movie_id) for key, movie_id in zip(self._keys, self._movie_ids) if movie_id not in movie_ids]
+        self._keys = [key for key, _ in entries]
+        self._movie_ids = [movie_id for _, movie_id in entries]
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> List[str]:
+        """ Movie ids with low <= value <= high in key order, None leaves that end open. """
+        start, end = self._bounds(low, high)
+        return self._movie_ids[start:end]
+
+    def range_page(self, low: Optional[float], high: Optional[float], offset: int, n: int) -> Tuple[List[str], int]:
+        """ n of the movie ids in range from offset, and the number of movie ids in range. """
+        start, end = self._bounds(low, high)
+        return self._movie_ids[start + offset: min(start + offset + n, end)], end - start
+
+    def _bounds(self, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self._keys, (low,))
+        # (low,) sorts before every key with value low, and the next float after high after every key with value high.
+        end = len(self._keys) if high is None else bisect_left(self._keys, (math.nextafter(high, math.inf),))
+        return start, max(start, end)
+
+    def clone(self) -> 'SortedIndex':
+        index = SortedIndex()
+        index._keys = list(self._keys)
+        index._movie_ids = list(self._movie_ids)
+        return index
+
+
+class SortOrder(SortedIndex):
+    """ A permutation of the movie ids ordered by a numeric attribute, ties broken by (title, year).
+
+    Ties stay in (title, year) order when descending too. Movies without a value sort after all the others in either
+    direction, so each entry's key is (missing, value, title, year) and the movies with a value are the prefix
+    before the first missing one.
+    """
+
+    @staticmethod
+    def key(value: Optional[float], title: str, year: int) -> Tuple:
+        return (1, 0.0, title, year) if value is None else (0, value, title, year)
+
+    def page(self, offset: int, n: int, descending: bool = False) -> List[str]:
+        if not descending:
+            return self._movie_ids[offset: offset + n]
+        # Walk the valued prefix backwards one run of equal values at a time, slicing each run forwards so ties
+        # stay in (title, year) order. The missing suffix ties throughout and keeps its order.
+        valued = bisect_left(self._keys, (1,))
+        end = min(offset + n, len(self._movie_ids))
+        page = []
+        position = offset
+        while position < min(end, valued):
+            value = self._keys[valued - 1 - position][1]
+            run_start = bisect_left(self._keys, (0, value), 0, valued - position)
+            run_end = bisect_left(self._keys, (0, math.nextafter(value, math.inf)), valued - 1 - position, valued)
+            first = run_start + position - (valued - run_end)
+            taken = min(end, valued - run_start) - position
+            page.extend(self._movie_ids[first: first + taken])
+            position += taken
+        page.extend(self._movie_ids[position: end])
+        return page
+
+    def clone(self) -> 'SortOrder':
+        order = SortOrder()
+        order._keys = list(self._keys)
+        order._movie_ids = list(self._movie_ids)
+        return order
+
+
+def numeric_attribute(movie: Movie, name: str) -> Optional[float]:
+    value = getattr(movie, name)
+    # A runtime of 0 is Movie's "not set" default.
+    if name == 'runtime_minutes' and value == 0:
+        return None
+    return value
@@ -0,0 +1,553 @@
+import sqlite3
+import threading
+from typing import List, Generator, Iterable, Tuple, Optional, Dict
+
+from movie.adapters.bk_tree import closest_name
+from movie.adapters.costar_graph import shortest_path
+from movie.adapters.prefix_index import END
+from movie.adapters.repository import AbstractRepository, RepositoryException, SORT_ORDERS, NUMERIC_COLUMNS, \
+    title_year_key, username_key
+from movie.adapters.text_index import tokenize
+from movie.adapters.trigram_index import suggest_names
+from movie.domainmodel.actor import Actor
+from movie.domainmodel.director import Director
+from movie.domainmodel.genre import Genre
+from movie.domainmodel.movie import Movie, Review, MIN_REVIEW_RATING, MAX_REVIEW_RATING
+from movie.domainmodel.user import User
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS actors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS genres (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+-- number is the movie's rowid under an explicit name, so VACUUM keeps it and the full-text index can refer to it.
+CREATE TABLE IF NOT EXISTS movies (
+    number INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    year INTEGER,
+    description TEXT,
+    runtime_minutes INTEGER NOT NULL DEFAULT 0,
+    rating REAL,
+    votes INTEGER,
+    revenue_millions REAL,
+    metascore INTEGER,
+    director_id INTEGER REFERENCES directors (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS movies_title_key_year ON movies (title_key, year);
+CREATE INDEX IF NOT EXISTS movies_title_year ON movies (title, year);
+CREATE INDEX IF NOT EXISTS movies_director_id ON movies (director_id);
+CREATE INDEX IF NOT EXISTS movies_year ON movies (year);
+CREATE INDEX IF NOT EXISTS movies_runtime_minutes ON movies (runtime_minutes);
+CREATE INDEX IF NOT EXISTS movies_rating ON movies (rating);
+CREATE INDEX IF NOT EXISTS movies_votes ON movies (votes);
+CREATE INDEX IF NOT EXISTS movies_revenue_millions ON movies (revenue_millions);
+CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5 (title, description, content = 'movies',
+                                                        content_rowid = 'number');
+CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+    INSERT INTO movies_fts (rowid, title, description) VALUES (new.number, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+    INSERT INTO movies_fts (movies_fts, rowid, title, description) VALUES ('delete', old.number, old.title,
+                                                                           old.description);
+END;
+CREATE TABLE IF NOT EXISTS movie_actors (
+    movie_id TEXT NOT NULL REFERENCES movies (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    actor_id INTEGER NOT NULL REFERENCES actors (id),
+    PRIMARY KEY (movie_id, position)
+);
+CREATE INDEX IF NOT EXISTS movie_actors_actor_id ON movie_actors (actor_id);
+CREATE TABLE IF NOT EXISTS movie_genres (
+    movie_id TEXT NOT NULL REFERENCES movies (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    genre_id INTEGER NOT NULL REFERENCES genres (id),
+    PRIMARY KEY (movie_id, position)
+);
+CREATE INDEX IF NOT EXISTS movie_genres_genre_id ON movie_genres (genre_id);
+CREATE TABLE IF NOT EXISTS users (
+    username_key TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    id TEXT PRIMARY KEY,
+    movie_id TEXT NOT NULL REFERENCES movies (id) ON DELETE CASCADE,
+    username TEXT NOT NULL,
+    review_text TEXT,
+    rating INTEGER,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reviews_movie_id ON reviews (movie_id);
+"""
+
+MOVIE_COLUMNS = """movies.id, movies.title, movies.year, movies.description, movies.runtime_minutes,
+                   movies.rating, movies.votes, movies.revenue_millions, movies.metascore, directors.name"""
+MOVIE_FROM = "movies LEFT JOIN directors ON directors.id = movies.director_id"
+MOVIE_ORDER = "ORDER BY movies.title, movies.year"
+ACTOR_WHERE = """movies.id IN (SELECT movie_id FROM movie_actors JOIN actors ON actors.id = movie_actors.actor_id
+                 WHERE actors.name = ?)"""
+DIRECTOR_WHERE = "directors.name = ?"
+GENRE_WHERE = """movies.id IN (SELECT movie_id FROM movie_genres JOIN genres ON genres.id = movie_genres.genre_id
+                 WHERE genres.name = ?)"""
+INDEX_WHERE = {'actor': ACTOR_WHERE, 'director': DIRECTOR_WHERE, 'genre': GENRE_WHERE}
+
+# Bound parameters per IN (...) query, kept below SQLITE_MAX_VARIABLE_NUMBER of older builds.
+BATCH_SIZE = 500
+
+
+class SqliteRepository(AbstractRepository):
+    """ Repository backed by one sqlite database file shared by every worker process.
+
+    Each thread gets its own connection from a thread-local pool, the database runs in WAL mode so readers
+    never block on the writer, and statements are written as constant SQL so sqlite3's statement cache
+    reuses the prepared statements.
+    """
+
+    def __init__(self, database_path: str):
+        self._database_path = database_path
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self._database_path, cached_statements=256)
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            connection.execute('PRAGMA foreign_keys = ON')
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @property
+    def movies(self) -> Generator[Movie, None, None]:
+        cursor = self._connection().execute(f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} {MOVIE_ORDER}")
+        return self._iter_movies(cursor)
+
+    @property
+    def users(self) -> Generator[User, None, None]:
+        cursor = self._connection().execute("SELECT username, password FROM users ORDER BY rowid")
+        return (User(username, password) for username, password in cursor)
+
+    @property
+    def genres(self) -> Generator[str, None, None]:
+        return self._iter_names("SELECT name FROM genres ORDER BY id")
+
+    @property
+    def actors(self) -> Generator[str, None, None]:
+        return self._iter_names("SELECT name FROM actors ORDER BY id")
+
+    @property
+    def directors(self) -> Generator[str, None, None]:
+        return self._iter_names("SELECT name FROM directors ORDER BY id")
+
+    def _iter_names(self, query: str) -> Generator[str, None, None]:
+        return (name for name, in self._connection().execute(query))
+
+    def add_movie(self, movie: Movie) -> bool:
+        return self.add_movies([movie]) == 1
+
+    def add_movies(self, movies: Iterable[Movie]) -> int:
+        connection = self._connection()
+        added = 0
+        with connection:
+            for movie in movies:
+                title_key, year = title_year_key(movie.title, movie.year)
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO movies (id, title, title_key, year, description, runtime_minutes,"
+                    " rating, votes, revenue_millions, metascore, director_id)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (movie.id, movie.title, title_key, year, movie.description, movie.runtime_minutes,
+                     movie.rating, movie.votes, movie.revenue_millions, movie.metascore,
+                     self._name_id(connection, 'directors', movie.director.director_full_name)
+                     if movie.director else None))
+                if cursor.rowcount == 0:
+                    continue
+                connection.executemany(
+                    "INSERT INTO movie_actors (movie_id, position, actor_id) VALUES (?, ?, ?)",
+                    [(movie.id, position, self._name_id(connection, 'actors', actor.actor_full_name))
+                     for position, actor in enumerate(movie.actors)])
+                connection.executemany(
+                    "INSERT INTO movie_genres (movie_id, position, genre_id) VALUES (?, ?, ?)",
+                    [(movie.id, position, self._name_id(connection, 'genres', genre.genre_name))
+                     for position, genre in enumerate(movie.genres)])
+                connection.executemany(
+                    "INSERT OR IGNORE INTO reviews (id, movie_id, username, review_text, rating, timestamp)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [self._review_row(review) for review in movie.reviews])
+                added += 1
+        return added
+
+    @staticmethod
+    def _name_id(connection: sqlite3.Connection, table: str, name: str) -> int:
+        # table is one of the fixed name tables, never user input.
+        connection.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+        return connection.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+
+    def get_movie(self, title: str, year: int) -> Movie:
+        return self._fetch_one_movie("movies.title_key = ? AND movies.year = ?", title_year_key(title, year))
+
+    def get_movie_by_id(self, movie_id: str) -> Movie:
+        return self._fetch_one_movie("movies.id = ?", (movie_id,))
+
+    def _fetch_one_movie(self, where: str, params: tuple) -> Movie:
+        rows = self._connection().execute(f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} WHERE {where}", params)
+        return next(self._iter_movies(rows), None)
+
+    def get_n_movies(self, n: int, offset: int = 0, sort_by: str = None, descending: bool = False) -> List[Movie]:
+        direction = ' DESC' if descending else ''
+        if sort_by is None:
+            order = MOVIE_ORDER
+        elif sort_by in SORT_ORDERS:
+            # sort_by is checked against SORT_ORDERS, never user input. A runtime of 0 means not set.
+            missing = "movies.runtime_minutes = 0" if sort_by == 'runtime_minutes' else f"movies.{sort_by} IS NULL"
+            order = f"ORDER BY {missing}, movies.{sort_by}{direction}, movies.title, movies.year"
+        else:
+            raise RepositoryException(f'Cannot sort movies by {sort_by!r}')
+        rows = self._connection().execute(
+            f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} {order} LIMIT ? OFFSET ?", (n, offset))
+        return list(self._iter_movies(rows))
+
+    def get_total_number_of_movies(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def get_first_movie(self) -> Movie:
+        return next(iter(self.get_n_movies(1, 0)), None)
+
+    def get_last_movie(self) -> Movie:
+        rows = self._connection().execute(
+            f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} ORDER BY movies.title DESC, movies.year DESC LIMIT 1")
+        return next(self._iter_movies(rows), None)
+
+    def get_movie_rank(self, title: str, year: int, inclusive: bool = False, index: str = None,
+                       lookup_key: str = None) -> int:
+        comparison = '<=' if inclusive else '<'
+        conditions = [f"(movies.title < ? OR (movies.title = ? AND movies.year {comparison} ?))"]
+        params = [title, title, year]
+        if index is not None:
+            conditions.append(INDEX_WHERE[index])
+            params.append(lookup_key)
+        return self._connection().execute(
+            f"SELECT COUNT(*) FROM {MOVIE_FROM} WHERE {' AND '.join(conditions)}", params).fetchone()[0]
+
+    def get_movies_by_year_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        return self._get_movies_from_range('year', low, high)
+
+    def get_movies_by_runtime_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        return self._get_movies_from_range('runtime_minutes', low, high)
+
+    def get_movies_by_rating_range(self, low: float = None, high: float = None) -> Generator[Movie, None, None]:
+        return self._get_movies_from_range('rating', low, high)
+
+    def _get_movies_from_range(self, column: str, low: float, high: float) -> Generator[Movie, None, None]:
+        where, params = self._range_where(column, low, high)
+        return self._iter_movies(self._connection().execute(
+            f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} WHERE {where}"
+            f" ORDER BY movies.{column}, movies.title, movies.year", params))
+
+    def get_movies_by_year_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                      n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_range('year', low, high, offset, n)
+
+    def get_movies_by_runtime_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                         n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_range('runtime_minutes', low, high, offset, n)
+
+    def get_movies_by_rating_range_page(self, low: Optional[float], high: Optional[float], offset: int,
+                                        n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page_from_range('rating', low, high, offset, n)
+
+    def _get_movies_page_from_range(self, column: str, low: float, high: float, offset: int,
+                                    n: int) -> Tuple[List[Movie], int]:
+        where, params = self._range_where(column, low, high)
+        connection = self._connection()
+        total = connection.execute(f"SELECT COUNT(*) FROM movies WHERE {where}", params).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} WHERE {where}"
+            f" ORDER BY movies.{column}, movies.title, movies.year LIMIT ? OFFSET ?", params + [n, offset])
+        return list(self._iter_movies(rows)), total
+
+    def get_movie_statistics(self, column: str, ranges: Dict[str, Tuple[Optional[float], Optional[float]]] = None
+                             ) -> Dict[str, Optional[float]]:
+        ranges = dict(ranges or {})
+        for name in [column, *ranges]:
+            if name not in NUMERIC_COLUMNS:
+                raise RepositoryException(f'Cannot aggregate movies by {name!r}')
+        ranges.setdefault(column, (None, None))
+        conditions, params = [], []
+        for name, (low, high) in ranges.items():
+            where, range_params = self._range_where(name, low, high)
+            conditions.append(where)
+            params.extend(range_params)
+        count, total, mean, minimum, maximum = self._connection().execute(
+            f"SELECT COUNT(*), TOTAL(movies.{column}), AVG(movies.{column}), MIN(movies.{column}),"
+            f" MAX(movies.{column}) FROM movies WHERE {' AND '.join(conditions)}", params).fetchone()
+        return {
+            'count': count,
+            'sum': total,
+            'mean': mean,
+            'min': float(minimum) if minimum is not None else None,
+            'max': float(maximum) if maximum is not None else None
+        }
+
+    @staticmethod
+    def _range_where(column: str, low: float, high: float) -> Tuple[str, list]:
+        # column is one of the indexed movie columns, never user input. A runtime of 0 means not set.
+        conditions = [f"movies.{column} > 0" if column == 'runtime_minutes' else f"movies.{column} IS NOT NULL"]
+        params = []
+        if low is not None:
+            conditions.append(f"movies.{column} >= ?")
+            params.append(low)
+        if high is not None:
+            conditions.append(f"movies.{column} <= ?")
+            params.append(high)
+        return ' AND '.join(conditions), params
+
+    def get_movies_by_actor(self, actor: str) -> Generator[Movie, None, None]:
+        return self._get_movies_where(ACTOR_WHERE, actor)
+
+    def get_movies_by_director(self, director: str) -> Generator[Movie, None, None]:
+        return self._get_movies_where(DIRECTOR_WHERE, director)
+
+    def get_movies_by_genre(self, genre: str) -> Generator[Movie, None, None]:
+        return self._get_movies_where(GENRE_WHERE, genre)
+
+    def _get_movies_where(self, where: str, lookup_key: str) -> Generator[Movie, None, None]:
+        return self._iter_movies(self._connection().execute(
+            f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} WHERE {where} {MOVIE_ORDER}", (lookup_key,)))
+
+    def get_movies_by_actor_page(self, actor: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page(ACTOR_WHERE, actor, offset, n)
+
+    def get_movies_by_director_page(self, director: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page(DIRECTOR_WHERE, director, offset, n)
+
+    def get_movies_by_genre_page(self, genre: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self._get_movies_page(GENRE_WHERE, genre, offset, n)
+
+    def _get_movies_page(self, where: str, lookup_key: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        connection = self._connection()
+        total = connection.execute(f"SELECT COUNT(*) FROM {MOVIE_FROM} WHERE {where}", (lookup_key,)).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} WHERE {where} {MOVIE_ORDER} LIMIT ? OFFSET ?",
+            (lookup_key, n, offset))
+        return list(self._iter_movies(rows)), total
+
+    def get_movies_by_text_page(self, text: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        # Quote every word so that user input is never read as FTS5 query syntax. Title words weigh double.
+        match = ' OR '.join('"{}"'.format(term.replace('"', '""')) for term in dict.fromkeys(tokenize(text)))
+        if not match:
+            return [], 0
+        connection = self._connection()
+        total = connection.execute("SELECT COUNT(*) FROM movies_fts WHERE movies_fts MATCH ?", (match,)).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT {MOVIE_COLUMNS} FROM movies_fts JOIN movies ON movies.number = movies_fts.rowid"
+            " LEFT JOIN directors ON directors.id = movies.director_id WHERE movies_fts MATCH ?"
+            " ORDER BY bm25(movies_fts, 2.0, 1.0), movies.number LIMIT ? OFFSET ?", (match, n, offset))
+        return list(self._iter_movies(rows)), total
+
+    def get_closest_actor(self, name: str, max_distance: int = None) -> Optional[str]:
+        return closest_name(name, self.actors, max_distance)
+
+    def get_closest_director(self, name: str, max_distance: int = None) -> Optional[str]:
+        return closest_name(name, self.directors, max_distance)
+
+    def get_closest_genre(self, name: str, max_distance: int = None) -> Optional[str]:
+        return closest_name(name, self.genres, max_distance)
+
+    def suggest_actors(self, term: str, k: int = 5) -> List[str]:
+        return suggest_names(term, self.actors, k)
+
+    def suggest_directors(self, term: str, k: int = 5) -> List[str]:
+        return suggest_names(term, self.directors, k)
+
+    def suggest_genres(self, term: str, k: int = 5) -> List[str]:
+        return suggest_names(term, self.genres, k)
+
+    def complete_titles(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        # title_key is casefolded, so the titles with the prefix are a range of the title_key index.
+        prefix = prefix.casefold()
+        return self._connection().execute(
+            "SELECT title, COUNT(*) AS movie_count FROM movies WHERE title_key >= ? AND title_key < ?"
+            " GROUP BY title ORDER BY movie_count DESC, MIN(title_key), title LIMIT ?",
+            (prefix, prefix + END, n)).fetchall()
+
+    def complete_actors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self._complete_names(
+            "SELECT actors.name, COUNT(DISTINCT movie_actors.movie_id) AS movie_count FROM actors"
+            " JOIN movie_actors ON movie_actors.actor_id = actors.id WHERE actors.name LIKE ? ESCAPE '\\'"
+            " GROUP BY actors.id ORDER BY movie_count DESC, actors.name COLLATE NOCASE, actors.name"
+            " LIMIT ?", prefix, n)
+
+    def complete_directors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self._complete_names(
+            "SELECT directors.name, COUNT(*) AS movie_count FROM directors"
+            " JOIN movies ON movies.director_id = directors.id WHERE directors.name LIKE ? ESCAPE '\\'"
+            " GROUP BY directors.id ORDER BY movie_count DESC, directors.name COLLATE NOCASE, directors.name"
+            " LIMIT ?", prefix, n)
+
+    def complete_genres(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self._complete_names(
+            "SELECT genres.name, COUNT(DISTINCT movie_genres.movie_id) AS movie_count FROM genres"
+            " JOIN movie_genres ON movie_genres.genre_id = genres.id WHERE genres.name LIKE ? ESCAPE '\\'"
+            " GROUP BY genres.id ORDER BY movie_count DESC, genres.name COLLATE NOCASE, genres.name"
+            " LIMIT ?", prefix, n)
+
+    def _complete_names(self, query: str, prefix: str, n: int) -> List[Tuple[str, int]]:
+        # LIKE ignores case for ASCII letters only, the memory repository casefolds.
+        pattern = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return self._connection().execute(query, (pattern, n)).fetchall()
+
+    def get_costars(self, actor: str) -> List[str]:
+        return [name for name, in self._connection().execute(
+            "SELECT DISTINCT costars.name FROM actors JOIN movie_actors ON movie_actors.actor_id = actors.id"
+            " JOIN movie_actors AS costar_movies ON costar_movies.movie_id = movie_actors.movie_id"
+            " JOIN actors AS costars ON costars.id = costar_movies.actor_id"
+            " WHERE actors.name = ? AND costars.id != actors.id ORDER BY costars.name", (actor,))]
+
+    def have_worked_together(self, actor: str, other_actor: str) -> bool:
+        return actor != other_actor and self._connection().execute(
+            f"SELECT EXISTS (SELECT 1 FROM movies WHERE {ACTOR_WHERE} AND {ACTOR_WHERE})",
+            (actor, other_actor)).fetchone()[0] == 1
+
+    def get_shared_movies(self, actor: str, other_actor: str) -> List[Movie]:
+        if actor == other_actor:
+            return []
+        return list(self._iter_movies(self._connection().execute(
+            f"SELECT {MOVIE_COLUMNS} FROM {MOVIE_FROM} WHERE {ACTOR_WHERE} AND {ACTOR_WHERE} {MOVIE_ORDER}",
+            (actor, other_actor))))
+
+    def get_actor_path(self, actor: str, other_actor: str) -> List[str]:
+        connection = self._connection()
+        ids = dict(connection.execute("SELECT name, id FROM actors WHERE name IN (?, ?)", (actor, other_actor)))
+        if actor not in ids or other_actor not in ids:
+            return []
+        path = shortest_path(ids[actor], ids[other_actor], self._costar_ids)
+        names = dict(connection.execute(f"SELECT id, name FROM actors WHERE id IN ({', '.join('?' * len(path))})",
+                                        path))
+        return [names[actor_id] for actor_id in path]
+
+    def _costar_ids(self, actor_ids: List[int]) -> Generator[Tuple[int, List[int]], None, None]:
+        # One query per batch of a search level, instead of one per actor.
+        connection = self._connection()
+        for start in range(0, len(actor_ids), BATCH_SIZE):
+            batch = actor_ids[start: start + BATCH_SIZE]
+            costars = {actor_id: [] for actor_id in batch}
+            for actor_id, costar_id in connection.execute(
+                    "SELECT DISTINCT movie_actors.actor_id, costar_movies.actor_id FROM movie_actors"
+                    " JOIN movie_actors AS costar_movies ON costar_movies.movie_id = movie_actors.movie_id"
+                    f" WHERE movie_actors.actor_id IN ({', '.join('?' * len(batch))})"
+                    " AND costar_movies.actor_id != movie_actors.actor_id", batch):
+                costars[actor_id].append(costar_id)
+            yield from costars.items()
+
+    def delete_movie(self, movie_to_delete: Movie) -> bool:
+        return self.delete_movies([movie_to_delete]) == 1
+
+    def delete_movies(self, movies_to_delete: Iterable[Movie]) -> int:
+        connection = self._connection()
+        with connection:
+            deleted = sum(connection.execute("DELETE FROM movies WHERE title_key = ? AND year = ?",
+                                             title_year_key(movie.title, movie.year)).rowcount
+                          for movie in movies_to_delete)
+            if deleted:
+                connection.execute("DELETE FROM actors WHERE id NOT IN (SELECT actor_id FROM movie_actors)")
+                connection.execute("DELETE FROM genres WHERE id NOT IN (SELECT genre_id FROM movie_genres)")
+                connection.execute("DELETE FROM directors WHERE id NOT IN "
+                                   "(SELECT director_id FROM movies WHERE director_id IS NOT NULL)")
+        return deleted
+
+    def add_review(self, review: Review) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO reviews (id, movie_id, username, review_text, rating, timestamp)"
+                " SELECT ?, ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM movies WHERE id = ?)",
+                self._review_row(review) + (review.movie.id,))
+        review.movie.add_review(review)
+
+    def add_review_rows(self, rows: Iterable[Tuple[str, str, str, int, float]]) -> int:
+        # Rows go straight to the table in one transaction, building Movie objects would load every earlier review.
+        movie_ids = {movie_id for movie_id, in self._connection().execute("SELECT id FROM movies")}
+        review_rows = [(movie_id + username + str(timestamp), movie_id, username, review_text,
+                        rating if MIN_REVIEW_RATING <= rating <= MAX_REVIEW_RATING else None, timestamp)
+                       for movie_id, username, review_text, rating, timestamp in rows if movie_id in movie_ids]
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO reviews (id, movie_id, username, review_text, rating, timestamp)"
+                " VALUES (?, ?, ?, ?, ?, ?)", review_rows)
+        return len(review_rows)
+
+    def remove_review(self, movie_id: str, review_id: str) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM reviews WHERE id = ? AND movie_id = ?", (review_id, movie_id))
+
+    @staticmethod
+    def _review_row(review: Review) -> tuple:
+        return review.id, review.movie.id, review.username, review.review_text, review.rating, review.timestamp
+
+    def add_user(self, user: User) -> None:
+        with self._connection() as connection:
+            connection.execute("INSERT OR IGNORE INTO users (username_key, username, password) VALUES (?, ?, ?)",
+                               (username_key(user.username), user.username, user.password))
+
+    def get_user(self, username: str) -> User:
+        row = self._connection().execute("SELECT username, password FROM users WHERE username_key = ?",
+                                         (username_key(username),)).fetchone()
+        return User(*row) if row else None
+
+    def _iter_movies(self, rows: sqlite3.Cursor) -> Generator[Movie, None, None]:
+        while True:
+            batch = rows.fetchmany(BATCH_SIZE)
+            if not batch:
+                return
+            yield from self._build_movies(batch)
+
+    def _build_movies(self, rows: List[tuple]) -> List[Movie]:
+        movies = dict()
+        for movie_id, title, year, description, runtime_minutes, rating, votes, revenue_millions, metascore, \
+                director_name in rows:
+            movie = Movie(title, year)
+            movie.description = description
+            if runtime_minutes:
+                movie.runtime_minutes = runtime_minutes
+            movie.rating = rating
+            movie.votes = votes
+            movie.revenue_millions = revenue_millions
+            movie.metascore = metascore
+            if director_name is not None:
+                movie.director = Director(director_name)
+            movies[movie_id] = movie
+
+        connection = self._connection()
+        placeholders = ', '.join('?' * len(movies))
+        movie_ids = tuple(movies)
+        for movie_id, name in connection.execute(
+                "SELECT movie_id, name FROM movie_actors JOIN actors ON actors.id = movie_actors.actor_id"
+                f" WHERE movie_id IN ({placeholders}) ORDER BY movie_id, position", movie_ids):
+            movies[movie_id].add_actor(Actor(name))
+        for movie_id, name in connection.execute(
+                "SELECT movie_id, name FROM movie_genres JOIN genres ON genres.id = movie_genres.genre_id"
+                f" WHERE movie_id IN ({placeholders}) ORDER BY movie_id, position", movie_ids):
+            movies[movie_id].add_genre(Genre(name))
+        for movie_id, username, review_text, rating, timestamp in connection.execute(
+                "SELECT movie_id, username, review_text, rating, timestamp FROM reviews"
+                f" WHERE movie_id IN ({placeholders}) ORDER BY rowid", movie_ids):
+            movie = movies[movie_id]
+            movie.add_review(Review(movie, username, review_text, rating or 0, timestamp))
+        return list(movies.values())
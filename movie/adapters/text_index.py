@@ -0,0 +1,167 @@
+import math
+import re
+from array import array
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Title words count this many times, so a keyword in the title outweighs the same keyword in a description.
+TITLE_WEIGHT = 2
+# The usual BM25 defaults: term frequency saturation and document length normalisation.
+K1 = 1.2
+B = 0.75
+# Max term frequency stored per posting, the limit of an unsigned short.
+MAX_TERM_FREQUENCY = 0xFFFF
+
+
+class TextIndex:
+    """ Inverted index over movie titles and descriptions ranked with Okapi BM25.
+
+    Every added movie gets the next document number, so each posting list only grows at its end and is stored as
+    an array of gaps between document numbers next to an array of term frequencies. Removing a movie leaves its
+    postings in place and marks the document as deleted, and once deleted documents outnumber live ones the
+    postings are rewritten without them.
+    """
+
+    def __init__(self):
+        self._movie_ids = list()
+        self._documents = dict()
+        self._lengths = array('I')
+        self._postings = dict()
+        self._document_frequencies = Counter()
+        self._total_length = 0
+        self._deleted = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, movie_id: str, title: str, description: str) -> None:
+        if movie_id in self._documents:
+            return
+        document = len(self._movie_ids)
+        frequencies = _term_frequencies(title, description)
+        self._movie_ids.append(movie_id)
+        self._documents[movie_id] = document
+        length = sum(frequencies.values())
+        self._lengths.append(length)
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.append(document, frequency)
+            self._document_frequencies[term] += 1
+
+    def remove(self, movie_id: str, title: str, description: str) -> bool:
+        document = self._documents.pop(movie_id, None)
+        if document is None:
+            return False
+        self._movie_ids[document] = None
+        self._total_length -= self._lengths[document]
+        for term in _term_frequencies(title, description):
+            self._document_frequencies[term] -= 1
+            if self._document_frequencies[term] <= 0:
+                del self._document_frequencies[term]
+        self._deleted += 1
+        if self._deleted > len(self._documents):
+            self._compact()
+        return True
+
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """ (movie id, score) of the movies containing any query term, best first, ties in the order added. """
+        documents = len(self._documents)
+        if not documents:
+            return []
+        average_length = self._total_length / documents or 1
+        scores = dict()
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            frequency = self._document_frequencies.get(term)
+            if postings is None or not frequency:
+                continue
+            idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+            for document, term_frequency in postings:
+                if self._movie_ids[document] is None:
+                    continue
+                norm = K1 * (1 - B + B * self._lengths[document] / average_length)
+                score = idf * term_frequency * (K1 + 1) / (term_frequency + norm)
+                scores[document] = scores.get(document, 0.0) + score
+        ranked = sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))
+        return [(self._movie_ids[document], score) for document, score in ranked]
+
+    def _compact(self) -> None:
+        # Renumber the live documents in their current order and rewrite every posting list without the others.
+        renumbered = dict()
+        movie_ids = list()
+        lengths = array('I')
+        for document, movie_id in enumerate(self._movie_ids):
+            if movie_id is not None:
+                renumbered[document] = len(movie_ids)
+                movie_ids.append(movie_id)
+                lengths.append(self._lengths[document])
+        postings = dict()
+        for term, old_postings in self._postings.items():
+            new_postings = _Postings()
+            for document, frequency in old_postings:
+                if document in renumbered:
+                    new_postings.append(renumbered[document], frequency)
+            if len(new_postings):
+                postings[term] = new_postings
+        self._movie_ids = movie_ids
+        self._documents = {movie_id: document for document, movie_id in enumerate(movie_ids)}
+        self._lengths = lengths
+        self._postings = postings
+        self._deleted = 0
+
+    def clone(self) -> 'TextIndex':
+        index = TextIndex()
+        index._movie_ids = list(self._movie_ids)
+        index._documents = dict(self._documents)
+        index._lengths = array('I', self._lengths)
+        index._postings = {term: postings.clone() for term, postings in self._postings.items()}
+        index._document_frequencies = Counter(self._document_frequencies)
+        index._total_length = self._total_length
+        index._deleted = self._deleted
+        return index
+
+
+class _Postings:
+    """ Document numbers stored as gaps from the previous one, with the term frequency of each. """
+
+    __slots__ = ('gaps', 'frequencies', 'last')
+
+    def __init__(self):
+        self.gaps = array('I')
+        self.frequencies = array('H')
+        self.last = 0
+
+    def __len__(self) -> int:
+        return len(self.gaps)
+
+    def __iter__(self):
+        return zip(accumulate(self.gaps), self.frequencies)
+
+    def append(self, document: int, frequency: int) -> None:
+        self.gaps.append(document - self.last)
+        self.frequencies.append(min(frequency, MAX_TERM_FREQUENCY))
+        self.last = document
+
+    def clone(self) -> '_Postings':
+        postings = _Postings()
+        postings.gaps = array('I', self.gaps)
+        postings.frequencies = array('H', self.frequencies)
+        postings.last = self.last
+        return postings
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.casefold()) if text else []
+
+
+def _term_frequencies(title: str, description: str) -> Dict[str, int]:
+    frequencies = Counter(tokenize(description))
+    for term in tokenize(title):
+        frequencies[term] += TITLE_WEIGHT
+    return frequencies
@@ -0,0 +1,94 @@
+import heapq
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Callable, Iterable, List, Set
+
+import editdistance
+
+# Candidates kept from the trigram overlap count per suggestion requested, before re-ranking by edit distance.
+CANDIDATES_PER_SUGGESTION = 10
+MIN_CANDIDATES = 50
+# Posting entries counted per suggestion. Trigrams are counted rarest first, so the budget only drops the most
+# common ones, e.g. the leading '  j' of every name starting with J, which say little about the match.
+POSTINGS_BUDGET = 4000
+
+
+class TrigramIndex:
+    """ Inverted index from character trigrams to the names containing them.
+
+    Names are numbered in the order they are added and each trigram keeps an array of those numbers, so a
+    suggestion counts trigram overlap over a handful of posting arrays instead of comparing every name. The
+    best overlapping candidates are then re-ranked by edit distance. Like BKTree the index only grows and
+    callers filter out names that have left their index with is_live.
+    """
+
+    def __init__(self):
+        self._names = list()
+        self._keys = dict()
+        self._postings = dict()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str) -> None:
+        if name in self._keys:
+            return
+        name_id = len(self._names)
+        self._names.append(name)
+        self._keys[name] = name_id
+        for trigram in trigrams(name):
+            postings = self._postings.get(trigram)
+            if postings is None:
+                postings = self._postings[trigram] = array('I')
+            postings.append(name_id)
+
+    def suggest(self, term: str, k: int = 5, is_live: Callable[[str], bool] = lambda name: True) -> List[str]:
+        """ Up to k live names sharing a trigram with term, nearest by case-insensitive edit distance first. """
+        postings = sorted((self._postings[trigram] for trigram in trigrams(term) if trigram in self._postings),
+                          key=len)
+        counted = []
+        remaining = POSTINGS_BUDGET
+        for trigram_postings in postings:
+            if counted and len(trigram_postings) > remaining:
+                break
+            counted.append(trigram_postings)
+            remaining -= len(trigram_postings)
+        overlaps = Counter(chain.from_iterable(counted))
+        if not overlaps:
+            return []
+
+        candidate_count = max(MIN_CANDIDATES, k * CANDIDATES_PER_SUGGESTION)
+        candidates = overlaps.most_common(candidate_count)
+        key = term.lower()
+        ranked = []
+        for name_id, overlap in candidates:
+            name = self._names[name_id]
+            if is_live(name):
+                ranked.append((editdistance.eval(key, name.lower()), -overlap, name_id, name))
+        return [name for *_, name in heapq.nsmallest(k, ranked)]
+
+    def clone(self) -> 'TrigramIndex':
+        index = TrigramIndex()
+        index._names = list(self._names)
+        index._keys = dict(self._keys)
+        index._postings = {trigram: array('I', postings) for trigram, postings in self._postings.items()}
+        return index
+
+
+def trigrams(name: str) -> Set[str]:
+    """ The distinct lowercased trigrams of name, padded so that short names and word starts get trigrams too. """
+    padded = '  ' + ' '.join(name.lower().split()) + ' '
+    return {padded[position: position + 3] for position in range(len(padded) - 2)}
+
+
+def suggest_names(term: str, names: Iterable[str], k: int = 5) -> List[str]:
+    """ Linear-scan counterpart of TrigramIndex.suggest, for name sources without an index. """
+    term_trigrams = trigrams(term)
+    key = term.lower()
+    ranked = []
+    for name_id, name in enumerate(names):
+        overlap = len(term_trigrams & trigrams(name))
+        if overlap:
+            ranked.append((editdistance.eval(key, name.lower()), -overlap, name_id, name))
+    return [name for *_, name in heapq.nsmallest(k, ranked)]
@@ -0,0 +1,221 @@
+import threading
+from contextlib import contextmanager
+from typing import List, Generator, Iterable, Iterator, Tuple, Optional, Dict
+
+from movie.adapters.memory_repository import MemoryRepository
+from movie.adapters.repository import AbstractRepository
+from movie.domainmodel.movie import Movie, Review
+from movie.domainmodel.user import User
+
+
+class VersionedRepository(AbstractRepository):
+    """ Copy-on-write wrapper around a MemoryRepository.
+
+    A published generation is never mutated. Writers serialize on a lock, apply their change to a generation
+    derived from the current one and swap it in with a single reference assignment, so readers need no lock. A
+    derived generation shares every index it does not change, so a write only copies what it touches. A reader
+    that pins a generation sees the same movies, indexes and reviews until it unpins, even across writes.
+    """
+
+    def __init__(self, repo: MemoryRepository):
+        self._current = repo
+        self._version = 0
+        self._write_lock = threading.Lock()
+        self._pinned = threading.local()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def generation(self) -> MemoryRepository:
+        return getattr(self._pinned, 'generation', None) or self._current
+
+    def pin(self) -> MemoryRepository:
+        self._pinned.generation = self._current
+        return self._pinned.generation
+
+    def unpin(self) -> None:
+        self._pinned.generation = None
+
+    @contextmanager
+    def pinned(self) -> Iterator[MemoryRepository]:
+        previous = getattr(self._pinned, 'generation', None)
+        try:
+            yield self.pin()
+        finally:
+            self._pinned.generation = previous
+
+    @contextmanager
+    def write(self) -> Iterator[MemoryRepository]:
+        """ Apply several changes to one new generation, published when the block exits without error. """
+        with self._write_lock:
+            generation = self._current.derive()
+            yield generation
+            self._current = generation
+            self._version += 1
+
+    @property
+    def movies(self) -> Generator[Movie, None, None]:
+        return self.generation.movies
+
+    @property
+    def users(self) -> Generator[User, None, None]:
+        return self.generation.users
+
+    @property
+    def genres(self) -> Generator[str, None, None]:
+        return self.generation.genres
+
+    @property
+    def actors(self) -> Generator[str, None, None]:
+        return self.generation.actors
+
+    @property
+    def directors(self) -> Generator[str, None, None]:
+        return self.generation.directors
+
+    def add_movie(self, movie: Movie) -> bool:
+        with self.write() as generation:
+            return generation.add_movie(movie)
+
+    def add_movies(self, movies: Iterable[Movie]) -> int:
+        with self.write() as generation:
+            return generation.add_movies(movies)
+
+    def get_movie(self, title: str, year: int) -> Movie:
+        return self.generation.get_movie(title, year)
+
+    def get_movie_by_id(self, movie_id: str) -> Movie:
+        return self.generation.get_movie_by_id(movie_id)
+
+    def get_n_movies(self, n: int, offset: int = 0, sort_by: str = None, descending: bool = False) -> List[Movie]:
+        return self.generation.get_n_movies(n, offset, sort_by, descending)
+
+    def get_total_number_of_movies(self) -> int:
+        return self.generation.get_total_number_of_movies()
+
+    def get_first_movie(self) -> Movie:
+        return self.generation.get_first_movie()
+
+    def get_last_movie(self) -> Movie:
+        return self.generation.get_last_movie()
+
+    def get_movie_rank(self, title: str, year: int, inclusive: bool = False, index: str = None,
+                       lookup_key: str = None) -> int:
+        return self.generation.get_movie_rank(title, year, inclusive, index, lookup_key)
+
+    def get_movies_by_year_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        return self.generation.get_movies_by_year_range(low, high)
+
+    def get_movies_by_runtime_range(self, low: int = None, high: int = None) -> Generator[Movie, None, None]:
+        return self.generation.get_movies_by_runtime_range(low, high)
+
+    def get_movies_by_rating_range(self, low: float = None, high: float = None) -> Generator[Movie, None, None]:
+        return self.generation.get_movies_by_rating_range(low, high)
+
+    def get_movies_by_year_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                      n: int) -> Tuple[List[Movie], int]:
+        return self.generation.get_movies_by_year_range_page(low, high, offset, n)
+
+    def get_movies_by_runtime_range_page(self, low: Optional[int], high: Optional[int], offset: int,
+                                         n: int) -> Tuple[List[Movie], int]:
+        return self.generation.get_movies_by_runtime_range_page(low, high, offset, n)
+
+    def get_movies_by_rating_range_page(self, low: Optional[float], high: Optional[float], offset: int,
+                                        n: int) -> Tuple[List[Movie], int]:
+        return self.generation.get_movies_by_rating_range_page(low, high, offset, n)
+
+    def get_movie_statistics(self, column: str, ranges: Dict[str, Tuple[Optional[float], Optional[float]]] = None
+                             ) -> Dict[str, Optional[float]]:
+        return self.generation.get_movie_statistics(column, ranges)
+
+    def get_movies_by_actor(self, actor: str) -> Generator[Movie, None, None]:
+        return self.generation.get_movies_by_actor(actor)
+
+    def get_movies_by_director(self, director: str) -> Generator[Movie, None, None]:
+        return self.generation.get_movies_by_director(director)
+
+    def get_movies_by_genre(self, genre: str) -> Generator[Movie, None, None]:
+        return self.generation.get_movies_by_genre(genre)
+
+    def get_movies_by_actor_page(self, actor: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self.generation.get_movies_by_actor_page(actor, offset, n)
+
+    def get_movies_by_director_page(self, director: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self.generation.get_movies_by_director_page(director, offset, n)
+
+    def get_movies_by_genre_page(self, genre: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self.generation.get_movies_by_genre_page(genre, offset, n)
+
+    def get_movies_by_text_page(self, text: str, offset: int, n: int) -> Tuple[List[Movie], int]:
+        return self.generation.get_movies_by_text_page(text, offset, n)
+
+    def get_closest_actor(self, name: str, max_distance: int = None) -> Optional[str]:
+        return self.generation.get_closest_actor(name, max_distance)
+
+    def get_closest_director(self, name: str, max_distance: int = None) -> Optional[str]:
+        return self.generation.get_closest_director(name, max_distance)
+
+    def get_closest_genre(self, name: str, max_distance: int = None) -> Optional[str]:
+        return self.generation.get_closest_genre(name, max_distance)
+
+    def suggest_actors(self, term: str, k: int = 5) -> List[str]:
+        return self.generation.suggest_actors(term, k)
+
+    def suggest_directors(self, term: str, k: int = 5) -> List[str]:
+        return self.generation.suggest_directors(term, k)
+
+    def suggest_genres(self, term: str, k: int = 5) -> List[str]:
+        return self.generation.suggest_genres(term, k)
+
+    def complete_titles(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self.generation.complete_titles(prefix, n)
+
+    def complete_actors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self.generation.complete_actors(prefix, n)
+
+    def complete_directors(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self.generation.complete_directors(prefix, n)
+
+    def complete_genres(self, prefix: str, n: int = 10) -> List[Tuple[str, int]]:
+        return self.generation.complete_genres(prefix, n)
+
+    def get_costars(self, actor: str) -> List[str]:
+        return self.generation.get_costars(actor)
+
+    def have_worked_together(self, actor: str, other_actor: str) -> bool:
+        return self.generation.have_worked_together(actor, other_actor)
+
+    def get_shared_movies(self, actor: str, other_actor: str) -> List[Movie]:
+        return self.generation.get_shared_movies(actor, other_actor)
+
+    def get_actor_path(self, actor: str, other_actor: str) -> List[str]:
+        return self.generation.get_actor_path(actor, other_actor)
+
+    def delete_movie(self, movie_to_delete: Movie) -> bool:
+        with self.write() as generation:
+            return generation.delete_movie(movie_to_delete)
+
+    def delete_movies(self, movies_to_delete: Iterable[Movie]) -> int:
+        with self.write() as generation:
+            return generation.delete_movies(movies_to_delete)
+
+    def add_review(self, review: Review) -> None:
+        with self.write() as generation:
+            generation.add_review(review)
+
+    def add_review_rows(self, rows: Iterable[Tuple[str, str, str, int, float]]) -> int:
+        with self.write() as generation:
+            return generation.add_review_rows(rows)
+
+    def remove_review(self, movie_id: str, review_id: str) -> None:
+        with self.write() as generation:
+            generation.remove_review(movie_id, review_id)
+
+    def add_user(self, user: User) -> None:
+        with self.write() as generation:
+            generation.add_user(user)
+
+    def get_user(self, username: str) -> User:
+        return self.generation.get_user(username)
@@ -26,14 +26,13 @@ def add_user(username: str, password: str, repo: AbstractRepository):
     new_user = User(username, password_hash)
     repo.add_user(new_user)
     if has_app_context():
-        _save_users_to_disk(current_app.config['USER_DATA_PATH'], repo)
+        _append_user_to_disk(current_app.config['USER_DATA_PATH'], new_user)
 
 
-def _save_users_to_disk(data_path: str, repo: AbstractRepository) -> None:
-    with open(data_path, 'w', newline='') as f:
+def _append_user_to_disk(data_path: str, user: User) -> None:
+    with open(data_path, 'a', newline='') as f:
         user_writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-        for user in repo.users:
-            user_writer.writerow([user.username, user.password])
+        user_writer.writerow([user.username, user.password])
 
 
 def get_user(username: str, repo: AbstractRepository) -> dict:
@@ -2,6 +2,8 @@ from movie.domainmodel.person import Person
 
 
 class Actor(Person):
+    __slots__ = ('__colleague_set',)
+
     def __init__(self, actor_full_name: str):
         super().__init__(actor_full_name)
         self.__colleague_set = set()
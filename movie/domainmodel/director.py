@@ -2,6 +2,8 @@ from movie.domainmodel.person import Person
 
 
 class Director(Person):
+    __slots__ = ()
+
     @property
     def director_full_name(self) -> str:
         return self._name
@@ -1,4 +1,5 @@
 class Genre:
+    __slots__ = ('__genre_name',)
 
     def __init__(self, genre_name: str):
         if genre_name == "" or type(genre_name) is not str:
@@ -1,5 +1,6 @@
+import math
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from movie.domainmodel.actor import Actor
 from movie.domainmodel.director import Director
@@ -7,6 +8,8 @@ from movie.domainmodel.genre import Genre
 
 
 class Review:
+    __slots__ = ('_movie', '_user', '_review_text', '_timestamp', '_rating', '_id', '_id_movie_id')
+
     def __init__(self, movie: 'Movie', username: str, review_text: str, rating: int, timestamp: float = None):
         self._movie = movie
         self._user = username
@@ -21,9 +24,17 @@ class Review:
         else:
             self._rating = None
 
+        self._id = None
+        self._id_movie_id = None
+
     @property
     def id(self) -> str:
-        return self.movie.id + self.username + str(self.timestamp)
+        # Cached, and rebuilt only if the movie's id changed since, which replaces the movie's cached id string.
+        movie_id = self.movie.id
+        if self._id is None or self._id_movie_id is not movie_id:
+            self._id = movie_id + self.username + str(self.timestamp)
+            self._id_movie_id = movie_id
+        return self._id
 
     @property
     def movie(self) -> 'Movie':
@@ -51,15 +62,93 @@ class Review:
         return movie_str + review_str
 
     def __eq__(self, other: 'Review') -> bool:
-        res = []
         if type(other) == Review:
-            for attr_k in self.__dict__.keys():
-                res.append(self.__dict__[attr_k] == other.__dict__[attr_k])
-            return all(res)
+            return self._fields() == other._fields()
         return False
 
+    def _fields(self) -> tuple:
+        return self._movie, self._user, self._review_text, self._timestamp, self._rating
+
+
+MIN_REVIEW_RATING = 1
+MAX_REVIEW_RATING = 10
+
+
+class RatingStatistics:
+    """ Running count, sum, sum of squares and histogram of the review ratings of one movie.
+
+    Kept up to date as reviews are added and removed, so summaries never iterate over the reviews. Reviews
+    without a valid rating are not counted.
+    """
+
+    __slots__ = ('_count', '_total', '_total_squares', '_histogram')
+
+    def __init__(self):
+        self._count = 0
+        self._total = 0
+        self._total_squares = 0
+        self._histogram = [0] * (MAX_REVIEW_RATING - MIN_REVIEW_RATING + 1)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def total_squares(self) -> int:
+        return self._total_squares
+
+    @property
+    def histogram(self) -> List[int]:
+        """ Number of reviews per rating, from MIN_REVIEW_RATING to MAX_REVIEW_RATING. """
+        return list(self._histogram)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._total / self._count if self._count else None
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        """ Population standard deviation of the ratings. """
+        if not self._count:
+            return None
+        variance = self._total_squares / self._count - (self._total / self._count) ** 2
+        return math.sqrt(max(0.0, variance))
+
+    def add(self, rating: int) -> None:
+        if rating is not None and MIN_REVIEW_RATING <= rating <= MAX_REVIEW_RATING:
+            self._update(rating, 1)
+
+    def remove(self, rating: int) -> None:
+        if rating is not None and MIN_REVIEW_RATING <= rating <= MAX_REVIEW_RATING \
+                and self._histogram[rating - MIN_REVIEW_RATING]:
+            self._update(rating, -1)
+
+    def copy(self) -> 'RatingStatistics':
+        statistics = RatingStatistics.__new__(RatingStatistics)
+        statistics._count = self._count
+        statistics._total = self._total
+        statistics._total_squares = self._total_squares
+        statistics._histogram = list(self._histogram)
+        return statistics
+
+    def _update(self, rating: int, sign: int) -> None:
+        self._count += sign
+        self._total += sign * rating
+        self._total_squares += sign * rating * rating
+        self._histogram[rating - MIN_REVIEW_RATING] += sign
+
+    def __repr__(self) -> str:
+        return f"<RatingStatistics count={self._count} mean={self.mean}>"
+
 
 class Movie:
+    __slots__ = ('_title', '_year', '_description', '_director', '_actors', '_genres', '_reviews', '_runtime_minutes',
+                 '_rating', '_votes', '_revenue_millions', '_metascore', '_id', '_rating_statistics')
+
     def __init__(self, title: str, year: int):
         if title == "" or type(title) is not str:
             self._title = None
@@ -74,8 +163,15 @@ class Movie:
         self._director = None
         self._actors = list()
         self._genres = list()
-        self._reviews = list()
+        # Review id to review, in the order the reviews were added.
+        self._reviews = dict()
+        self._rating_statistics = RatingStatistics()
         self._runtime_minutes = 0
+        self._rating = None
+        self._votes = None
+        self._revenue_millions = None
+        self._metascore = None
+        self._id = None
 
     def __repr__(self):
         return f"<Movie {self.title}, {self.year}>"
@@ -103,7 +199,10 @@ class Movie:
 
     @property
     def id(self) -> str:
-        return self.title.lower().replace(" ", "_") + "_" + str(self.year)
+        # Built once, the title and year setters reset it.
+        if self._id is None:
+            self._id = self.title.lower().replace(" ", "_") + "_" + str(self.year)
+        return self._id
 
     @property
     def title(self) -> str:
@@ -113,6 +212,8 @@ class Movie:
     def title(self, title: str):
         if not (title == "" or type(title) is not str):
             self._title = title.strip()
+            self._id = None
+            self._rekey_reviews()
 
     @property
     def year(self) -> int:
@@ -122,6 +223,8 @@ class Movie:
     def year(self, year: int):
         if year >= 1900:
             self._year = year
+            self._id = None
+            self._rekey_reviews()
 
     @property
     def description(self) -> str:
@@ -165,7 +268,15 @@ class Movie:
 
     @property
     def reviews(self) -> List[Review]:
-        return self._reviews
+        return list(self._reviews.values())
+
+    @property
+    def review_count(self) -> int:
+        return len(self._reviews)
+
+    @property
+    def rating_statistics(self) -> RatingStatistics:
+        return self._rating_statistics
 
     @property
     def runtime_minutes(self) -> int:
@@ -178,6 +289,53 @@ class Movie:
         else:
             raise ValueError("runtime_minutes should be positive")
 
+    @property
+    def rating(self) -> float:
+        return self._rating
+
+    @rating.setter
+    def rating(self, rating: float):
+        if type(rating) in (int, float) and 0 <= rating <= 10:
+            self._rating = float(rating)
+
+    @property
+    def votes(self) -> int:
+        return self._votes
+
+    @votes.setter
+    def votes(self, votes: int):
+        if type(votes) is int and votes >= 0:
+            self._votes = votes
+
+    @property
+    def revenue_millions(self) -> float:
+        return self._revenue_millions
+
+    @revenue_millions.setter
+    def revenue_millions(self, revenue_millions: float):
+        if type(revenue_millions) in (int, float) and revenue_millions >= 0:
+            self._revenue_millions = float(revenue_millions)
+
+    @property
+    def metascore(self) -> int:
+        return self._metascore
+
+    @metascore.setter
+    def metascore(self, metascore: int):
+        if type(metascore) is int and 0 <= metascore <= 100:
+            self._metascore = metascore
+
+    def copy(self) -> 'Movie':
+        """ A movie with the same details, and its own reviews so reviewing the copy leaves this movie as it is. """
+        movie = Movie.__new__(Movie)
+        for slot in Movie.__slots__:
+            setattr(movie, slot, getattr(self, slot))
+        movie._actors = list(self._actors)
+        movie._genres = list(self._genres)
+        movie._reviews = dict(self._reviews)
+        movie._rating_statistics = self._rating_statistics.copy()
+        return movie
+
     def add_actor(self, actor: Actor):
         if type(actor) is Actor:
             self._actors.append(actor)
@@ -197,18 +355,26 @@ class Movie:
                 self._genres.remove(genre_to_remove)
 
     def add_review(self, review: Review):
-        if type(review) is Review:
-            self._reviews.append(review)
+        if type(review) is Review and review.id not in self._reviews:
+            self._reviews[review.id] = review
+            self._rating_statistics.add(review.rating)
 
     def remove_review(self, review: Review):
-        for review_to_remove in self._reviews:
-            if review_to_remove == review:
-                self._reviews.remove(review_to_remove)
+        if type(review) is Review and self._reviews.get(review.id) == review:
+            self.remove_review_by_id(review.id)
 
     def remove_review_by_id(self, review_id: str):
-        for review_to_remove in self._reviews:
-            if review_to_remove.id == review_id:
-                self._reviews.remove(review_to_remove)
+        review = self._reviews.pop(review_id, None)
+        if review is not None:
+            self._rating_statistics.remove(review.rating)
+
+    def get_review(self, review_id: str) -> Review:
+        return self._reviews.get(review_id)
+
+    def _rekey_reviews(self):
+        # Review ids embed the movie id, which the title and year setters just changed.
+        if self._reviews:
+            self._reviews = {review.id: review for review in self._reviews.values()}
 
     def set_director(self, director: Director):
         self._director = director
@@ -0,0 +1,76 @@
+from typing import Hashable, Iterable, Iterator
+
+# Marks the slot of a removed item until the next compaction.
+_REMOVED = object()
+
+
+class OrderedSet:
+    """ Set that keeps insertion order and can be indexed like a list.
+
+    Items live in a list next to a dict of their positions, so membership, add and discard are O(1). Discarding
+    leaves a marker in the list, and the markers are dropped in one pass before the next indexed read or once
+    they outnumber the items. Indexes before the first removed item are read without compacting.
+    """
+
+    __slots__ = ('_items', '_positions', '_removed', '_first_removed')
+
+    def __init__(self, items: Iterable[Hashable] = ()):
+        self._items = list()
+        self._positions = dict()
+        self._removed = 0
+        self._first_removed = 0
+        self.update(items)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def __iter__(self) -> Iterator:
+        return (item for item in self._items if item is not _REMOVED)
+
+    def __getitem__(self, index: int):
+        # Positions before the first removed item are still exact.
+        if self._removed and not 0 <= index < self._first_removed:
+            self._compact()
+        return self._items[index]
+
+    def __repr__(self) -> str:
+        return f"OrderedSet({list(self)!r})"
+
+    def __reduce__(self):
+        # The removed marker is module private and would not survive pickling, so only the items are stored.
+        return OrderedSet, (list(self),)
+
+    def add(self, item: Hashable) -> bool:
+        if item in self._positions:
+            return False
+        self._positions[item] = len(self._items)
+        self._items.append(item)
+        return True
+
+    def discard(self, item: Hashable) -> bool:
+        position = self._positions.pop(item, None)
+        if position is None:
+            return False
+        self._items[position] = _REMOVED
+        if not self._removed or position < self._first_removed:
+            self._first_removed = position
+        self._removed += 1
+        if self._removed > len(self._positions):
+            self._compact()
+        return True
+
+    def update(self, items: Iterable[Hashable]) -> int:
+        """ Add every item not yet in the set, returns how many were added. """
+        return sum(self.add(item) for item in items)
+
+    def difference_update(self, items: Iterable[Hashable]) -> int:
+        """ Discard every item in items, returns how many were in the set. """
+        return sum(self.discard(item) for item in items)
+
+    def _compact(self) -> None:
+        self._items = [item for item in self._items if item is not _REMOVED]
+        self._positions = {item: position for position, item in enumerate(self._items)}
+        self._removed = 0
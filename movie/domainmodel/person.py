@@ -1,4 +1,6 @@
 class Person:
+    __slots__ = ('_name',)
+
     def __init__(self, name):
         if name == "" or type(name) is not str:
             self._name = None
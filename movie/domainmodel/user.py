@@ -1,12 +1,18 @@
+from typing import Iterable, List
+
 from movie.domainmodel.movie import Movie, Review
+from movie.domainmodel.ordered_set import OrderedSet
 
 
 class User:
+    __slots__ = ('_user_name', '_password', '_watched_movies', '_review_list', '_time_spent_watching_movies_minutes')
+
     def __init__(self, username: str, password: str):
         self._user_name = username
         self._password = password
-        self._watched_movies = list()
-        self._review_list = list()
+        self._watched_movies = OrderedSet()
+        # Review id to review, in the order the reviews were added.
+        self._review_list = dict()
         self._time_spent_watching_movies_minutes = 0
 
     @property
@@ -18,12 +24,12 @@ class User:
         return self._password
 
     @property
-    def watched_movies(self):
-        return self._watched_movies
+    def watched_movies(self) -> List[Movie]:
+        return list(self._watched_movies)
 
     @property
-    def reviews(self):
-        return self._review_list
+    def reviews(self) -> List[Review]:
+        return list(self._review_list.values())
 
     @property
     def time_spent_watching_movies_minutes(self):
@@ -46,14 +52,20 @@ class User:
     def __hash__(self):
         return hash(self.username)
 
+    def has_watched(self, movie: Movie) -> bool:
+        return movie in self._watched_movies
+
     def watch_movie(self, movie: Movie):
-        if movie not in self.watched_movies:
-            self._watched_movies.append(movie)
+        if self._watched_movies.add(movie):
             self._time_spent_watching_movies_minutes += movie.runtime_minutes
 
+    def watch_movies(self, movies: Iterable[Movie]):
+        for movie in movies:
+            self.watch_movie(movie)
+
     def add_review(self, review: Review):
-        if review not in self.reviews:
-            self._review_list.append(review)
+        if type(review) is Review:
+            self._review_list.setdefault(review.id, review)
 
     def to_dict(self):
         return {
@@ -1,17 +1,29 @@
+from typing import Iterable
+
 from movie.domainmodel.movie import Movie
+from movie.domainmodel.ordered_set import OrderedSet
 
 
 class WatchList:
+    __slots__ = ('_watched_movies',)
+
     def __init__(self):
-        self._watched_movies = list()
+        self._watched_movies = OrderedSet()
 
     def add_movie(self, movie: Movie):
-        if movie not in self._watched_movies:
-            self._watched_movies.append(movie)
+        self._watched_movies.add(movie)
+
+    def add_movies(self, movies: Iterable[Movie]) -> int:
+        return self._watched_movies.update(movies)
 
     def remove_movie(self, movie: Movie):
-        if movie in self._watched_movies:
-            self._watched_movies.remove(movie)
+        self._watched_movies.discard(movie)
+
+    def remove_movies(self, movies: Iterable[Movie]) -> int:
+        return self._watched_movies.difference_update(movies)
+
+    def __contains__(self, movie: Movie) -> bool:
+        return movie in self._watched_movies
 
     def select_movie_to_watch(self, index):
         try:
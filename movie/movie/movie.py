@@ -1,12 +1,13 @@
 from typing import Tuple, List
 
-from flask import Blueprint, request, render_template, url_for
+from flask import Blueprint, request, render_template, url_for, jsonify
 
 import movie.adapters.repository as repo
 from movie.domainmodel.movie import Movie
 from movie.movie import services
 from movie.movie.movie_forms import MovieSearchForm
-from movie.utils.constants import MOVIE_BP, LIST_MOVIE_ENDPOINT, MOVIE_DETAILS_ENDPOINT
+from movie.utils.constants import MOVIE_BP, LIST_MOVIE_ENDPOINT, MOVIE_DETAILS_ENDPOINT, SUGGEST_ENDPOINT, \
+    AUTOCOMPLETE_ENDPOINT
 
 movie_blueprint = Blueprint(MOVIE_BP, __name__)
 
@@ -20,7 +21,9 @@ def movies():
     search_key = request.args.get('search_key', None)
     clear_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT)
 
-    if form.validate_on_submit() or (search_by and search_key):
+    # Search results keep their own order (by title, range value or relevance), so sorting only applies to the list.
+    searching = form.validate_on_submit() or bool(search_by and search_key)
+    if searching:
         movies, first_url, prev_url, next_url, last_url = parse_movie_search_request(
             movies_per_page, request, form, search_by, search_key)
     else:
@@ -32,6 +35,11 @@ def movies():
         title='Movie List',
         movies=movies,
         clear_url=clear_url,
+        searching=searching,
+        sort_options=services.SORT_OPTIONS,
+        sort_by=None if searching else request.args.get('sort_by'),
+        order=None if searching else request.args.get('order'),
+        movies_per_page=movies_per_page,
         first_url=first_url,
         last_url=last_url,
         prev_url=prev_url,
@@ -45,24 +53,23 @@ def parse_movie_list_request(movies_per_page: int, request: request) -> Tuple[Li
     next_url = None
     last_url = None
 
-    offset = int(request.args.get('offset', 0))
-    movies = services.get_n_movies(movies_per_page, offset, repo.repo_instance)
+    sort_by = request.args.get('sort_by')
+    if sort_by not in services.SORT_OPTIONS:
+        sort_by = None
+    order = 'desc' if sort_by and request.args.get('order') == 'desc' else None
+    url_args = dict(movies_per_page=movies_per_page, sort_by=sort_by, order=order)
+
+    offset = _parse_offset(request, movies_per_page, sort_by=sort_by)
+    movies = services.get_n_movies(movies_per_page, offset, repo.repo_instance, sort_by, order == 'desc')
     total_movies = services.get_movie_num(repo.repo_instance)
 
     if offset > 0:
-        prev_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, offset=offset - movies_per_page,
-                           movies_per_page=movies_per_page)
-        first_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, movies_per_page=movies_per_page)
+        prev_url = _page_url(movies, services.CURSOR_BEFORE, offset - movies_per_page, **url_args)
+        first_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, **url_args)
     if offset + len(movies) < total_movies:
-        next_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, offset=offset + movies_per_page,
-                           movies_per_page=movies_per_page)
-
-        if total_movies % movies_per_page == 0:
-            last_page = total_movies // movies_per_page - 1
-        else:
-            last_page = total_movies // movies_per_page
-        last_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, offset=last_page * movies_per_page,
-                           movies_per_page=movies_per_page)
+        next_url = _page_url(movies, services.CURSOR_AFTER, offset + movies_per_page, **url_args)
+        last_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT,
+                           offset=_last_page_offset(total_movies, movies_per_page), **url_args)
 
     return movies, first_url, prev_url, next_url, last_url
 
@@ -82,32 +89,35 @@ def parse_movie_search_request(movies_per_page: int, request: request, form: Mov
         'Director': services.get_n_movies_by_director,
         'Director fuzzy': services.get_n_movies_by_director_fuzzy,
         'Genre': services.get_n_movies_by_genre,
-        'Genre fuzzy': services.get_n_movies_by_genre_fuzzy
+        'Genre fuzzy': services.get_n_movies_by_genre_fuzzy,
+        'Year range': services.get_n_movies_by_year_range,
+        'Runtime range': services.get_n_movies_by_runtime_range,
+        'Rating range': services.get_n_movies_by_rating_range,
+        'Query': services.get_n_movies_by_query,
+        'Keywords': services.get_n_movies_by_keywords
     }
 
-    offset = int(request.args.get('offset', 0))
     search_by = form.search_by.data or search_by
     search_key = form.search_text.data or search_key
+    offset = _parse_offset(request, movies_per_page, search_by, search_key)
 
     if search_by in search_func_map:
-        movies, total_movies = search_func_map[search_by](offset, movies_per_page, repo.repo_instance, search_key)
+        try:
+            movies, total_movies = search_func_map[search_by](offset, movies_per_page, repo.repo_instance,
+                                                              search_key)
+        except services.QuerySyntaxError as error:
+            form.search_text.errors = [f'Invalid query: {error}']
 
     if offset > 0:
-        prev_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, offset=offset - movies_per_page,
-                           search_by=search_by,
-                           search_key=search_key,
-                           movies_per_page=movies_per_page)
+        prev_url = _page_url(movies, services.CURSOR_BEFORE, offset - movies_per_page,
+                             search_by=search_by, search_key=search_key, movies_per_page=movies_per_page)
         first_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, search_by=search_by, search_key=search_key,
                             movies_per_page=movies_per_page)
-    if offset * movies_per_page + len(movies) < total_movies:
-        next_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, offset=offset + movies_per_page,
-                           search_by=search_by, search_key=search_key, movies_per_page=movies_per_page)
-
-        if total_movies % movies_per_page == 0:
-            last_page = total_movies // movies_per_page - 1
-        else:
-            last_page = total_movies // movies_per_page
-        last_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, offset=last_page * movies_per_page,
+    if offset + len(movies) < total_movies:
+        next_url = _page_url(movies, services.CURSOR_AFTER, offset + movies_per_page,
+                             search_by=search_by, search_key=search_key, movies_per_page=movies_per_page)
+        last_url = url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT,
+                           offset=_last_page_offset(total_movies, movies_per_page),
                            search_by=search_by, search_key=search_key, movies_per_page=movies_per_page)
 
     form.search_by.data = search_by
@@ -116,6 +126,31 @@ def parse_movie_search_request(movies_per_page: int, request: request, form: Mov
     return movies, first_url, prev_url, next_url, last_url
 
 
+def _parse_offset(request: request, movies_per_page: int, search_by: str = None, search_key: str = None,
+                  sort_by: str = None) -> int:
+    cursor = request.args.get('cursor')
+    if cursor and services.supports_cursor(search_by, sort_by):
+        return services.get_offset_for_cursor(cursor, movies_per_page, repo.repo_instance, search_by, search_key)
+    return int(request.args.get('offset', 0))
+
+
+def _page_url(movies: List[Movie], direction: str, offset: int, **url_args) -> str:
+    # Link by cursor where the search supports it so the page stays put when movies are added, by offset otherwise.
+    if movies and services.supports_cursor(url_args.get('search_by'), url_args.get('sort_by')):
+        anchor = movies[0] if direction == services.CURSOR_BEFORE else movies[-1]
+        return url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, cursor=services.encode_cursor(direction, anchor),
+                       **url_args)
+    return url_for(MOVIE_BP + '.' + LIST_MOVIE_ENDPOINT, offset=max(0, offset), **url_args)
+
+
+def _last_page_offset(total_movies: int, movies_per_page: int) -> int:
+    if total_movies % movies_per_page == 0:
+        last_page = total_movies // movies_per_page - 1
+    else:
+        last_page = total_movies // movies_per_page
+    return last_page * movies_per_page
+
+
 @movie_blueprint.route('/' + MOVIE_DETAILS_ENDPOINT, methods=['GET'])
 def movie_info():
     movie_id = request.args.get('movie_id')
@@ -128,6 +163,7 @@ def movie_info():
     movie_actors = movie_dict.get('movie_actors')
     movie_description = movie_dict.get('movie_description')
     movie_reviews = movie_dict.get('movie_reviews')
+    movie_rating_summary = movie_dict.get('movie_rating_summary')
 
     if not movie_title:
         return render_template(
@@ -142,5 +178,34 @@ def movie_info():
         movie_genres=movie_genres,
         movie_actors=movie_actors,
         movie_description=movie_description,
-        movie_reviews=movie_reviews
+        movie_reviews=movie_reviews,
+        movie_rating_summary=movie_rating_summary
     )
+
+
+@movie_blueprint.route('/' + SUGGEST_ENDPOINT, methods=['GET'])
+def suggest():
+    term = request.args.get('term', '')
+    field = request.args.get('field') or None
+    try:
+        k = int(request.args.get('k', 5))
+        suggestions = services.suggest(term, repo.repo_instance, field, k)
+    except ValueError:
+        return jsonify(error='k must be an integer'), 400
+    except services.UnknownFieldException:
+        return jsonify(error=f'Unknown field {field!r}'), 400
+    return jsonify(term=term, suggestions=suggestions)
+
+
+@movie_blueprint.route('/' + AUTOCOMPLETE_ENDPOINT, methods=['GET'])
+def autocomplete():
+    prefix = request.args.get('prefix', '')
+    field = request.args.get('field') or None
+    try:
+        n = int(request.args.get('n', 10))
+        completions = services.autocomplete(prefix, repo.repo_instance, field, n)
+    except ValueError:
+        return jsonify(error='n must be an integer'), 400
+    except services.UnknownFieldException:
+        return jsonify(error=f'Unknown field {field!r}'), 400
+    return jsonify(prefix=prefix, completions=completions)
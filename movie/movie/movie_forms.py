@@ -5,6 +5,8 @@ from wtforms import StringField, SubmitField, SelectField
 class MovieSearchForm(FlaskForm):
     search_by = SelectField(label='Search By', choices=['Actor', 'Actor fuzzy',
                                                         'Director', 'Director fuzzy',
-                                                        'Genre', 'Genre fuzzy'])
+                                                        'Genre', 'Genre fuzzy',
+                                                        'Year range', 'Runtime range', 'Rating range',
+                                                        'Query', 'Keywords'])
     search_text = StringField(label='Search Text')
     submit = SubmitField(label='Search')
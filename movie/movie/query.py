@@ -0,0 +1,180 @@
+import heapq
+import re
+from typing import List, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+from movie.adapters.repository import AbstractRepository
+from movie.domainmodel.movie import Movie
+
+KEYWORDS = ('AND', 'OR', 'NOT')
+VALUE_TERMINATORS = KEYWORDS + ('(', ')', '=')
+TOKEN_PATTERN = re.compile(r'\(|\)|=|"[^"]*"|[^\s()="]+')
+
+
+class QuerySyntaxError(Exception):
+    pass
+
+
+class Term:
+    def __init__(self, field: str, value: str):
+        self.field = field
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"<Term {self.field}={self.value}>"
+
+
+class And:
+    def __init__(self, children: List['Node']):
+        self.children = children
+
+
+class Or:
+    def __init__(self, children: List['Node']):
+        self.children = children
+
+
+class Not:
+    def __init__(self, child: 'Node'):
+        self.child = child
+
+
+Node = Union[Term, And, Or, Not]
+
+
+def parse_query(query: str) -> Node:
+    """ Parse e.g. 'actor=Chris Pratt AND (genre=Action OR genre="Sci-Fi") AND NOT director=James Gunn'.
+
+    Fields are actor, director and genre. AND binds tighter than OR, and values run until the next keyword, so
+    only values containing a keyword, '=' or parentheses need quotes.
+    """
+    tokens = TOKEN_PATTERN.findall(query or '')
+    if not tokens:
+        raise QuerySyntaxError('Empty query')
+    parser = _Parser(tokens)
+    node = parser.parse_or()
+    if parser.peek() is not None:
+        raise QuerySyntaxError(f'Unexpected {parser.peek()!r}')
+    return node
+
+
+class _Parser:
+    def __init__(self, tokens: List[str]):
+        self._tokens = tokens
+        self._position = 0
+
+    def peek(self) -> str:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise QuerySyntaxError('Unexpected end of query')
+        self._position += 1
+        return token
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.peek() == 'OR':
+            self.next()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self) -> Node:
+        children = [self.parse_not()]
+        while self.peek() == 'AND':
+            self.next()
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self) -> Node:
+        token = self.next()
+        if token == 'NOT':
+            return Not(self.parse_not())
+        if token == '(':
+            node = self.parse_or()
+            if self.next() != ')':
+                raise QuerySyntaxError('Missing )')
+            return node
+        field = token.lower()
+        if field not in MOVIE_LOOKUPS:
+            raise QuerySyntaxError(f'Unknown field {token!r}')
+        if self.next() != '=':
+            raise QuerySyntaxError(f'Expected = after {token!r}')
+        return Term(field, self._parse_value())
+
+    def _parse_value(self) -> str:
+        token = self.next()
+        if token.startswith('"'):
+            return token[1:-1]
+        if token in VALUE_TERMINATORS:
+            raise QuerySyntaxError(f'Expected a value, found {token!r}')
+        words = [token]
+        while self.peek() is not None and self.peek() not in VALUE_TERMINATORS:
+            words.append(self.next())
+        return ' '.join(words)
+
+
+# Per field: the movies with a value in (title, year) order, how many there are, and the values of a movie.
+MOVIE_LOOKUPS = {
+    'actor': lambda repo, value: repo.get_movies_by_actor(value),
+    'director': lambda repo, value: repo.get_movies_by_director(value),
+    'genre': lambda repo, value: repo.get_movies_by_genre(value)
+}
+COUNT_LOOKUPS = {
+    'actor': lambda repo, value: repo.get_movies_by_actor_page(value, 0, 0)[1],
+    'director': lambda repo, value: repo.get_movies_by_director_page(value, 0, 0)[1],
+    'genre': lambda repo, value: repo.get_movies_by_genre_page(value, 0, 0)[1]
+}
+MOVIE_VALUES = {
+    'actor': lambda movie: [actor.actor_full_name for actor in movie.actors],
+    'director': lambda movie: [movie.director.director_full_name] if movie.director else [],
+    'genre': lambda movie: [genre.genre_name for genre in movie.genres]
+}
+
+# How many movies a node can match at most, and a function reading them in (title, year) order.
+Candidates = Tuple[int, Callable[[], Iterable[Movie]]]
+
+
+def evaluate(node: Node, repo: AbstractRepository) -> List[Movie]:
+    """ The movies matching the query, in (title, year) order.
+
+    Each AND reads only its smallest posting list and checks the other terms, negations included, against the
+    movies in it. Only a query of nothing but negations reads the whole catalog.
+    """
+    candidates = _candidates(node, repo)
+    movies = repo.movies if candidates is None else candidates[1]()
+    return [movie for movie in movies if _matches(node, movie)]
+
+
+def _candidates(node: Node, repo: AbstractRepository) -> Optional[Candidates]:
+    """ The movies node can match, or None if that is any movie. """
+    if isinstance(node, Term):
+        return COUNT_LOOKUPS[node.field](repo, node.value), lambda: MOVIE_LOOKUPS[node.field](repo, node.value)
+    if isinstance(node, Not):
+        return None
+    children = [_candidates(child, repo) for child in node.children]
+    if isinstance(node, And):
+        bounded = [candidates for candidates in children if candidates is not None]
+        return min(bounded, key=lambda candidates: candidates[0]) if bounded else None
+    if any(candidates is None for candidates in children):
+        return None
+    return sum(count for count, _ in children), lambda: _merge([movies() for _, movies in children])
+
+
+def _merge(movie_lists: List[Iterable[Movie]]) -> Iterator[Movie]:
+    """ The movies of lists in (title, year) order, merged in that order without duplicates. """
+    previous = None
+    for movie in heapq.merge(*movie_lists):
+        if movie != previous:
+            yield movie
+        previous = movie
+
+
+def _matches(node: Node, movie: Movie) -> bool:
+    if isinstance(node, Term):
+        return node.value in MOVIE_VALUES[node.field](movie)
+    if isinstance(node, And):
+        return all(_matches(child, movie) for child in node.children)
+    if isinstance(node, Or):
+        return any(_matches(child, movie) for child in node.children)
+    return not _matches(node.child, movie)
@@ -1,72 +1,243 @@
-from itertools import islice
-from typing import List, Generator, Tuple
-
-import editdistance
+import base64
+import binascii
+import json
+from typing import List, Tuple, Callable, Optional, Dict
 
 from movie.adapters.repository import AbstractRepository
-from movie.domainmodel.movie import Movie
+from movie.domainmodel.movie import Movie, MIN_REVIEW_RATING, MAX_REVIEW_RATING
+from movie.movie.query import parse_query, evaluate, QuerySyntaxError
+
+
+# Sort options of the movie list, by the name used in urls, mapped to the repository sort order.
+SORT_OPTIONS = {
+    'year': 'year',
+    'runtime': 'runtime_minutes',
+    'rating': 'rating',
+    'votes': 'votes',
+    'revenue': 'revenue_millions'
+}
 
 
-def get_n_movies(n: int, offset: int, repo: AbstractRepository) -> List[Movie]:
-    return repo.get_n_movies(n, offset)
+def get_n_movies(n: int, offset: int, repo: AbstractRepository, sort_by: str = None,
+                 descending: bool = False) -> List[Movie]:
+    """ A page of movies in (title, year) order, or by one of SORT_OPTIONS. Unknown sort options are ignored. """
+    return repo.get_n_movies(n, offset, SORT_OPTIONS.get(sort_by), descending)
 
 
 def get_movie_num(repo: AbstractRepository) -> int:
     return repo.get_total_number_of_movies()
 
 
+CURSOR_AFTER = 'after'
+CURSOR_BEFORE = 'before'
+
+# Searches whose results are kept in (title, year) order by a repository index, so a cursor can be located by
+# bisecting that index. The second item resolves fuzzy terms to the indexed name.
+_CURSOR_INDEXES = {
+    'Actor': ('actor', None),
+    'Actor fuzzy': ('actor', lambda repo, name: repo.get_closest_actor(name)),
+    'Director': ('director', None),
+    'Director fuzzy': ('director', lambda repo, name: repo.get_closest_director(name)),
+    'Genre': ('genre', None),
+    'Genre fuzzy': ('genre', lambda repo, name: repo.get_closest_genre(name))
+}
+
+
+def encode_cursor(direction: str, movie: Movie) -> str:
+    payload = json.dumps([direction, movie.title, movie.year]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, str, int]]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, title, year = json.loads(payload.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if direction not in (CURSOR_AFTER, CURSOR_BEFORE) or type(title) is not str or type(year) is not int:
+        return None
+    return direction, title, year
+
+
+def supports_cursor(search_by: str = None, sort_by: str = None) -> bool:
+    return sort_by not in SORT_OPTIONS and (search_by is None or search_by in _CURSOR_INDEXES)
+
+
+def get_offset_for_cursor(cursor: str, n: int, repo: AbstractRepository,
+                          search_by: str = None, search_key: str = None) -> int:
+    """ Offset of the page a cursor points to, resolved against the current repo so inserts don't shift it. """
+    decoded = decode_cursor(cursor)
+    if decoded is None or not supports_cursor(search_by):
+        return 0
+    direction, title, year = decoded
+
+    index = lookup_key = None
+    if search_by is not None:
+        index, find_closest = _CURSOR_INDEXES[search_by]
+        lookup_key = find_closest(repo, search_key) if find_closest else search_key
+
+    if direction == CURSOR_AFTER:
+        return repo.get_movie_rank(title, year, True, index, lookup_key)
+    return max(0, repo.get_movie_rank(title, year, False, index, lookup_key) - n)
+
+
 def get_n_movies_by_actor(offset: int, n: int, repo: AbstractRepository, actor: str) -> Tuple[List[Movie], int]:
-    movies_gen = repo.get_movies_by_actor(actor)
-    movies_count = sum(1 for _ in repo.get_movies_by_actor(actor))
-    return _get_items_from_offset(offset, n, movies_gen), movies_count
+    return repo.get_movies_by_actor_page(actor, offset, n)
 
 
 def get_n_movies_by_director(offset: int, n: int, repo: AbstractRepository, director: str) -> Tuple[List[Movie], int]:
-    movies_gen = repo.get_movies_by_director(director)
-    movies_count = sum(1 for _ in repo.get_movies_by_director(director))
-    return _get_items_from_offset(offset, n, movies_gen), movies_count
+    return repo.get_movies_by_director_page(director, offset, n)
 
 
 def get_n_movies_by_genre(offset: int, n: int, repo: AbstractRepository, genre: str) -> Tuple[List[Movie], int]:
-    movies_gen = repo.get_movies_by_genre(genre)
-    movies_count = sum(1 for _ in repo.get_movies_by_genre(genre))
-    return _get_items_from_offset(offset, n, movies_gen), movies_count
+    return repo.get_movies_by_genre_page(genre, offset, n)
+
+
+def get_n_movies_by_year_range(offset: int, n: int, repo: AbstractRepository,
+                               year_range: str) -> Tuple[List[Movie], int]:
+    return _get_n_movies_by_range(offset, n, repo.get_movies_by_year_range_page, _parse_range(year_range, int))
+
+
+def get_n_movies_by_runtime_range(offset: int, n: int, repo: AbstractRepository,
+                                  runtime_range: str) -> Tuple[List[Movie], int]:
+    return _get_n_movies_by_range(offset, n, repo.get_movies_by_runtime_range_page, _parse_range(runtime_range, int))
+
+
+def get_n_movies_by_rating_range(offset: int, n: int, repo: AbstractRepository,
+                                 rating_range: str) -> Tuple[List[Movie], int]:
+    return _get_n_movies_by_range(offset, n, repo.get_movies_by_rating_range_page, _parse_range(rating_range, float))
+
+
+def get_n_movies_by_keywords(offset: int, n: int, repo: AbstractRepository, keywords: str) -> Tuple[List[Movie], int]:
+    return repo.get_movies_by_text_page(keywords, offset, n)
 
 
-def _get_items_from_offset(offset: int, n: int, gen: Generator) -> List:
-    items = list(islice(gen, offset, offset + n))
-    return items
+def get_n_movies_by_query(offset: int, n: int, repo: AbstractRepository, query: str) -> Tuple[List[Movie], int]:
+    """ Raises QuerySyntaxError if query is not a valid query. """
+    movies = evaluate(parse_query(query), repo)
+    return movies[offset: offset + n], len(movies)
 
 
-def get_n_movies_by_director_fuzzy(offset: int, n: int, repo: AbstractRepository,
-                                   director_fuzzy: str) -> Tuple[List[Movie], int]:
-    director = _find_fuzzy_match(director_fuzzy, repo.directors)
+def _get_n_movies_by_range(offset: int, n: int, search_page: Callable[..., Tuple[List[Movie], int]],
+                           bounds: Optional[Tuple[float, float]]) -> Tuple[List[Movie], int]:
+    if bounds is None:
+        return [], 0
+    return search_page(*bounds, offset, n)
+
+
+def _parse_range(range_term: str, convert: Callable[[str], float]) -> Optional[Tuple[float, float]]:
+    """ Parse 'low-high', 'low-', '-high' or a single value, returns None if the term is not a range. """
+    low, sep, high = (range_term or '').strip().partition('-')
+    try:
+        low = convert(low) if low.strip() else None
+        high = convert(high) if high.strip() else None
+    except ValueError:
+        return None
+    if not sep:
+        high = low
+    if low is None and high is None:
+        return None
+    return low, high
+
+
+def get_n_movies_by_director_fuzzy(offset: int, n: int, repo: AbstractRepository, director_fuzzy: str,
+                                   max_distance: int = None) -> Tuple[List[Movie], int]:
+    director = repo.get_closest_director(director_fuzzy, max_distance)
     return get_n_movies_by_director(offset, n, repo, director)
 
 
-def get_n_movies_by_actor_fuzzy(offset: int, n: int, repo: AbstractRepository,
-                                actor_fuzzy: str) -> Tuple[List[Movie], int]:
-    actor = _find_fuzzy_match(actor_fuzzy, repo.actors)
+def get_n_movies_by_actor_fuzzy(offset: int, n: int, repo: AbstractRepository, actor_fuzzy: str,
+                                max_distance: int = None) -> Tuple[List[Movie], int]:
+    actor = repo.get_closest_actor(actor_fuzzy, max_distance)
     return get_n_movies_by_actor(offset, n, repo, actor)
 
 
-def get_n_movies_by_genre_fuzzy(offset: int, n: int, repo: AbstractRepository,
-                                genre_fuzzy: str) -> Tuple[List[Movie], int]:
-    genre = _find_fuzzy_match(genre_fuzzy, repo.genres)
+def get_n_movies_by_genre_fuzzy(offset: int, n: int, repo: AbstractRepository, genre_fuzzy: str,
+                                max_distance: int = None) -> Tuple[List[Movie], int]:
+    genre = repo.get_closest_genre(genre_fuzzy, max_distance)
     return get_n_movies_by_genre(offset, n, repo, genre)
 
 
-def _find_fuzzy_match(fuzzy_term: str, items: Generator[str, None, None]) -> str:
-    distances = ((match_item,
-                  editdistance.eval(fuzzy_term.lower(), match_item.lower()))
-                 for match_item in items)
-    min_dist = float('inf')
-    min_dist_item = None
-    for item, distance in distances:
-        if distance < min_dist:
-            min_dist_item = item
-            min_dist = distance
-    return min_dist_item
+class UnknownFieldException(Exception):
+    pass
+
+
+SUGGEST_FIELDS = {
+    'actor': lambda repo, term, k: repo.suggest_actors(term, k),
+    'director': lambda repo, term, k: repo.suggest_directors(term, k),
+    'genre': lambda repo, term, k: repo.suggest_genres(term, k)
+}
+MAX_SUGGESTIONS = 20
+
+
+def suggest(term: str, repo: AbstractRepository, field: str = None, k: int = 5) -> Dict[str, List[str]]:
+    """ Up to k names per field for a possibly misspelt term, for every field or only for field. """
+    if field is not None and field not in SUGGEST_FIELDS:
+        raise UnknownFieldException
+    k = max(0, min(k, MAX_SUGGESTIONS))
+    fields = SUGGEST_FIELDS if field is None else [field]
+    if not term or not term.strip() or k == 0:
+        return {name: [] for name in fields}
+    return {name: SUGGEST_FIELDS[name](repo, term, k) for name in fields}
+
+
+COMPLETE_FIELDS = {
+    'title': lambda repo, prefix, n: repo.complete_titles(prefix, n),
+    'actor': lambda repo, prefix, n: repo.complete_actors(prefix, n),
+    'director': lambda repo, prefix, n: repo.complete_directors(prefix, n),
+    'genre': lambda repo, prefix, n: repo.complete_genres(prefix, n)
+}
+MAX_COMPLETIONS = 20
+
+
+def autocomplete(prefix: str, repo: AbstractRepository, field: str = None, n: int = 10) -> Dict[str, List[dict]]:
+    """ Up to n names per field starting with prefix, for every field or only for field, most movies first. """
+    if field is not None and field not in COMPLETE_FIELDS:
+        raise UnknownFieldException
+    n = max(0, min(n, MAX_COMPLETIONS))
+    fields = COMPLETE_FIELDS if field is None else [field]
+    if not prefix or not prefix.strip() or n == 0:
+        return {name: [] for name in fields}
+    return {name: [{'name': completion, 'movies': count}
+                   for completion, count in COMPLETE_FIELDS[name](repo, prefix, n)]
+            for name in fields}
+
+
+def get_costars(actor: str, repo: AbstractRepository) -> List[str]:
+    return repo.get_costars(actor)
+
+
+def get_shared_movies(actor: str, other_actor: str, repo: AbstractRepository) -> List[Movie]:
+    return repo.get_shared_movies(actor, other_actor)
+
+
+def get_actor_connection(actor: str, other_actor: str, repo: AbstractRepository) -> Optional[dict]:
+    """ A shortest chain of co-stars between two actors with a movie linking each pair, None if there is none. """
+    path = repo.get_actor_path(actor, other_actor)
+    if not path:
+        return None
+    links = [{'actor': name, 'costar': costar, 'movie': repo.get_shared_movies(name, costar)[0].title}
+             for name, costar in zip(path, path[1:])]
+    return {'actors': path, 'degrees': len(path) - 1, 'links': links}
+
+
+def get_rating_summary(movie: Movie) -> dict:
+    """ Review count and rating statistics of a movie, from the aggregates the movie keeps as reviews change. """
+    statistics = movie.rating_statistics
+    mean = statistics.mean
+    std_dev = statistics.std_dev
+    return {
+        'reviews': movie.review_count,
+        'ratings': statistics.count,
+        'mean': round(mean, 2) if mean is not None else None,
+        'std_dev': round(std_dev, 2) if std_dev is not None else None,
+        'histogram': dict(zip(range(MIN_REVIEW_RATING, MAX_REVIEW_RATING + 1), statistics.histogram))
+    }
+
+
+def get_rating_summary_by_id(movie_id: str, repo: AbstractRepository) -> Optional[dict]:
+    movie = repo.get_movie_by_id(movie_id)
+    return get_rating_summary(movie) if movie else None
 
 
 def fetch_movie_info_by_id(movie_id: str, repo: AbstractRepository):
@@ -86,5 +257,6 @@ def fetch_movie_info_by_id(movie_id: str, repo: AbstractRepository):
                                         'username': review.username,
                                         'id': review.id}
                                        for review in movie.reviews]
+        movie_info['movie_rating_summary'] = get_rating_summary(movie)
 
     return movie_info
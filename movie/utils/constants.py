@@ -1,12 +1,15 @@
 MOVIE_DATA_FILE = 'movies.csv'
 USER_DATA_FILE = 'users.csv'
 REVIEW_DATA_FILE = 'reviews.csv'
+SQLITE_DATA_FILE = 'movies.db'
 
 HOME_BP = 'home_bp'
 
 MOVIE_BP = 'movie_bp'
 LIST_MOVIE_ENDPOINT = 'movies'
 MOVIE_DETAILS_ENDPOINT = 'movie_info'
+SUGGEST_ENDPOINT = 'suggest'
+AUTOCOMPLETE_ENDPOINT = 'autocomplete'
 
 SEARCH_MOVIE_ENDPOINT = 'search'
 RES_ENDPOINT = 'res'
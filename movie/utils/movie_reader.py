@@ -1,19 +1,23 @@
 import csv
-from typing import List
+import sys
+from typing import List, Callable, Optional, TypeVar
 
 from movie.domainmodel.actor import Actor
 from movie.domainmodel.director import Director
 from movie.domainmodel.genre import Genre
 from movie.domainmodel.movie import Movie
 
+T = TypeVar('T')
+
 
 class MovieFileCSVReader(object):
     def __init__(self, data_path):
         self._data_path = data_path
         self._dataset_of_movies = set()
-        self._dataset_of_actors = set()
-        self._dataset_of_directors = set()
-        self._dataset_of_genres = set()
+        # Name to the one shared instance, so an actor appearing in a hundred movies is a single Actor object.
+        self._dataset_of_actors = dict()
+        self._dataset_of_directors = dict()
+        self._dataset_of_genres = dict()
 
     @property
     def dataset_of_movies(self) -> List[Movie]:
@@ -21,15 +25,15 @@ class MovieFileCSVReader(object):
 
     @property
     def dataset_of_actors(self) -> List[Actor]:
-        return list(self._dataset_of_actors)
+        return list(self._dataset_of_actors.values())
 
     @property
     def dataset_of_directors(self) -> List[Director]:
-        return list(self._dataset_of_directors)
+        return list(self._dataset_of_directors.values())
 
     @property
     def dataset_of_genres(self) -> List[Genre]:
-        return list(self._dataset_of_genres)
+        return list(self._dataset_of_genres.values())
 
     def _read_field(self, record: dict, key: str, sep: str) -> List[str]:
         str_objects = record.get(key)
@@ -37,6 +41,19 @@ class MovieFileCSVReader(object):
             return str_objects.split(sep)
         return []
 
+    def _intern(self, registry: dict, create: Callable[[str], T], name: str) -> T:
+        name = sys.intern(name.strip())
+        instance = registry.get(name)
+        if instance is None:
+            instance = registry[name] = create(name)
+        return instance
+
+    def _read_number(self, record: dict, key: str, convert: Callable[[str], float]) -> Optional[float]:
+        try:
+            return convert(record.get(key))
+        except (TypeError, ValueError):
+            return None
+
     def read_csv_file(self):
         with open(self._data_path, mode='r', encoding='utf-8-sig') as f:
             records = csv.DictReader(f)
@@ -44,21 +61,19 @@ class MovieFileCSVReader(object):
                 movie = Movie(record.get('Title'), int(record.get('Year', 0)))
 
                 for actor in self._read_field(record, 'Actors', ','):
-                    actor = Actor(actor)
-                    movie.add_actor(actor)
-                    self._dataset_of_actors.add(actor)
+                    movie.add_actor(self._intern(self._dataset_of_actors, Actor, actor))
 
                 for genre in self._read_field(record, 'Genre', ','):
-                    genre = Genre(genre)
-                    movie.add_genre(genre)
-                    self._dataset_of_genres.add(genre)
+                    movie.add_genre(self._intern(self._dataset_of_genres, Genre, genre))
 
                 for director in self._read_field(record, 'Director', ','):
-                    director = Director(director)
-                    movie.set_director(director)
-                    self._dataset_of_directors.add(director)
+                    movie.set_director(self._intern(self._dataset_of_directors, Director, director))
 
                 movie.description = record.get('Description')
                 movie.runtime_minutes = int(record.get('Runtime (Minutes)'))
+                movie.rating = self._read_number(record, 'Rating', float)
+                movie.votes = self._read_number(record, 'Votes', int)
+                movie.revenue_millions = self._read_number(record, 'Revenue (Millions)', float)
+                movie.metascore = self._read_number(record, 'Metascore', int)
 
                 self._dataset_of_movies.add(movie)
@@ -1,24 +1,30 @@
 import csv
 from typing import List, Tuple
 
+# A row of just a review id and its movie id records that the review was deleted.
+DELETED_REVIEW_FIELDS = 2
+
 
 class ReviewFileCSVReader(object):
     def __init__(self, data_path):
         self._data_path = data_path
-        self._reviews = list()
+        self._reviews = dict()
 
     @property
     def dataset_of_reviews(self) -> List[Tuple]:
         self.read_csv_file()
-        return self._reviews
+        return list(self._reviews.values())
 
     def read_csv_file(self):
         with open(self._data_path, 'r') as csv_file:
             reviews = csv.reader(csv_file, delimiter=',')
             for review in reviews:
+                if len(review) == DELETED_REVIEW_FIELDS:
+                    self._reviews.pop(review[0], None)
+                    continue
                 movie_id = review[1]
                 username = review[2]
                 rating = review[3]
                 comment = review[4]
                 timestamp = review[5]
-                self._reviews.append((movie_id, username, comment, int(rating), float(timestamp)))
+                self._reviews[review[0]] = (movie_id, username, comment, int(rating), float(timestamp))
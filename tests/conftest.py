@@ -1,15 +1,16 @@
 import os
+import shutil
 
 import pytest
 
 from movie import create_app
-from movie.adapters import memory_repository
+from movie.adapters import memory_repository, sqlite_repository
 from movie.domainmodel.actor import Actor
 from movie.domainmodel.director import Director
 from movie.domainmodel.genre import Genre
 from movie.domainmodel.movie import Movie
 from movie.domainmodel.user import User
-from movie.utils.constants import USER_DATA_FILE, MOVIE_DATA_FILE, REVIEW_DATA_FILE
+from movie.utils.constants import USER_DATA_FILE, MOVIE_DATA_FILE, REVIEW_DATA_FILE, SQLITE_DATA_FILE
 
 TEST_CONFIG = {
     'TESTING': True,
@@ -22,7 +23,17 @@ TEST_CONFIG = {
 
 @pytest.fixture
 def memory_repo():
-    repo = memory_repository.MemoryRepository()
+    return _populate_test_repo(memory_repository.MemoryRepository())
+
+
+@pytest.fixture
+def sqlite_repo(tmp_path):
+    repo = sqlite_repository.SqliteRepository(str(tmp_path / SQLITE_DATA_FILE))
+    yield _populate_test_repo(repo)
+    repo.close()
+
+
+def _populate_test_repo(repo):
     movie_1 = Movie('Movie1', 2000)
     movie_2 = Movie('Movie2', 2001)
     movie_3 = Movie('Movie3', 2002)
@@ -74,8 +85,11 @@ def memory_repo():
 
 
 @pytest.fixture
-def client():
-    my_app = create_app(TEST_CONFIG)
+def client(tmp_path):
+    # Reviews are appended to the data file, so every test gets its own copy.
+    reviews_data_path = tmp_path / REVIEW_DATA_FILE
+    shutil.copyfile(TEST_CONFIG['TEST_REVIEWS_DATA_PATH'], reviews_data_path)
+    my_app = create_app({**TEST_CONFIG, 'TEST_REVIEWS_DATA_PATH': str(reviews_data_path)})
     return my_app.test_client()
 
 
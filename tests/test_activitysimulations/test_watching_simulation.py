@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from activitysimulations.watchingsimulation import MovieWatchingSimulation, SimulationReport, WATCH, REVIEW
+from movie.adapters.memory_repository import MemoryRepository, populate_movies
+from movie.utils.constants import MOVIE_DATA_FILE
+
+MOVIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datafiles', MOVIE_DATA_FILE)
+
+
+def test_same_seed_same_workload():
+    first = MovieWatchingSimulation(MOVIES_PATH, users=5, events=500, seed=3, measure_memory=True).run()
+    second = MovieWatchingSimulation(MOVIES_PATH, users=5, events=500, seed=3).run()
+    other = MovieWatchingSimulation(MOVIES_PATH, users=5, events=500, seed=4).run()
+    assert first.totals == second.totals
+    assert first.operation_counts == second.operation_counts
+    assert first.operation_counts != other.operation_counts
+    assert first.events == sum(first.operation_counts.values()) == 500
+    assert first.memory_peak >= first.memory_growth > 0
+    assert second.memory_growth == 0
+    assert first.throughput > 0
+    assert first.percentile(50) <= first.percentile(99)
+
+
+def test_reviews_reach_the_repository():
+    repo = MemoryRepository()
+    populate_movies(MOVIES_PATH, repo)
+    report = MovieWatchingSimulation(MOVIES_PATH, users=3, events=200,
+                                     operation_weights={WATCH: 1, REVIEW: 1}).run(repo=repo)
+    assert sum(len(movie.reviews) for movie in repo.movies) == report.totals['reviews'] > 0
+    assert len(list(repo.users)) == 3
+
+
+def test_parallel_workers():
+    simulation = MovieWatchingSimulation(MOVIES_PATH, users=4, events=400, seed=1)
+    report = simulation.run(workers=2)
+    assert report.workers == 2
+    assert report.events == 400
+    assert report.totals == SimulationReport.merge([simulation.run_worker(worker, 2) for worker in range(2)]).totals
+    with pytest.raises(ValueError):
+        simulation.run(workers=2, repo=MemoryRepository())
+
+
+def test_percentile():
+    report = SimulationReport(4, 2.0, {WATCH: [1000, 2000, 3000], REVIEW: [4000]}, 0, 0, {})
+    assert report.percentile(50) == 2.0
+    assert report.percentile(100, REVIEW) == 4.0
+    assert report.percentile(50, 'unknown') is None
+    assert report.throughput == 2.0
+
+
+def test_rejects_unknown_operation():
+    with pytest.raises(ValueError):
+        MovieWatchingSimulation(MOVIES_PATH, operation_weights={'rewatch': 1})
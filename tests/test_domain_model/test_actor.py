@@ -58,3 +58,10 @@ def test_add_colleague():
     assert actor.check_if_this_actor_worked_with(valid_colleague)
     with pytest.raises(TypeError):
         actor.add_actor_colleague(invalid_colleague)
+
+
+def test_slots():
+    actor = Actor('Angelina Jolie')
+    assert not hasattr(actor, '__dict__')
+    actor.add_actor_colleague(Actor('Brad Pitt'))
+    assert actor.check_if_this_actor_worked_with(Actor('Brad Pitt'))
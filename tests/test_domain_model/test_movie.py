@@ -1,7 +1,7 @@
 import pytest
 
 from movie.domainmodel.director import Director
-from movie.domainmodel.movie import Movie
+from movie.domainmodel.movie import Movie, Review
 
 
 def test_init():
@@ -84,3 +84,79 @@ def test_set_runtime_minutes():
     movie1 = Movie("Moana", 2016)
     with pytest.raises(ValueError):
         movie1.runtime_minutes = 0
+
+
+def test_set_numeric_fields():
+    movie1 = Movie("Moana", 2016)
+    assert movie1.rating is None
+    movie1.rating = 7.6
+    movie1.rating = 11
+    assert movie1.rating == 7.6
+    movie1.votes = 118151
+    movie1.votes = -1
+    assert movie1.votes == 118151
+    movie1.revenue_millions = 248.75
+    movie1.revenue_millions = None
+    assert movie1.revenue_millions == 248.75
+    movie1.metascore = 81
+    movie1.metascore = 101
+    assert movie1.metascore == 81
+
+
+def test_id_follows_title_and_year():
+    movie = Movie('Guardians of the Galaxy', 2014)
+    assert movie.id == 'guardians_of_the_galaxy_2014'
+    assert movie.id is movie.id
+    movie.title = 'Guardians of the Galaxy Vol. 2'
+    movie.year = 2017
+    assert movie.id == 'guardians_of_the_galaxy_vol._2_2017'
+    movie.year = 1800
+    assert movie.id == 'guardians_of_the_galaxy_vol._2_2017'
+
+
+def test_reviews_by_id():
+    movie = Movie('Moana', 2016)
+    first = Review(movie, 'user', 'first', 7, 1.0)
+    second = Review(movie, 'user', 'second', 8, 2.0)
+    movie.add_review(first)
+    movie.add_review(second)
+    movie.add_review(Review(movie, 'user', 'first again', 7, 1.0))
+    assert movie.reviews == [first, second]
+    assert movie.get_review(second.id) is second
+
+    movie.remove_review(Review(movie, 'user', 'different text', 8, 2.0))
+    assert movie.reviews == [first, second]
+    movie.remove_review(Review(movie, 'user', 'second', 8, 2.0))
+    assert movie.reviews == [first]
+
+    movie.title = 'Moana 2'
+    assert movie.get_review(first.id) is first
+    movie.remove_review_by_id(first.id)
+    movie.remove_review_by_id('unknown')
+    assert movie.reviews == []
+
+
+def test_rating_statistics():
+    movie = Movie('Moana', 2016)
+    reviews = [Review(movie, 'user', 'text', rating, float(timestamp))
+               for timestamp, rating in enumerate([4, 8, 8, 0, 10], start=1)]
+    for review in reviews:
+        movie.add_review(review)
+    movie.add_review(reviews[0])
+    statistics = movie.rating_statistics
+    assert movie.review_count == 5
+    assert (statistics.count, statistics.total, statistics.total_squares) == (4, 30, 244)
+    assert statistics.histogram == [0, 0, 0, 1, 0, 0, 0, 2, 0, 1]
+    assert statistics.mean == 7.5
+    assert statistics.std_dev == pytest.approx(2.179, abs=1e-3)
+
+    movie.remove_review_by_id(reviews[1].id)
+    movie.remove_review_by_id(reviews[3].id)
+    movie.remove_review_by_id(reviews[3].id)
+    assert (movie.review_count, statistics.count, statistics.total) == (3, 3, 22)
+    assert statistics.histogram[7] == 1
+
+    for review in reviews:
+        movie.remove_review(review)
+    assert (statistics.count, statistics.total, statistics.total_squares) == (0, 0, 0)
+    assert statistics.mean is None and statistics.std_dev is None
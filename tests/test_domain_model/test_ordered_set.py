@@ -0,0 +1,39 @@
+import pickle
+
+import pytest
+
+from movie.domainmodel.ordered_set import OrderedSet
+
+
+def test_keeps_insertion_order():
+    items = OrderedSet(['b', 'a', 'b', 'c'])
+    assert list(items) == ['b', 'a', 'c']
+    assert len(items) == 3
+    assert 'a' in items and 'd' not in items
+    assert items.add('a') is False
+    assert items.update(['d', 'a', 'e']) == 2
+    assert [items[0], items[-1]] == ['b', 'e']
+
+
+def test_discard_and_index():
+    items = OrderedSet(range(10))
+    assert items.discard(3) is True
+    assert items.discard(3) is False
+    assert items[2] == 2
+    assert items[3] == 4
+    assert items[-1] == 9
+    assert items.difference_update([0, 1, 2, 11]) == 3
+    assert list(items) == [4, 5, 6, 7, 8, 9]
+    assert items[0] == 4
+    with pytest.raises(IndexError):
+        _ = items[6]
+    items.add(3)
+    assert list(items) == [4, 5, 6, 7, 8, 9, 3]
+
+
+def test_pickle():
+    items = OrderedSet(['a', 'b', 'c'])
+    items.discard('b')
+    restored = pickle.loads(pickle.dumps(items))
+    assert list(restored) == ['a', 'c']
+    assert restored[1] == 'c'
@@ -55,3 +55,20 @@ def test_equal(movie, movie2):
     assert review != review4
     review5 = Review(movie, username, review_text2, rating, timestamp)
     assert review != review5
+    assert review != 'not a review'
+
+
+def test_slots(movie):
+    review = Review(movie, 'user', 'text', 5)
+    assert not hasattr(review, '__dict__')
+    assert not hasattr(movie, '__dict__')
+    with pytest.raises(AttributeError):
+        review.extra = 1
+
+
+def test_id_follows_movie(movie):
+    review = Review(movie, 'user', 'text', 5, 1.5)
+    assert review.id == 'moana1_2016user1.5'
+    assert review.id is review.id
+    movie.year = 2017
+    assert review.id == 'moana1_2017user1.5'
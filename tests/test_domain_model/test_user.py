@@ -1,5 +1,6 @@
 import pytest
 
+from movie.domainmodel.movie import Movie, Review
 from movie.domainmodel.user import User
 
 
@@ -25,3 +26,26 @@ def test_lt():
     assert user1 < user2
     with pytest.raises(TypeError):
         _ = user1 < 'c'
+
+
+def test_watch_movies():
+    user = User('Martin', 'pw12345')
+    moana = Movie('Moana', 2016)
+    moana.runtime_minutes = 107
+    ice_age = Movie('Ice Age', 2002)
+    ice_age.runtime_minutes = 81
+    user.watch_movie(moana)
+    user.watch_movies([ice_age, Movie('Moana', 2016)])
+    assert user.watched_movies == [moana, ice_age]
+    assert user.has_watched(Movie('Ice Age', 2002))
+    assert user.time_spent_watching_movies_minutes == 188
+
+
+def test_add_review():
+    user = User('Martin', 'pw12345')
+    movie = Movie('Moana', 2016)
+    review = Review(movie, 'Martin', 'Great', 9, 1.0)
+    user.add_review(review)
+    user.add_review(Review(movie, 'Martin', 'Great', 9, 1.0))
+    user.add_review(Review(movie, 'Martin', 'Again', 8, 2.0))
+    assert [review.review_text for review in user.reviews] == ['Great', 'Again']
@@ -62,3 +62,14 @@ def test_iteration(watch_list):
         res.append(movie)
     for i in range(len(res)):
         assert res[i] == watch_list.select_movie_to_watch(i)
+
+
+def test_bulk_add_and_remove(watch_list):
+    movies = [Movie("Moana", 2016), Movie("Ice Age", 2002), Movie("Guardians of the Galaxy", 2012)]
+    assert watch_list.add_movies(movies + [Movie("Moana", 2016)]) == 3
+    assert watch_list.remove_movies([Movie("Moana", 2016), Movie("Up", 2009)]) == 1
+    assert Movie("Ice Age", 2002) in watch_list
+    assert Movie("Moana", 2016) not in watch_list
+    assert watch_list.first_movie_in_watchlist() == Movie("Ice Age", 2002)
+    assert watch_list.select_movie_to_watch(-1) == Movie("Guardians of the Galaxy", 2012)
+    assert watch_list.select_movie_to_watch(2) is None
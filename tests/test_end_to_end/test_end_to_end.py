@@ -1,3 +1,4 @@
+import re
 from html.parser import HTMLParser
 
 import pytest
@@ -68,6 +69,7 @@ def test_review(client, auth):
     response = client.get('/movie_info?movie_id=guardians_of_the_galaxy_2014')
     assert response.status_code == 200
     assert b'This is a test review' in response.data
+    assert b'movie-rating-summary' in response.data
 
     # Test delete review
     response = client.get('/movie_info?movie_id=guardians_of_the_galaxy_2014')
@@ -131,3 +133,107 @@ def test_movie_search(client):
     assert response.status_code == 200
     assert b'Guardians of the Galaxy' in response.data
     assert b'Prometheus' not in response.data
+
+
+def test_movie_range_search(client):
+    response = client.get('/' + LIST_MOVIE_ENDPOINT + "?search_by=Year+range&search_key=2014-2014&movies_per_page=20")
+    assert response.status_code == 200
+    assert b'Guardians of the Galaxy' in response.data
+    assert b'Prometheus' not in response.data
+
+
+def test_movie_query_syntax_error(client):
+    response = client.get('/' + LIST_MOVIE_ENDPOINT + "?search_by=Query&search_key=title%3DMoana")
+    assert response.status_code == 200
+    assert b'Invalid query: Unknown field' in response.data
+
+
+class PageLinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.links = {}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'button' and 'onclick' in attrs:
+            self._onclick = attrs['onclick'].split("'")[1]
+
+    def handle_data(self, data):
+        if getattr(self, '_onclick', None):
+            self.links[data.strip()] = self._onclick.replace('&amp;', '&')
+            self._onclick = None
+
+
+def test_movie_list_cursor_pagination(client):
+    response = client.get('/' + LIST_MOVIE_ENDPOINT + '?movies_per_page=2')
+    parser = PageLinkParser()
+    parser.feed(response.data.decode('utf-8'))
+    assert 'cursor=' in parser.links['Next']
+
+    next_page = client.get(parser.links['Next'])
+    assert next_page.status_code == 200
+    parser = PageLinkParser()
+    parser.feed(next_page.data.decode('utf-8'))
+    assert 'cursor=' in parser.links['Previous']
+
+    previous_page = client.get(parser.links['Previous'])
+    assert previous_page.data.count(b'Details') == response.data.count(b'Details') == 2
+
+
+def test_movie_list_sorted(client):
+    response = client.get('/' + LIST_MOVIE_ENDPOINT + '?movies_per_page=2&sort_by=year&order=desc')
+    assert response.status_code == 200
+    parser = PageLinkParser()
+    parser.feed(response.data.decode('utf-8'))
+    assert 'sort_by=year' in parser.links['Next'] and 'order=desc' in parser.links['Next']
+    assert 'cursor=' not in parser.links['Next']
+    assert b'sort_by=rating&amp;movies_per_page=2' in response.data
+    assert b'movies_per_page=10&amp;sort_by=year&amp;order=desc' in response.data
+
+
+def test_movie_list_sorted_order(client):
+    response = client.get('/' + LIST_MOVIE_ENDPOINT + '?movies_per_page=10&sort_by=rating&order=desc')
+    assert _listed_movie_ids(response) == ['guardians_of_the_galaxy_2014', 'split_2016', 'sing_2016',
+                                           'prometheus_2012']
+
+
+def test_search_hides_sort(client):
+    # Sorted by rating Prometheus would come first, search results stay in title order.
+    response = client.get('/' + LIST_MOVIE_ENDPOINT + '?search_by=Genre&search_key=Sci-Fi&movies_per_page=10'
+                          '&sort_by=rating')
+    assert response.status_code == 200
+    assert _listed_movie_ids(response) == ['guardians_of_the_galaxy_2014', 'prometheus_2012']
+    assert b'sortMenuLink' not in response.data
+    assert b'sort_by=' not in response.data
+
+
+def _listed_movie_ids(response):
+    return re.findall(r'movie_info\?movie_id=([^"&]+)', response.data.decode('utf-8'))
+
+
+def test_suggest_endpoint(client):
+    response = client.get('/suggest?term=Chris%20Prat&field=actor&k=3')
+    assert response.status_code == 200
+    assert response.get_json()['suggestions']['actor'][0] == 'Chris Pratt'
+    assert len(response.get_json()['suggestions']['actor']) <= 3
+
+    response = client.get('/suggest?term=Chris%20Prat&field=title')
+    assert response.status_code == 400
+
+
+def test_autocomplete_endpoint(client):
+    response = client.get('/autocomplete?prefix=chris&field=actor&n=3')
+    assert response.status_code == 200
+    completions = response.get_json()['completions']['actor']
+    assert 0 < len(completions) <= 3
+    assert all(completion['name'].lower().startswith('chris') for completion in completions)
+    assert [completion['movies'] for completion in completions] == \
+           sorted((completion['movies'] for completion in completions), reverse=True)
+
+    assert client.get('/autocomplete?prefix=chris&n=many').status_code == 400
+
+
+def test_movie_keyword_search(client):
+    response = client.get('/' + LIST_MOVIE_ENDPOINT + '?search_by=Keywords&search_key=galaxy')
+    assert response.status_code == 200
+    assert b'Guardians of the Galaxy' in response.data
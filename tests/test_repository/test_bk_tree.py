@@ -0,0 +1,45 @@
+from movie.adapters.bk_tree import BKTree, closest_name
+
+
+def test_find_fuzzy_match():
+    items = ['term111', 'term222', 'term333']
+    tree = BKTree()
+    for item in items:
+        tree.add(item)
+    for term in ['Term222', 'TErm222', 'tm22']:
+        assert closest_name(term, (i for i in items)) == 'term222'
+        assert tree.closest(term) == 'term222'
+
+
+def test_closest_max_distance():
+    tree = BKTree()
+    for name in ['Chris Pratt', 'Chris Pine', 'Chris Evans', 'Zoe Saldana']:
+        tree.add(name)
+    assert len(tree) == 4
+    assert tree.closest('chris pratt', max_distance=0) == 'Chris Pratt'
+    assert tree.closest('Chris Pin', max_distance=1) == 'Chris Pine'
+    assert tree.closest('Bradley Cooper', max_distance=3) is None
+    assert closest_name('Bradley Cooper', ['Chris Pratt'], max_distance=3) is None
+
+
+def test_closest_ties_and_liveness():
+    tree = BKTree()
+    for name in ['Genre1', 'Genre2', 'genre1']:
+        tree.add(name)
+    assert tree.closest('genre3') == 'Genre1'
+    assert tree.closest('genre3', is_live=lambda name: name != 'Genre1') == 'Genre2'
+    assert tree.closest('genre1', is_live=lambda name: name != 'Genre1') == 'genre1'
+
+    clone = tree.clone()
+    clone.add('Genre3')
+    assert clone.closest('genre3') == 'Genre3'
+    assert tree.closest('genre3') == 'Genre1'
+
+
+def test_matches_linear_scan():
+    names = ['Actor{}'.format(i * 37 % 101) for i in range(60)] + ['Anne Hathaway', 'Ann Hathaway', 'Tom Hanks']
+    tree = BKTree()
+    for name in names:
+        tree.add(name)
+    for term in ['actr7', 'Anne Hathawy', 'Tom', 'Actor100', 'xyz']:
+        assert tree.closest(term) == closest_name(term, names)
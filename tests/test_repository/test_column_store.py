@@ -0,0 +1,107 @@
+import math
+import os
+
+import pytest
+
+from movie.adapters.column_store import MovieColumnStore
+from movie.adapters.memory_repository import MemoryRepository, populate_movies
+from movie.adapters.repository import RepositoryException
+from movie.domainmodel.movie import Movie
+from movie.utils.constants import MOVIE_DATA_FILE
+
+
+def _movie(title, year, runtime_minutes, rating, revenue_millions=None):
+    movie = Movie(title, year)
+    movie.runtime_minutes = runtime_minutes
+    movie.rating = rating
+    movie.revenue_millions = revenue_millions
+    return movie
+
+
+@pytest.fixture
+def column_store():
+    store = MovieColumnStore()
+    store.add(_movie('Movie1', 2009, 100, 6.5, 10.0))
+    store.add(_movie('Movie2', 2011, 130, 7.5))
+    store.add(_movie('Movie3', 2013, 90, 8.0, 30.0))
+    store.add(_movie('Movie4', 2016, 110, 5.0, 50.0))
+    return store
+
+
+def test_add(column_store):
+    assert len(column_store) == 4
+    assert column_store.ordinal('movie3_2013') == 2
+    assert column_store.movie_id(2) == 'movie3_2013'
+    assert column_store.add(Movie('Movie3', 2013)) == 2
+    assert list(column_store.column('year')) == [2009, 2011, 2013, 2016]
+    assert math.isnan(column_store.column('revenue_millions')[1])
+
+
+def test_filter(column_store):
+    assert column_store.filter(year=(2010, 2015), runtime_minutes=(None, 120)) == [2]
+    assert column_store.filter(rating=(7, None)) == [1, 2]
+    assert column_store.filter(revenue_millions=(None, None)) == [0, 2, 3]
+    assert column_store.filter() == [0, 1, 2, 3]
+
+
+def test_aggregate(column_store):
+    stats = column_store.aggregate('revenue_millions')
+    assert stats['count'] == 3
+    assert stats['sum'] == 90.0
+    assert stats['mean'] == 30.0
+    assert stats['min'] == 10.0
+    assert stats['max'] == 50.0
+    assert column_store.aggregate('rating', column_store.filter(year=(2010, None)))['count'] == 3
+    assert column_store.aggregate('metascore')['mean'] is None
+
+
+def test_remove(column_store):
+    assert column_store.remove('movie2_2011') is True
+    assert column_store.remove('movie2_2011') is False
+    assert len(column_store) == 3
+    assert column_store.filter(rating=(7, None)) == [2]
+    assert column_store.filter() == [0, 2, 3]
+
+
+def test_repository_keeps_column_store():
+    repo = MemoryRepository()
+    populate_movies(os.path.join('tests', 'datafiles', MOVIE_DATA_FILE), repo)
+    store = repo.column_store
+    assert len(store) == repo.get_total_number_of_movies()
+    guardians = store.ordinal('guardians_of_the_galaxy_2014')
+    assert store.column('rating')[guardians] == 8.1
+    assert store.column('votes')[guardians] == 757074
+    repo.delete_movie(Movie('Guardians of the Galaxy', 2014))
+    assert store.ordinal('guardians_of_the_galaxy_2014') is None
+
+
+def test_compact_when_removed_outnumber_live(column_store):
+    column_store.remove('movie1_2009')
+    column_store.remove('movie3_2013')
+    assert column_store.movie_id(0) is None
+    column_store.remove('movie4_2016')
+    assert len(column_store.column('year')) == 1
+    assert column_store.ordinal('movie2_2011') == 0
+    assert column_store.filter(rating=(7, None)) == [0]
+    assert column_store.add(Movie('Movie5', 2020)) == 1
+
+
+def test_repository_statistics(memory_repo):
+    movie = _movie('Test Movie', 2020, 80, 8.5)
+    memory_repo.add_movie(movie)
+    assert memory_repo.get_movie_statistics('year') == {'count': 6, 'sum': 12030.0, 'mean': 2005.0, 'min': 2000.0,
+                                                       'max': 2020.0}
+    assert memory_repo.get_movie_statistics('rating', {'year': (2010, None)})['mean'] == 8.5
+    assert memory_repo.get_movie_statistics('year', {'runtime_minutes': (None, None)})['count'] == 1
+    memory_repo.delete_movie(movie)
+    assert memory_repo.get_movie_statistics('rating')['count'] == 0
+    with pytest.raises(RepositoryException):
+        memory_repo.get_movie_statistics('title')
+
+
+def test_derived_generation_copies_column_store(memory_repo):
+    generation = memory_repo.derive()
+    generation.add_movie(_movie('Test Movie', 2020, 80, 8.5))
+    assert generation.get_movie_statistics('rating')['count'] == 1
+    assert memory_repo.get_movie_statistics('rating')['count'] == 0
+    assert memory_repo.column_store.ordinal('test_movie_2020') is None
@@ -0,0 +1,70 @@
+import random
+
+from movie.adapters.costar_graph import CostarGraph, shortest_path
+
+
+def test_costars_and_shared_movies():
+    graph = CostarGraph()
+    graph.add_cast(['Chris Pratt', 'Zoe Saldana', 'Bradley Cooper'])
+    graph.add_cast(['Chris Pratt', 'Zoe Saldana'])
+    graph.add_cast(['Zoe Saldana', 'Sam Worthington', 'Zoe Saldana'])
+    assert graph.costars('Zoe Saldana') == ['Bradley Cooper', 'Chris Pratt', 'Sam Worthington']
+    assert graph.shared_movie_count('Zoe Saldana', 'Chris Pratt') == 2
+    assert graph.worked_with('Bradley Cooper', 'Chris Pratt')
+    assert not graph.worked_with('Bradley Cooper', 'Sam Worthington')
+    assert not graph.worked_with('Zoe Saldana', 'Zoe Saldana')
+    assert graph.costars('Unknown') == []
+
+    graph.remove_cast(['Chris Pratt', 'Zoe Saldana'])
+    assert graph.shared_movie_count('Chris Pratt', 'Zoe Saldana') == 1
+    clone = graph.clone()
+    graph.remove_cast(['Chris Pratt', 'Zoe Saldana', 'Bradley Cooper'])
+    assert graph.costars('Chris Pratt') == []
+    assert clone.costars('Chris Pratt') == ['Bradley Cooper', 'Zoe Saldana']
+
+
+def test_shortest_path():
+    graph = CostarGraph()
+    graph.add_cast(['A', 'B'])
+    graph.add_cast(['B', 'C', 'D'])
+    graph.add_cast(['D', 'E'])
+    graph.add_cast(['A', 'F'])
+    graph.add_cast(['F', 'E'])
+    graph.add_cast(['X', 'Y'])
+    assert graph.shortest_path('A', 'E') == ['A', 'F', 'E']
+    assert graph.shortest_path('C', 'A') == ['C', 'B', 'A']
+    assert graph.shortest_path('A', 'A') == ['A']
+    assert graph.shortest_path('A', 'X') == []
+    assert graph.shortest_path('A', 'Unknown') == []
+
+
+def test_shortest_path_matches_breadth_first_search():
+    generator = random.Random(7)
+    neighbors = {node: set() for node in range(300)}
+    for _ in range(400):
+        node, other = generator.sample(range(300), 2)
+        neighbors[node].add(other)
+        neighbors[other].add(node)
+
+    def distances_from(source):
+        distances = {source: 0}
+        frontier = [source]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for other in neighbors[node] - distances.keys():
+                    distances[other] = distances[node] + 1
+                    next_frontier.append(other)
+            frontier = next_frontier
+        return distances
+
+    expand = lambda frontier: ((node, sorted(neighbors[node])) for node in frontier)
+    for source in range(0, 300, 30):
+        distances = distances_from(source)
+        for target in range(300):
+            path = shortest_path(source, target, expand)
+            if target not in distances:
+                assert path == []
+                continue
+            assert len(path) == distances[target] + 1
+            assert all(other in neighbors[node] for node, other in zip(path, path[1:]))
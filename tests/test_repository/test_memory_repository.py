@@ -1,8 +1,17 @@
+import os
+import sys
+
+import pytest
+
+from movie.adapters.memory_repository import MemoryRepository
+from movie.adapters.repository import RepositoryException
 from movie.domainmodel.actor import Actor
 from movie.domainmodel.director import Director
 from movie.domainmodel.genre import Genre
-from movie.domainmodel.movie import Movie
+from movie.domainmodel.movie import Movie, Review
 from movie.domainmodel.user import User
+from movie.utils.constants import MOVIE_DATA_FILE
+from movie.utils.movie_reader import MovieFileCSVReader
 
 
 def test_repository_can_add_movie(memory_repo):
@@ -109,3 +118,251 @@ def test_add_user(memory_repo):
     user = User('TestUser', 'Test123456')
     memory_repo.add_user(user)
     assert user is memory_repo.get_user('TestUser')
+
+
+def test_get_movie_is_case_insensitive(memory_repo):
+    assert memory_repo.get_movie('MOVIE1', 2000) is memory_repo.get_first_movie()
+    assert memory_repo.get_movie('movie1', 2001) is None
+
+
+def test_add_duplicated_movie(memory_repo):
+    res = memory_repo.add_movie(Movie('movie1', 2000))
+    assert res is False
+    assert memory_repo.get_total_number_of_movies() == 5
+
+
+def test_get_movie_after_delete(memory_repo):
+    memory_repo.delete_movie(Movie('Movie3', 2002))
+    assert memory_repo.get_movie('Movie3', 2002) is None
+
+
+def test_add_user_with_existing_normalized_name(memory_repo):
+    exist_user = memory_repo.get_user('ExistUser')
+    memory_repo.add_user(User(' existuser ', 'Password456'))
+    assert memory_repo.get_user('EXISTUSER') is exist_user
+    assert len(list(memory_repo.users)) == 1
+
+
+def test_users_keep_insertion_order(memory_repo):
+    memory_repo.add_user(User('B_User', 'Password123'))
+    memory_repo.add_user(User('A_User', 'Password123'))
+    assert [user.username for user in memory_repo.users] == ['ExistUser', 'B_User', 'A_User']
+
+
+def test_delete_movie_updates_indexes(memory_repo):
+    memory_repo.delete_movie(Movie('Movie4', 2003))
+    assert memory_repo.get_movie_by_id('movie4_2003') is None
+    assert [movie.title for movie in memory_repo.get_movies_by_actor('Actor3')] == ['Movie3', 'Movie5']
+    assert [movie.title for movie in memory_repo.get_movies_by_director('Director2')] == ['Movie5']
+    assert [movie.title for movie in memory_repo.get_movies_by_genre('Genre2')] == ['Movie2']
+
+
+def test_delete_movie_drops_empty_index_keys(memory_repo):
+    memory_repo.delete_movie(Movie('Movie1', 2000))
+    assert 'Actor1' not in list(memory_repo.actors)
+    assert memory_repo.get_first_movie() == Movie('Movie2', 2001)
+
+
+def test_delete_movies(memory_repo):
+    res = memory_repo.delete_movies([Movie('Movie1', 2000), Movie('Movie3', 2002),
+                                     Movie('Not Existing Movie', 9999)])
+    assert res == 2
+    assert memory_repo.get_total_number_of_movies() == 3
+    assert [movie.title for movie in memory_repo.movies] == ['Movie2', 'Movie4', 'Movie5']
+    assert list(memory_repo.get_movies_by_director('Director1')) == [Movie('Movie2', 2001)]
+    assert [movie.title for movie in memory_repo.get_movies_by_genre('Genre1')] == ['Movie5']
+    assert 'Actor1' not in list(memory_repo.actors)
+    assert memory_repo.get_movie('Movie3', 2002) is None
+
+
+def test_add_movies(memory_repo):
+    movie = Movie('Another Movie', 2020)
+    movie.add_actor(Actor('Actor1'))
+    movie.director = Director('Director2')
+    res = memory_repo.add_movies([Movie('Zulu Movie', 2020), movie, Movie('movie1', 2000), Movie('Zulu Movie', 2020)])
+    assert res == 2
+    assert memory_repo.get_total_number_of_movies() == 7
+    assert memory_repo.get_first_movie() is movie
+    assert memory_repo.get_last_movie() == Movie('Zulu Movie', 2020)
+    assert movie in memory_repo.get_movies_by_actor('Actor1')
+    assert movie in memory_repo.get_movies_by_director('Director2')
+    assert memory_repo.get_movie('another movie', 2020) is movie
+
+
+def test_load_from_reader():
+    repo = MemoryRepository()
+    res = repo.load_from_reader(MovieFileCSVReader(os.path.join('tests', 'datafiles', MOVIE_DATA_FILE)))
+    assert res == repo.get_total_number_of_movies() > 0
+    movies = list(repo.movies)
+    assert movies == sorted(movies)
+    assert repo.get_movie('Guardians of the Galaxy', 2014) in repo.get_movies_by_director('James Gunn')
+
+
+def test_reader_shares_people_and_genres():
+    reader = MovieFileCSVReader(os.path.join('tests', 'datafiles', MOVIE_DATA_FILE))
+    reader.read_csv_file()
+    actors = {}
+    for movie in reader.dataset_of_movies:
+        for person in movie.actors + movie.genres + [movie.director]:
+            assert actors.setdefault((type(person), repr(person)), person) is person
+    assert len(reader.dataset_of_actors) == len({actor.actor_full_name for actor in reader.dataset_of_actors})
+    actor = reader.dataset_of_actors[0]
+    assert actor.actor_full_name is sys.intern(actor.actor_full_name)
+
+
+def test_get_movies_by_year_range(memory_repo):
+    assert [movie.year for movie in memory_repo.get_movies_by_year_range(2001, 2003)] == [2001, 2002, 2003]
+    assert [movie.year for movie in memory_repo.get_movies_by_year_range(2003)] == [2003, 2004]
+    assert [movie.year for movie in memory_repo.get_movies_by_year_range(None, 2000)] == [2000]
+    assert list(memory_repo.get_movies_by_year_range(2010, 2015)) == []
+
+
+def test_get_movies_by_range_page_breaks_ties_by_title(memory_repo):
+    memory_repo.add_movie(Movie('Movie0', 2002))
+    memory_repo.add_movies([Movie('A Movie', 2002)])
+    movies, total = memory_repo.get_movies_by_year_range_page(2002, 2003, 0, 3)
+    assert [movie.title for movie in movies] == ['A Movie', 'Movie0', 'Movie3']
+    assert total == 4
+    assert memory_repo.get_movies_by_rating_range_page(None, None, 0, 5) == ([], 0)
+
+
+def test_get_movies_by_runtime_and_rating_range(memory_repo):
+    short_movie = Movie('Short Movie', 2020)
+    short_movie.runtime_minutes = 80
+    short_movie.rating = 8.5
+    long_movie = Movie('Long Movie', 2020)
+    long_movie.runtime_minutes = 150
+    long_movie.rating = 6.0
+    memory_repo.add_movie(short_movie)
+    memory_repo.add_movies([long_movie])
+    assert list(memory_repo.get_movies_by_runtime_range(None, 120)) == [short_movie]
+    assert list(memory_repo.get_movies_by_runtime_range(60, None)) == [short_movie, long_movie]
+    assert list(memory_repo.get_movies_by_rating_range(5.5, 7)) == [long_movie]
+    memory_repo.delete_movie(short_movie)
+    assert list(memory_repo.get_movies_by_rating_range()) == [long_movie]
+    memory_repo.delete_movies([long_movie])
+    assert list(memory_repo.get_movies_by_runtime_range()) == []
+
+
+def test_get_movies_page(memory_repo):
+    movies, total = memory_repo.get_movies_by_actor_page('Actor5', 1, 2)
+    assert [movie.title for movie in movies] == ['Movie2', 'Movie3']
+    assert total == 5
+    movies, total = memory_repo.get_movies_by_director_page('Director2', 1, 5)
+    assert [movie.title for movie in movies] == ['Movie5']
+    assert total == 2
+    movies, total = memory_repo.get_movies_by_genre_page('Genre1', 5, 5)
+    assert movies == []
+    assert total == 3
+    assert memory_repo.get_movies_by_genre_page('Not Existing Genre', 0, 5) == ([], 0)
+
+
+def test_get_movie_rank(memory_repo):
+    assert memory_repo.get_movie_rank('Movie3', 2002) == 2
+    assert memory_repo.get_movie_rank('Movie3', 2002, inclusive=True) == 3
+    assert memory_repo.get_movie_rank('Movie2', 2010) == 2
+    assert memory_repo.get_movie_rank('Movie4', 2003, index='actor', lookup_key='Actor3') == 1
+    assert memory_repo.get_movie_rank('Movie4', 2003, True, 'genre', 'Genre2') == 2
+    assert memory_repo.get_movie_rank('Movie4', 2003, index='actor', lookup_key='Not Existing Actor') == 0
+
+
+def test_posting_lists_keep_movie_order(memory_repo):
+    movie = Movie('Movie0', 2020)
+    movie.add_actor(Actor('Actor3'))
+    memory_repo.add_movie(movie)
+    assert [movie.title for movie in memory_repo.get_movies_by_actor('Actor3')] == \
+           ['Movie0', 'Movie3', 'Movie4', 'Movie5']
+
+
+def test_get_n_movies_sorted(memory_repo):
+    for title, rating, votes in [('Movie1', 6.5, 100), ('Movie2', 8.0, None), ('Movie3', 6.5, 300)]:
+        movie = memory_repo.get_movie(title, int(title[-1]) + 1999)
+        memory_repo.delete_movie(movie)
+        movie.rating = rating
+        movie.votes = votes
+        memory_repo.add_movie(movie)
+    assert [movie.title for movie in memory_repo.get_n_movies(5, 0, 'rating')] == \
+           ['Movie1', 'Movie3', 'Movie2', 'Movie4', 'Movie5']
+    assert [movie.title for movie in memory_repo.get_n_movies(3, 0, 'rating', True)] == ['Movie2', 'Movie1', 'Movie3']
+    assert [movie.title for movie in memory_repo.get_n_movies(2, 1, 'votes', True)] == ['Movie1', 'Movie2']
+    assert [movie.title for movie in memory_repo.get_n_movies(2, 0, 'year', True)] == ['Movie5', 'Movie4']
+
+    memory_repo.delete_movies([memory_repo.get_movie('Movie3', 2002)])
+    assert [movie.title for movie in memory_repo.get_n_movies(2, 0, 'rating')] == ['Movie1', 'Movie2']
+    assert [movie.title for movie in memory_repo.clone().get_n_movies(2, 0, 'votes', True)] == ['Movie1', 'Movie2']
+    with pytest.raises(RepositoryException):
+        memory_repo.get_n_movies(2, 0, 'title')
+
+
+def test_get_closest_names(memory_repo):
+    assert memory_repo.get_closest_actor('acto3') == 'Actor3'
+    assert memory_repo.get_closest_director('direcor2', max_distance=1) == 'Director2'
+    assert memory_repo.get_closest_genre('genre', max_distance=0) is None
+    memory_repo.delete_movies([memory_repo.get_movie('Movie4', 2003), memory_repo.get_movie('Movie5', 2004)])
+    assert memory_repo.get_closest_director('direcor2') == 'Director1'
+
+
+def test_complete_names(memory_repo):
+    assert memory_repo.complete_actors('actor', 2) == [('Actor5', 5), ('Actor4', 4)]
+    assert memory_repo.complete_directors('DIRECTOR') == [('Director1', 3), ('Director2', 2)]
+    assert memory_repo.complete_genres('genre1') == [('Genre1', 3)]
+    assert memory_repo.complete_titles('movie', 2) == [('Movie1', 1), ('Movie2', 1)]
+    memory_repo.delete_movie(memory_repo.get_movie('Movie1', 2000))
+    assert memory_repo.complete_directors('dir') == [('Director1', 2), ('Director2', 2)]
+    assert memory_repo.complete_titles('movie1') == []
+
+
+def test_get_movies_by_text_page():
+    repo = MemoryRepository()
+    for title, year, description in [('Heat', 1995, 'A heist crew and a detective.'),
+                                     ('Inside Man', 2006, 'A bank heist turns into a hostage standoff.'),
+                                     ('Up', 2009, 'A balloon adventure.')]:
+        movie = Movie(title, year)
+        movie.description = description
+        repo.add_movie(movie)
+    movies, total = repo.get_movies_by_text_page('Heist detective', 0, 1)
+    assert total == 2
+    assert [movie.title for movie in movies] == ['Heat']
+    repo.delete_movie(Movie('Heat', 1995))
+    movies, total = repo.clone().get_movies_by_text_page('heist detective', 0, 5)
+    assert (total, [movie.title for movie in movies]) == (1, ['Inside Man'])
+
+
+def test_costar_graph(memory_repo):
+    assert memory_repo.get_costars('Actor1') == ['Actor2', 'Actor4', 'Actor5']
+    assert memory_repo.have_worked_together('Actor3', 'Actor4')
+    assert not memory_repo.have_worked_together('Actor1', 'Actor3')
+    assert [movie.title for movie in memory_repo.get_shared_movies('Actor4', 'Actor5')] == \
+           ['Movie1', 'Movie2', 'Movie4', 'Movie5']
+    assert memory_repo.get_shared_movies('Actor1', 'Actor3') == []
+    assert memory_repo.get_actor_path('Actor1', 'Actor3') == ['Actor1', 'Actor4', 'Actor3']
+
+    clone = memory_repo.clone()
+    memory_repo.delete_movie(Movie('Movie1', 2000))
+    assert memory_repo.get_costars('Actor1') == []
+    assert memory_repo.get_actor_path('Actor1', 'Actor3') == []
+    assert clone.get_costars('Actor1') == ['Actor2', 'Actor4', 'Actor5']
+    memory_repo.delete_movies([Movie('Movie2', 2001)])
+    assert not memory_repo.have_worked_together('Actor2', 'Actor5')
+
+
+def test_add_review_rows(memory_repo):
+    rows = [('movie1_2000', 'ExistUser', 'First', 4, 1.0), ('missing_1999', 'ExistUser', 'Lost', 5, 3.0)]
+    assert memory_repo.add_review_rows(rows) == 1
+    assert [review.review_text for review in memory_repo.get_movie_by_id('movie1_2000').reviews] == ['First']
+
+
+def test_derived_generation_leaves_parent_unchanged(memory_repo):
+    generation = memory_repo.derive()
+    movie = Movie('Movie0', 2010)
+    movie.add_actor(Actor('Actor1'))
+    generation.add_movie(movie)
+    generation.delete_movie(Movie('Movie2', 2001))
+    generation.add_review(Review(memory_repo.get_movie_by_id('movie3_2002'), 'ExistUser', 'A test review', 4))
+    assert list(generation.get_movies_by_actor('Actor1')) == [movie, Movie('Movie1', 2000)]
+    assert list(memory_repo.get_movies_by_actor('Actor1')) == [Movie('Movie1', 2000)]
+    assert list(memory_repo.get_movies_by_actor('Actor2')) == [Movie('Movie1', 2000), Movie('Movie2', 2001)]
+    assert memory_repo.get_n_movies(2, 0, 'year') == [Movie('Movie1', 2000), Movie('Movie2', 2001)]
+    assert memory_repo.complete_titles('Movie0') == []
+    assert memory_repo.get_movie_by_id('movie3_2002').reviews == []
+    assert generation.get_movie_by_id('movie3_2002').review_count == 1
@@ -0,0 +1,28 @@
+from movie.adapters.prefix_index import PrefixIndex
+
+
+def test_complete_by_movie_count():
+    index = PrefixIndex()
+    index.add_many(['Chris Pratt', 'Chris Pine', 'Chris Pratt', 'christopher Nolan', 'Zoe Saldana'])
+    index.add('Chris Pine')
+    index.add('Chris Pine')
+    assert index.complete('chris') == [('Chris Pine', 3), ('Chris Pratt', 2), ('christopher Nolan', 1)]
+    assert index.complete('CHRIS P', 1) == [('Chris Pine', 3)]
+    assert index.complete('') == index.complete('', 10)
+    assert len(index.complete('')) == 4
+    assert index.complete('x') == []
+
+
+def test_remove():
+    index = PrefixIndex()
+    index.add_many(['Action', 'Adventure', 'Action'])
+    index.remove('Action')
+    assert index.count('Action') == 1
+    index.remove('Adventure')
+    assert index.complete('a') == [('Action', 1)]
+    assert len(index) == 1
+
+    clone = index.clone()
+    clone.remove('Action')
+    assert clone.complete('a') == []
+    assert index.complete('a') == [('Action', 1)]
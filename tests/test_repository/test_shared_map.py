@@ -0,0 +1,41 @@
+from movie.adapters.shared_map import SharedMap
+
+
+def test_mapping():
+    index = SharedMap([('b', 1), ('a', 2)])
+    index['c'] = 3
+    index['b'] = 4
+    assert len(index) == 3
+    assert index['b'] == 4
+    assert index.get('d') is None
+    assert 'a' in index and 'd' not in index
+    assert list(index) == ['b', 'a', 'c']
+    assert list(index.values()) == [4, 2, 3]
+    assert index.setdefault('a', 5) == 2
+    assert index.pop('a') == 2
+    assert index.pop('a') is None
+    assert list(index.items()) == [('b', 4), ('c', 3)]
+
+
+def test_grows_past_bucket_count():
+    index = SharedMap((number, str(number)) for number in range(1000))
+    assert len(index) == 1000
+    assert len(index._buckets) > 8
+    assert all(index[number] == str(number) for number in range(1000))
+    assert list(index) == list(range(1000))
+
+
+def test_copy_shares_unchanged_buckets():
+    index = SharedMap((number, number) for number in range(100))
+    copy = index.copy()
+    copy[1] = -1
+    copy.pop(2)
+    copy[100] = 100
+    assert index[1] == 1 and index[2] == 2 and 100 not in index
+    assert copy[1] == -1 and 2 not in copy and copy[100] == 100
+    changed = {hash(key) & (len(index._buckets) - 1) for key in (1, 2, 100)}
+    for position, bucket in enumerate(copy._buckets):
+        assert (bucket is index._buckets[position]) == (position not in changed)
+
+    index[1] = 0
+    assert copy[1] == -1
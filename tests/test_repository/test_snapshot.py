@@ -0,0 +1,92 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+import pytest
+
+from movie import create_app
+from movie.adapters import repository
+from movie.adapters.snapshot import save_snapshot, load_snapshot, build_repository, fingerprint_data_files, \
+    SNAPSHOT_MAGIC, SNAPSHOT_HEADER
+from movie.utils.constants import MOVIE_DATA_FILE, USER_DATA_FILE, REVIEW_DATA_FILE
+
+
+@pytest.fixture
+def data_paths():
+    tmp_dir = tempfile.mkdtemp()
+    paths = []
+    for data_file in (MOVIE_DATA_FILE, USER_DATA_FILE, REVIEW_DATA_FILE):
+        paths.append(shutil.copy(os.path.join('tests', 'datafiles', data_file), tmp_dir))
+    yield paths
+    shutil.rmtree(tmp_dir)
+
+
+def test_load_snapshot(data_paths):
+    snapshot_path = os.path.join(os.path.dirname(data_paths[0]), 'repository.snapshot')
+    repo = build_repository(*data_paths)
+    save_snapshot(snapshot_path, data_paths, repo)
+
+    loaded_repo = load_snapshot(snapshot_path, data_paths)
+    assert list(loaded_repo.movies) == list(repo.movies)
+    assert loaded_repo.get_movie('Guardians of the Galaxy', 2014) in loaded_repo.get_movies_by_director('James Gunn')
+    assert loaded_repo.get_user('test_user_001') is not None
+
+
+def test_load_stale_snapshot(data_paths):
+    snapshot_path = os.path.join(os.path.dirname(data_paths[0]), 'repository.snapshot')
+    save_snapshot(snapshot_path, data_paths, build_repository(*data_paths))
+    with open(data_paths[1], 'a') as f:
+        f.write('new_user,password\n')
+    assert load_snapshot(snapshot_path, data_paths) is None
+
+
+def test_load_missing_snapshot(data_paths):
+    assert load_snapshot(os.path.join(os.path.dirname(data_paths[0]), 'missing.snapshot'), data_paths) is None
+
+
+def test_create_app_from_snapshot(data_paths):
+    snapshot_path = os.path.join(os.path.dirname(data_paths[0]), 'repository.snapshot')
+    repo = build_repository(*data_paths)
+    repo.get_user('test_user_001').watch_movie(repo.get_first_movie())
+    save_snapshot(snapshot_path, data_paths, repo)
+
+    create_app(_test_config(data_paths, snapshot_path))
+    assert len(repository.repo_instance.get_user('test_user_001').watched_movies) == 1
+
+
+def test_build_snapshot_command(data_paths):
+    snapshot_path = os.path.join(os.path.dirname(data_paths[0]), 'repository.snapshot')
+    app = create_app(_test_config(data_paths, snapshot_path))
+    result = app.test_cli_runner().invoke(args=['build-snapshot'])
+    assert result.exit_code == 0
+    assert load_snapshot(snapshot_path, data_paths) is not None
+
+
+def _test_config(data_paths, snapshot_path):
+    return {
+        'TESTING': True,
+        'TEST_MOVIE_DATA_PATH': data_paths[0],
+        'TEST_USERS_DATA_PATH': data_paths[1],
+        'TEST_REVIEWS_DATA_PATH': data_paths[2],
+        'REPOSITORY_SNAPSHOT_PATH': snapshot_path
+    }
+
+
+def test_load_snapshot_of_other_version(data_paths):
+    snapshot_path = os.path.join(os.path.dirname(data_paths[0]), 'repository.snapshot')
+    save_snapshot(snapshot_path, data_paths, build_repository(*data_paths))
+    with open(snapshot_path, 'r+b') as f:
+        f.seek(len(SNAPSHOT_MAGIC))
+        f.write(b'\0' * 4)
+    assert load_snapshot(snapshot_path, data_paths) is None
+
+
+def test_load_broken_snapshot(data_paths):
+    snapshot_path = os.path.join(os.path.dirname(data_paths[0]), 'repository.snapshot')
+    with open(snapshot_path, 'wb') as f:
+        f.write(SNAPSHOT_HEADER)
+        pickle.dump(fingerprint_data_files(data_paths), f)
+        # A pickle referring to a class that no longer exists raises AttributeError while loading.
+        f.write(b'cmovie.adapters.snapshot\nMissing\n.')
+    assert load_snapshot(snapshot_path, data_paths) is None
@@ -0,0 +1,64 @@
+from movie.adapters.sorted_index import SortedIndex, SortOrder
+
+
+def test_range():
+    index = SortedIndex()
+    index.add(SortedIndex.key(2014, 'C', 2014), 'movie_c')
+    index.add(SortedIndex.key(2010, 'A', 2010), 'movie_a')
+    index.add(SortedIndex.key(2014, 'B', 2014), 'movie_b')
+    index.add_many([(SortedIndex.key(2016, 'D', 2016), 'movie_d'), (SortedIndex.key(2012, 'E', 2012), 'movie_e')])
+    assert len(index) == 5
+    assert index.range(2012, 2014) == ['movie_e', 'movie_b', 'movie_c']
+    assert index.range(None, 2011) == ['movie_a']
+    assert index.range(2015) == ['movie_d']
+    assert index.range(2017, 2020) == []
+    assert index.range(2014, 2012) == []
+
+
+def test_range_page():
+    index = SortedIndex()
+    index.add_many([(SortedIndex.key(7.5, title, 2000), title.lower()) for title in 'DCBA'])
+    index.add(SortedIndex.key(6.0, 'E', 2000), 'e')
+    assert index.range_page(7.5, 7.5, 1, 2) == (['b', 'c'], 4)
+    assert index.range_page(None, None, 4, 10) == (['d'], 5)
+    assert index.range_page(7.0, None, 5, 10) == ([], 4)
+    assert index.range_page(8.0, 7.0, 0, 10) == ([], 0)
+
+
+def test_remove():
+    index = SortedIndex()
+    index.add_many([(SortedIndex.key(2014, 'B', 2014), 'movie_b'), (SortedIndex.key(2014, 'C', 2014), 'movie_c'),
+                    (SortedIndex.key(2010, 'A', 2010), 'movie_a')])
+    assert index.remove(SortedIndex.key(2014, 'C', 2014), 'movie_c') is True
+    assert index.remove(SortedIndex.key(2014, 'C', 2014), 'movie_c') is False
+    assert index.remove(SortedIndex.key(2010, 'A', 2010), 'movie_b') is False
+    assert index.range() == ['movie_a', 'movie_b']
+    index.remove_many(['movie_a'])
+    assert index.range() == ['movie_b']
+
+
+def test_sort_order_page():
+    order = SortOrder()
+    order.add_many([(SortOrder.key(7.5, 'B', 2010), 'movie_b'), (SortOrder.key(None, 'C', 2011), 'movie_c')])
+    order.add(SortOrder.key(7.5, 'A', 2012), 'movie_a')
+    order.add(SortOrder.key(None, 'D', 2009), 'movie_d')
+    order.add(SortOrder.key(9.0, 'E', 2008), 'movie_e')
+    assert order.page(0, 10) == ['movie_a', 'movie_b', 'movie_e', 'movie_c', 'movie_d']
+    assert order.page(0, 10, descending=True) == ['movie_e', 'movie_a', 'movie_b', 'movie_c', 'movie_d']
+    assert order.page(2, 2, descending=True) == ['movie_b', 'movie_c']
+    assert order.page(1, 1, descending=True) == ['movie_a']
+    assert order.page(4, 5, descending=True) == ['movie_d']
+    assert order.remove(SortOrder.key(7.5, 'B', 2010), 'movie_b') is True
+    assert order.page(0, 2, descending=True) == ['movie_e', 'movie_a']
+
+
+def test_sort_order_descending_keeps_ties_in_title_order():
+    entries = [(SortOrder.key(value, f'Movie{number}', 2000), f'movie_{number}')
+               for number, value in enumerate([3, 1, None, 3, 2, 1, None, 3, 2])]
+    order = SortOrder()
+    order.add_many(entries)
+    expected = [movie_id for key, movie_id in sorted(entries, key=lambda entry: (entry[0][0], -entry[0][1],
+                                                                                 entry[0][2:]))]
+    assert order.page(0, 10, descending=True) == expected
+    assert [order.page(offset, 2, descending=True) for offset in range(9)] == \
+           [expected[offset: offset + 2] for offset in range(9)]
@@ -0,0 +1,222 @@
+import os
+import threading
+
+import pytest
+
+from movie import create_app
+from movie.adapters import repository
+from movie.adapters.repository import RepositoryException
+from movie.adapters.sqlite_repository import SqliteRepository
+from movie.domainmodel.actor import Actor
+from movie.domainmodel.director import Director
+from movie.domainmodel.genre import Genre
+from movie.domainmodel.movie import Movie, Review
+from movie.domainmodel.user import User
+from movie.utils.constants import MOVIE_DATA_FILE, USER_DATA_FILE, REVIEW_DATA_FILE, SQLITE_DATA_FILE
+
+
+def test_repository_can_add_movie(sqlite_repo):
+    movie = Movie('Test Movie', 2020)
+    movie.description = 'A test movie'
+    movie.runtime_minutes = 100
+    movie.rating = 7.5
+    movie.votes = 1000
+    movie.director = Director('Director3')
+    movie.add_actor(Actor('Actor1'))
+    movie.add_genre(Genre('Genre3'))
+    assert sqlite_repo.add_movie(movie) is True
+    assert sqlite_repo.add_movie(Movie('test movie', 2020)) is False
+    assert sqlite_repo.get_total_number_of_movies() == 6
+
+    stored_movie = sqlite_repo.get_movie('TEST MOVIE', 2020)
+    assert stored_movie == movie
+    assert stored_movie.description == 'A test movie'
+    assert stored_movie.runtime_minutes == 100
+    assert stored_movie.rating == 7.5
+    assert stored_movie.votes == 1000
+    assert stored_movie.metascore is None
+    assert stored_movie.director == Director('Director3')
+    assert stored_movie.actors == [Actor('Actor1')]
+    assert stored_movie.genres == [Genre('Genre3')]
+
+
+def test_repository_can_not_get_movie(sqlite_repo):
+    assert sqlite_repo.get_movie('Not Existing Movie', 9999) is None
+    assert sqlite_repo.get_movie_by_id('not_existing_movie_9999') is None
+
+
+def test_repository_get_n_movies(sqlite_repo):
+    assert sqlite_repo.get_first_movie() == Movie('Movie1', 2000)
+    assert sqlite_repo.get_last_movie() == Movie('Movie5', 2004)
+    assert sqlite_repo.get_n_movies(2, 2) == [Movie('Movie3', 2002), Movie('Movie4', 2003)]
+    assert list(sqlite_repo.movies) == list(sorted(sqlite_repo.movies))
+
+
+def test_get_movies_by_index(sqlite_repo):
+    assert [movie.title for movie in sqlite_repo.get_movies_by_actor('Actor3')] == ['Movie3', 'Movie4', 'Movie5']
+    assert [movie.title for movie in sqlite_repo.get_movies_by_director('Director2')] == ['Movie4', 'Movie5']
+    assert [movie.title for movie in sqlite_repo.get_movies_by_genre('Genre2')] == ['Movie2', 'Movie4']
+    assert list(sqlite_repo.get_movies_by_actor('Not Existing Actor')) == []
+
+
+def test_delete_movies(sqlite_repo):
+    assert sqlite_repo.delete_movie(Movie('movie1', 2000)) is True
+    assert sqlite_repo.delete_movie(Movie('movie1', 2000)) is False
+    assert sqlite_repo.delete_movies([Movie('Movie3', 2002), Movie('Movie4', 2003)]) == 2
+    assert sqlite_repo.get_total_number_of_movies() == 2
+    assert 'Actor1' not in list(sqlite_repo.actors)
+    assert [movie.title for movie in sqlite_repo.get_movies_by_director('Director1')] == ['Movie2']
+
+
+def test_add_and_remove_review(sqlite_repo):
+    movie = sqlite_repo.get_movie_by_id('movie1_2000')
+    review = Review(movie, 'ExistUser', 'A test review', 4)
+    sqlite_repo.add_review(review)
+    assert sqlite_repo.get_movie_by_id('movie1_2000').reviews == [review]
+    sqlite_repo.remove_review('movie1_2000', review.id)
+    assert sqlite_repo.get_movie_by_id('movie1_2000').reviews == []
+
+
+def test_add_review_rows(sqlite_repo):
+    rows = [('movie1_2000', 'ExistUser', 'First', 4, 1.0), ('movie1_2000', 'ExistUser', 'Second', 11, 2.0),
+            ('missing_1999', 'ExistUser', 'Lost', 5, 3.0), ('movie1_2000', 'ExistUser', 'First', 4, 1.0)]
+    assert sqlite_repo.add_review_rows(rows) == 3
+    movie = sqlite_repo.get_movie_by_id('movie1_2000')
+    assert [(review.review_text, review.rating) for review in movie.reviews] == [('First', 4), ('Second', None)]
+    assert movie.get_review(Review(movie, 'ExistUser', 'First', 4, 1.0).id) is not None
+
+
+def test_add_user(sqlite_repo):
+    sqlite_repo.add_user(User('TestUser', 'Test123456'))
+    sqlite_repo.add_user(User('testuser ', 'Another123'))
+    assert sqlite_repo.get_user('testUSER').password == 'Test123456'
+    assert [user.username for user in sqlite_repo.users] == ['ExistUser', 'TestUser']
+
+
+def test_connection_per_thread(sqlite_repo):
+    counts = []
+    thread = threading.Thread(target=lambda: counts.append(sqlite_repo.get_total_number_of_movies()))
+    thread.start()
+    thread.join()
+    assert counts == [5]
+
+
+def test_create_app_with_sqlite_repository(tmp_path):
+    database_path = str(tmp_path / SQLITE_DATA_FILE)
+    create_app({
+        'TESTING': True,
+        'REPOSITORY': 'sqlite',
+        'SQLITE_DATABASE_PATH': database_path,
+        'TEST_MOVIE_DATA_PATH': os.path.join('tests', 'datafiles', MOVIE_DATA_FILE),
+        'TEST_REVIEWS_DATA_PATH': os.path.join('tests', 'datafiles', REVIEW_DATA_FILE),
+        'TEST_USERS_DATA_PATH': os.path.join('tests', 'datafiles', USER_DATA_FILE)
+    })
+    assert isinstance(repository.repo_instance, SqliteRepository)
+    assert repository.repo_instance.get_movie('Guardians of the Galaxy', 2014) is not None
+    assert SqliteRepository(database_path).get_user('test_user_001') is not None
+
+
+def test_get_movies_by_range(sqlite_repo):
+    movie = Movie('Test Movie', 2020)
+    movie.runtime_minutes = 80
+    movie.rating = 8.5
+    sqlite_repo.add_movie(movie)
+    assert [movie.year for movie in sqlite_repo.get_movies_by_year_range(2003)] == [2003, 2004, 2020]
+    assert list(sqlite_repo.get_movies_by_runtime_range(None, 120)) == [movie]
+    assert list(sqlite_repo.get_movies_by_rating_range(8, 9)) == [movie]
+    assert list(sqlite_repo.get_movies_by_rating_range(9)) == []
+    movies, total = sqlite_repo.get_movies_by_year_range_page(2003, None, 1, 5)
+    assert [movie.year for movie in movies] == [2004, 2020]
+    assert total == 3
+    assert sqlite_repo.get_movies_by_runtime_range_page(None, 120, 0, 5) == ([movie], 1)
+
+
+def test_get_movie_statistics(sqlite_repo):
+    movie = Movie('Test Movie', 2020)
+    movie.runtime_minutes = 80
+    movie.rating = 8.5
+    sqlite_repo.add_movie(movie)
+    assert sqlite_repo.get_movie_statistics('year') == {'count': 6, 'sum': 12030.0, 'mean': 2005.0, 'min': 2000.0,
+                                                       'max': 2020.0}
+    assert sqlite_repo.get_movie_statistics('rating', {'year': (2010, None)})['mean'] == 8.5
+    assert sqlite_repo.get_movie_statistics('year', {'runtime_minutes': (None, None)})['count'] == 1
+    assert sqlite_repo.get_movie_statistics('metascore')['mean'] is None
+    with pytest.raises(RepositoryException):
+        sqlite_repo.get_movie_statistics('title')
+
+
+def test_get_movies_page(sqlite_repo):
+    movies, total = sqlite_repo.get_movies_by_actor_page('Actor5', 1, 2)
+    assert [movie.title for movie in movies] == ['Movie2', 'Movie3']
+    assert total == 5
+    movies, total = sqlite_repo.get_movies_by_director_page('Director2', 1, 5)
+    assert [movie.title for movie in movies] == ['Movie5']
+    assert total == 2
+    assert sqlite_repo.get_movies_by_genre_page('Genre1', 5, 5) == ([], 3)
+
+
+def test_get_movie_rank(sqlite_repo):
+    assert sqlite_repo.get_movie_rank('Movie3', 2002) == 2
+    assert sqlite_repo.get_movie_rank('Movie3', 2002, inclusive=True) == 3
+    assert sqlite_repo.get_movie_rank('Movie4', 2003, index='actor', lookup_key='Actor3') == 1
+    assert sqlite_repo.get_movie_rank('Movie4', 2003, True, 'genre', 'Genre2') == 2
+
+
+def test_get_n_movies_sorted(sqlite_repo):
+    movie = Movie('Movie6', 2005)
+    movie.rating = 6.5
+    movie.runtime_minutes = 90
+    sqlite_repo.add_movie(movie)
+    movie = Movie('Movie7', 2006)
+    movie.rating = 8.0
+    sqlite_repo.add_movie(movie)
+    assert [movie.title for movie in sqlite_repo.get_n_movies(3, 0, 'rating', True)] == ['Movie7', 'Movie6', 'Movie1']
+    assert [movie.title for movie in sqlite_repo.get_n_movies(2, 0, 'runtime_minutes')] == ['Movie6', 'Movie1']
+    assert [movie.title for movie in sqlite_repo.get_n_movies(2, 0, 'year', True)] == ['Movie7', 'Movie6']
+    movie = Movie('Movie0', 2007)
+    movie.rating = 6.5
+    sqlite_repo.add_movie(movie)
+    assert [movie.title for movie in sqlite_repo.get_n_movies(3, 0, 'rating', True)] == ['Movie7', 'Movie0', 'Movie6']
+
+
+def test_get_closest_names(sqlite_repo):
+    assert sqlite_repo.get_closest_actor('acto3') == 'Actor3'
+    assert sqlite_repo.get_closest_genre('genre', max_distance=0) is None
+
+
+def test_complete_names(sqlite_repo):
+    assert sqlite_repo.complete_actors('actor', 2) == [('Actor5', 5), ('Actor4', 4)]
+    assert sqlite_repo.complete_directors('DIRECTOR') == [('Director1', 3), ('Director2', 2)]
+    assert sqlite_repo.complete_titles('movie', 2) == [('Movie1', 1), ('Movie2', 1)]
+    assert sqlite_repo.complete_genres('genre_') == []
+
+
+def test_get_movies_by_text_page(tmp_path):
+    repo = SqliteRepository(str(tmp_path / SQLITE_DATA_FILE))
+    for title, year, description in [('Heat', 1995, 'A heist crew and a detective.'),
+                                     ('Inside Man', 2006, 'A bank heist turns into a hostage standoff.'),
+                                     ('Up', 2009, 'A balloon adventure with "quotes" OR syntax.')]:
+        movie = Movie(title, year)
+        movie.description = description
+        repo.add_movie(movie)
+    movies, total = repo.get_movies_by_text_page('Heist detective', 0, 1)
+    assert total == 2
+    assert [movie.title for movie in movies] == ['Heat']
+    assert repo.get_movies_by_text_page('"quotes" OR (', 0, 5)[1] == 1
+    repo.delete_movie(Movie('Heat', 1995))
+    assert repo.get_movies_by_text_page('heist detective', 0, 5)[1] == 1
+    repo.close()
+
+
+def test_costar_graph(sqlite_repo):
+    assert sqlite_repo.get_costars('Actor1') == ['Actor2', 'Actor4', 'Actor5']
+    assert sqlite_repo.have_worked_together('Actor3', 'Actor4')
+    assert not sqlite_repo.have_worked_together('Actor1', 'Actor3')
+    assert [movie.title for movie in sqlite_repo.get_shared_movies('Actor4', 'Actor5')] == \
+           ['Movie1', 'Movie2', 'Movie4', 'Movie5']
+    path = sqlite_repo.get_actor_path('Actor1', 'Actor3')
+    assert len(path) == 3 and path[0] == 'Actor1' and path[-1] == 'Actor3'
+    assert sqlite_repo.get_actor_path('Actor1', 'Unknown') == []
+    sqlite_repo.delete_movie(Movie('Movie1', 2000))
+    assert not sqlite_repo.have_worked_together('Actor1', 'Actor2')
+    assert sqlite_repo.get_actor_path('Actor1', 'Actor2') == []
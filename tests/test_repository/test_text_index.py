@@ -0,0 +1,39 @@
+from movie.adapters.text_index import TextIndex, tokenize
+
+
+def _index():
+    index = TextIndex()
+    index.add('space', 'Guardians of the Galaxy', 'A group of intergalactic criminals must pull together.')
+    index.add('heist', 'The Heist', 'A crew of criminals plans one last heist in the city.')
+    index.add('galaxy', 'Lost City', 'A romance novelist is swept into a jungle adventure.')
+    return index
+
+
+def test_tokenize():
+    assert tokenize("Don't PANIC, 42!") == ['don', 't', 'panic', '42']
+    assert tokenize(None) == []
+
+
+def test_search_ranks_by_bm25():
+    index = _index()
+    assert [movie_id for movie_id, _ in index.search('galaxy')] == ['space']
+    assert [movie_id for movie_id, _ in index.search('heist')] == ['heist']
+    assert [movie_id for movie_id, _ in index.search('city criminals')] == ['heist', 'galaxy', 'space']
+    assert index.search('Criminals')[0][1] > 0
+    assert index.search('zebra') == []
+
+
+def test_remove_and_compact():
+    index = _index()
+    assert index.remove('heist', 'The Heist', 'A crew of criminals plans one last heist in the city.') is True
+    assert index.remove('heist', 'The Heist', '') is False
+    assert [movie_id for movie_id, _ in index.search('criminals city')] == ['galaxy', 'space']
+    index.remove('space', 'Guardians of the Galaxy', 'A group of intergalactic criminals must pull together.')
+    assert len(index) == 1
+    assert index.search('criminals') == []
+    assert [movie_id for movie_id, _ in index.search('city')] == ['galaxy']
+
+    clone = index.clone()
+    clone.add('space', 'Guardians of the Galaxy', '')
+    assert [movie_id for movie_id, _ in clone.search('galaxy')] == ['space']
+    assert index.search('galaxy') == []
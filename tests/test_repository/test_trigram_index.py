@@ -0,0 +1,30 @@
+from movie.adapters.trigram_index import TrigramIndex, suggest_names, trigrams
+
+
+def test_trigrams():
+    assert trigrams('Ab  C') == {'  a', ' ab', 'ab ', 'b c', ' c '}
+    assert trigrams('x') == {'  x', ' x '}
+
+
+def test_suggest_ranks_by_edit_distance():
+    names = ['Chris Pratt', 'Chris Pine', 'Chris Evans', 'Zoe Saldana', 'Dave Bautista', 'Chris Platt']
+    index = TrigramIndex()
+    for name in names + ['Chris Pine']:
+        index.add(name)
+    assert len(index) == 6
+    assert index.suggest('chris prat', 3) == ['Chris Pratt', 'Chris Platt', 'Chris Pine']
+    assert index.suggest('chris prat', 3) == suggest_names('chris prat', names, 3)
+    assert index.suggest('saldanna', 5) == ['Zoe Saldana']
+    assert index.suggest('qqq') == []
+
+
+def test_suggest_skips_names_that_are_not_live():
+    index = TrigramIndex()
+    for name in ['Genre1', 'Genre2', 'Genre3']:
+        index.add(name)
+    assert index.suggest('genre2', 2, is_live=lambda name: name != 'Genre2') == ['Genre1', 'Genre3']
+
+    clone = index.clone()
+    clone.add('Genre22')
+    assert clone.suggest('genre22', 1) == ['Genre22']
+    assert index.suggest('genre22', 1) == ['Genre2']
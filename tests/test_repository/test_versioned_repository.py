@@ -0,0 +1,88 @@
+import pytest
+
+from movie.adapters.versioned_repository import VersionedRepository
+from movie.domainmodel.actor import Actor
+from movie.domainmodel.movie import Movie, Review
+from movie.domainmodel.user import User
+
+
+@pytest.fixture
+def versioned_repo(memory_repo):
+    return VersionedRepository(memory_repo)
+
+
+def test_write_publishes_new_generation(versioned_repo):
+    generation = versioned_repo.generation
+    movie = Movie('Test Movie', 2020)
+    movie.add_actor(Actor('Actor1'))
+    assert versioned_repo.add_movie(movie) is True
+    assert versioned_repo.version == 1
+    assert versioned_repo.generation is not generation
+    assert versioned_repo.get_movie('test movie', 2020) is movie
+    assert generation.get_movie('test movie', 2020) is None
+    assert movie not in generation.get_movies_by_actor('Actor1')
+
+
+def test_pinned_reader_keeps_generation(versioned_repo):
+    with versioned_repo.pinned():
+        movies = versioned_repo.movies
+        versioned_repo.delete_movie(Movie('Movie1', 2000))
+        versioned_repo.add_user(User('TestUser', 'Test123456'))
+        assert len(list(movies)) == 5
+        assert versioned_repo.get_total_number_of_movies() == 5
+        assert versioned_repo.get_user('TestUser') is None
+    assert versioned_repo.get_total_number_of_movies() == 4
+    assert versioned_repo.get_user('TestUser') is not None
+
+
+def test_iteration_survives_concurrent_write(versioned_repo):
+    users = versioned_repo.users
+    next(users)
+    versioned_repo.add_user(User('TestUser', 'Test123456'))
+    assert list(users) == []
+
+
+def test_failed_write_is_not_published(versioned_repo):
+    with pytest.raises(RuntimeError):
+        with versioned_repo.write() as generation:
+            generation.add_movie(Movie('Test Movie', 2020))
+            raise RuntimeError
+    assert versioned_repo.version == 0
+    assert versioned_repo.get_movie('Test Movie', 2020) is None
+
+
+def test_add_review(versioned_repo):
+    movie = versioned_repo.get_movie_by_id('movie1_2000')
+    review = Review(movie, 'ExistUser', 'A test review', 4)
+    with versioned_repo.pinned():
+        versioned_repo.add_review(review)
+        assert versioned_repo.get_movie_by_id('movie1_2000').reviews == []
+    assert movie.reviews == []
+    assert versioned_repo.get_movie_by_id('movie1_2000').reviews == [review]
+    assert versioned_repo.get_movie_by_id('movie1_2000').rating_statistics.count == 1
+    assert list(versioned_repo.get_movies_by_actor('Actor1'))[0].reviews == [review]
+    versioned_repo.remove_review('movie1_2000', review.id)
+    assert versioned_repo.get_movie_by_id('movie1_2000').reviews == []
+
+
+def test_write_shares_untouched_indexes(versioned_repo):
+    generation = versioned_repo.generation
+    versioned_repo.add_user(User('TestUser', 'Test123456'))
+    assert versioned_repo.generation._text_index is generation._text_index
+    assert versioned_repo.generation._actors_index is generation._actors_index
+    assert versioned_repo.generation._users is not generation._users
+    assert generation.get_user('TestUser') is None
+
+
+def test_review_write_shares_unrelated_indexes(versioned_repo):
+    versioned_repo.add_review(Review(versioned_repo.get_movie_by_id('movie2_2001'), 'ExistUser', 'First', 3))
+    generation = versioned_repo.generation
+    movie = versioned_repo.get_movie_by_id('movie1_2000')
+    versioned_repo.add_review(Review(movie, 'ExistUser', 'A test review', 4))
+    written = versioned_repo.generation
+    for name in ('_movies', '_title_year_index', '_actors_index', '_genres_index', '_text_index', '_sort_orders',
+                 '_range_indexes', '_completions', '_users'):
+        assert getattr(written, name) is getattr(generation, name)
+    assert written._movies_index is not generation._movies_index
+    shared = [new is old for new, old in zip(written._movies_index._buckets, generation._movies_index._buckets)]
+    assert shared.count(False) == 1
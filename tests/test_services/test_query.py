@@ -0,0 +1,55 @@
+import pytest
+
+from movie.movie.query import parse_query, evaluate, QuerySyntaxError, Term, And, Or, Not
+
+
+def test_parse_query():
+    node = parse_query('actor=Chris Pratt AND (genre=Action OR genre="Sci-Fi") AND NOT director=James Gunn')
+    assert isinstance(node, And)
+    term, either, negation = node.children
+    assert (term.field, term.value) == ('actor', 'Chris Pratt')
+    assert isinstance(either, Or)
+    assert [child.value for child in either.children] == ['Action', 'Sci-Fi']
+    assert isinstance(negation, Not)
+    assert isinstance(negation.child, Term)
+    assert negation.child.value == 'James Gunn'
+
+
+@pytest.mark.parametrize('query', ['', 'actor=', 'title=Moana', 'actor Chris', '(genre=Action', 'genre=Action )',
+                                   'actor=X AND'])
+def test_parse_invalid_query(query):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(query)
+
+
+def _ids(movies):
+    return [movie.id for movie in movies]
+
+
+def test_evaluate_and(memory_repo):
+    assert _ids(evaluate(parse_query('actor=Actor4 AND genre=Genre1'), memory_repo)) == ['movie1_2000', 'movie5_2004']
+    assert evaluate(parse_query('actor=Actor1 AND actor=Actor3'), memory_repo) == []
+
+
+def test_evaluate_or(memory_repo):
+    assert _ids(evaluate(parse_query('director=Director2 OR actor=Actor1 OR genre=Genre1'), memory_repo)) == \
+           ['movie1_2000', 'movie3_2002', 'movie4_2003', 'movie5_2004']
+
+
+def test_evaluate_not(memory_repo):
+    assert _ids(evaluate(parse_query('actor=Actor5 AND NOT director=Director1'), memory_repo)) == \
+           ['movie4_2003', 'movie5_2004']
+    assert evaluate(parse_query('NOT actor=Actor5'), memory_repo) == []
+    assert _ids(evaluate(parse_query('NOT genre=Genre1 AND NOT actor=Actor2'), memory_repo)) == ['movie4_2003']
+
+
+def test_evaluate_reads_smallest_posting_list(memory_repo, monkeypatch):
+    read = []
+    monkeypatch.setattr(memory_repo, 'get_movies_by_genre', lambda genre: read.append(genre) or [])
+    assert _ids(evaluate(parse_query('genre=Genre1 AND actor=Actor1'), memory_repo)) == ['movie1_2000']
+    assert read == []
+
+
+def test_evaluate_on_sqlite(sqlite_repo):
+    assert _ids(evaluate(parse_query('actor=Actor3 AND NOT (genre=Genre2 OR director=Director1)'), sqlite_repo)) == \
+           ['movie5_2004']
@@ -4,7 +4,10 @@ import pytest
 
 from movie import populate_users
 from movie.authentication import services as auth_services
+from movie.adapters.memory_repository import MemoryRepository, populate_reviews
 from movie.authentication.services import AuthenticationException
+from movie.domainmodel.movie import Movie, Review
+from movie.domainmodel.user import User
 from movie.movie import services as movie_services
 from movie.review import services as review_services
 
@@ -40,12 +43,24 @@ def test_can_save_user(memory_repo):
     auth_services.add_user(username, password, memory_repo)
 
     tmp_file = tempfile.NamedTemporaryFile(delete=False)
-    auth_services._save_users_to_disk(tmp_file.name, memory_repo)
+    auth_services._append_user_to_disk(tmp_file.name, memory_repo.get_user(username))
 
     with open(tmp_file.name, 'r') as f:
         file_content = ''.join(f.readlines())
         assert 'TestUser' in file_content
 
+
+def test_can_append_user(memory_repo):
+    tmp_file = tempfile.NamedTemporaryFile(delete=False)
+    for user in memory_repo.users:
+        auth_services._append_user_to_disk(tmp_file.name, user)
+    auth_services._append_user_to_disk(tmp_file.name, User('TestUser', 'abcd1A23'))
+
+    populated_repo = MemoryRepository()
+    populate_users(tmp_file.name, populated_repo)
+    assert [user.username for user in populated_repo.users] == ['ExistUser', 'TestUser']
+
+
 def test_authentication_with_valid_credentials(memory_repo):
     username = 'TestUser'
     password = 'abcd1A23'
@@ -103,17 +118,47 @@ def test_can_remove_review(memory_repo):
         None) is None
 
 
-def test_find_fuzzy_match():
-    items = ['term111', 'term222', 'term333']
-    distance_1_item = 'Term222'
-    distance_2_item = 'TErm222'
-    distance_3_item = 'tm22'
-    matched_item = movie_services._find_fuzzy_match(distance_1_item, (i for i in items))
-    assert matched_item == 'term222'
-    matched_item = movie_services._find_fuzzy_match(distance_2_item, (i for i in items))
-    assert matched_item == 'term222'
-    matched_item = movie_services._find_fuzzy_match(distance_3_item, (i for i in items))
-    assert matched_item == 'term222'
+def test_removed_review_is_not_reloaded(tmp_path):
+    reviews_path = str(tmp_path / 'reviews.csv')
+    open(reviews_path, 'w').close()
+    repo = MemoryRepository()
+    movie = Movie('Movie1', 2000)
+    repo.add_movie(movie)
+    for text in ['first', 'second']:
+        review = Review(movie, 'user', text, 7)
+        repo.add_review(review)
+        review_services._save_reviews_to_disk(reviews_path, review)
+    review_services._remove_review_from_disk(reviews_path, movie.reviews[0].id, movie.id)
+
+    reloaded = MemoryRepository()
+    reloaded.add_movie(Movie('Movie1', 2000))
+    populate_reviews(reviews_path, reloaded)
+    assert [review.review_text for review in reloaded.get_movie_by_id(movie.id).reviews] == ['second']
+
+
+def test_rating_summary_follows_reviews(memory_repo):
+    movie_id = 'movie1_2000'
+    before = movie_services.get_rating_summary_by_id(movie_id, memory_repo)
+    review_services.add_review(movie_id, 'ExistUser', 'Rating summary', 9, memory_repo)
+    summary = movie_services.fetch_movie_info_by_id(movie_id, memory_repo)['movie_rating_summary']
+    assert summary['reviews'] == before['reviews'] + 1
+    assert summary['histogram'][9] == before['histogram'][9] + 1
+    review_id = next(review['id'] for review in movie_services.fetch_movie_info_by_id(movie_id, memory_repo)[
+        'movie_reviews'] if review['comment'] == 'Rating summary')
+    review_services.remove_review(review_id, movie_id, memory_repo)
+    assert movie_services.get_rating_summary_by_id(movie_id, memory_repo) == before
+    assert movie_services.get_rating_summary_by_id('no_such_movie_2000', memory_repo) is None
+
+
+def test_actor_connection(memory_repo):
+    assert movie_services.get_costars('Actor3', memory_repo) == ['Actor4', 'Actor5']
+    assert [movie.title for movie in movie_services.get_shared_movies('Actor1', 'Actor2', memory_repo)] == ['Movie1']
+    connection = movie_services.get_actor_connection('Actor1', 'Actor3', memory_repo)
+    assert connection['degrees'] == 2
+    assert connection['links'] == [{'actor': 'Actor1', 'costar': 'Actor4', 'movie': 'Movie1'},
+                                   {'actor': 'Actor4', 'costar': 'Actor3', 'movie': 'Movie4'}]
+    assert movie_services.get_actor_connection('Actor1', 'Actor1', memory_repo)['degrees'] == 0
+    assert movie_services.get_actor_connection('Actor1', 'Unknown', memory_repo) is None
 
 
 def test_fetch_movie_info_by_id(memory_repo):
@@ -197,3 +242,81 @@ def test_get_n_movies_by_genre_fuzzy(memory_repo):
     assert len(movies) == 1
     assert matched_count == 3
     assert next((i for i in movies if i.title == 'Movie5')) is not None
+
+
+def test_get_n_movies_by_year_range(memory_repo):
+    movies, matched_count = movie_services.get_n_movies_by_year_range(0, 2, memory_repo, '2001-2004')
+    assert [movie.title for movie in movies] == ['Movie2', 'Movie3']
+    assert matched_count == 4
+    movies, matched_count = movie_services.get_n_movies_by_year_range(0, 2, memory_repo, '2002')
+    assert [movie.title for movie in movies] == ['Movie3']
+    assert matched_count == 1
+    movies, matched_count = movie_services.get_n_movies_by_year_range(0, 2, memory_repo, 'not a year')
+    assert movies == []
+    assert matched_count == 0
+
+
+def test_parse_range():
+    assert movie_services._parse_range('2010-2015', int) == (2010, 2015)
+    assert movie_services._parse_range(' 7.5 - ', float) == (7.5, None)
+    assert movie_services._parse_range('-120', int) == (None, 120)
+    assert movie_services._parse_range('8', float) == (8.0, 8.0)
+    assert movie_services._parse_range('-', int) is None
+    assert movie_services._parse_range('abc-def', int) is None
+
+
+def test_get_n_movies_by_query(memory_repo):
+    movies, matched_count = movie_services.get_n_movies_by_query(0, 2, memory_repo,
+                                                                 'actor=Actor5 AND NOT genre=Genre2')
+    assert [movie.title for movie in movies] == ['Movie1', 'Movie3']
+    assert matched_count == 3
+    with pytest.raises(movie_services.QuerySyntaxError):
+        movie_services.get_n_movies_by_query(0, 2, memory_repo, 'actor=')
+
+
+def test_cursor_round_trip():
+    cursor = movie_services.encode_cursor(movie_services.CURSOR_AFTER, Movie('Movie 1: Ünïcode', 2000))
+    assert movie_services.decode_cursor(cursor) == (movie_services.CURSOR_AFTER, 'Movie 1: Ünïcode', 2000)
+    assert movie_services.decode_cursor('not a cursor') is None
+    assert movie_services.decode_cursor('') is None
+
+
+def test_get_offset_for_cursor(memory_repo):
+    after_movie2 = movie_services.encode_cursor(movie_services.CURSOR_AFTER, Movie('Movie2', 2001))
+    before_movie4 = movie_services.encode_cursor(movie_services.CURSOR_BEFORE, Movie('Movie4', 2003))
+    assert movie_services.get_offset_for_cursor(after_movie2, 2, memory_repo) == 2
+    assert movie_services.get_offset_for_cursor(before_movie4, 2, memory_repo) == 1
+    memory_repo.add_movie(Movie('Movie0', 2020))
+    assert movie_services.get_offset_for_cursor(after_movie2, 2, memory_repo) == 3
+
+
+def test_get_offset_for_search_cursor(memory_repo):
+    after_movie3 = movie_services.encode_cursor(movie_services.CURSOR_AFTER, Movie('Movie3', 2002))
+    assert movie_services.get_offset_for_cursor(after_movie3, 2, memory_repo, 'Actor', 'Actor3') == 1
+    assert movie_services.get_offset_for_cursor(after_movie3, 2, memory_repo, 'Genre fuzzy', 'genr1') == 2
+    assert movie_services.get_offset_for_cursor(after_movie3, 2, memory_repo, 'Year range', '2000-') == 0
+
+
+def test_suggest(memory_repo):
+    assert movie_services.suggest('acto3', memory_repo, 'actor', 2) == {'actor': ['Actor3', 'Actor1']}
+    suggestions = movie_services.suggest('Direktor2', memory_repo, k=1)
+    assert sorted(suggestions) == ['actor', 'director', 'genre']
+    assert suggestions['director'] == ['Director2']
+    assert movie_services.suggest('  ', memory_repo, 'genre') == {'genre': []}
+    with pytest.raises(movie_services.UnknownFieldException):
+        movie_services.suggest('acto3', memory_repo, 'title')
+
+
+def test_autocomplete(memory_repo):
+    assert movie_services.autocomplete('gen', memory_repo, 'genre') == \
+           {'genre': [{'name': 'Genre1', 'movies': 3}, {'name': 'Genre2', 'movies': 2}]}
+    assert sorted(movie_services.autocomplete('m', memory_repo, n=1)) == ['actor', 'director', 'genre', 'title']
+    assert movie_services.autocomplete('', memory_repo, 'title') == {'title': []}
+    with pytest.raises(movie_services.UnknownFieldException):
+        movie_services.autocomplete('gen', memory_repo, 'year')
+
+
+def test_get_n_movies_by_keywords(memory_repo):
+    movie = memory_repo.get_movie('Movie3', 2002)
+    assert movie_services.get_n_movies_by_keywords(0, 5, memory_repo, 'movie3') == ([movie], 1)
+    assert movie_services.get_n_movies_by_keywords(0, 5, memory_repo, '') == ([], 0)